@@ -0,0 +1,171 @@
+from machine import Timer
+import micropython
+import utime
+from settings import settings
+
+
+class AlarmAction:
+    """
+    Description: What an alarm does when it goes off. Wakes to the radio:
+    unmute, tune to a preset and raise the volume from 0 to the target over
+    the ramp period. One periodic Timer drives every step and only writes the
+    radio when the volume level changes, so a ramp to volume 8 is nine
+    writes: the tune at volume 0, then one per level. If a radio write fails,
+    or waking to the radio is turned off, the square-wave buzzer sounds
+    instead. start() and stop() only set up the work; every radio write runs
+    in Timer or scheduled context on core0, so neither the navigation thread
+    nor the report tick waits on I2C.
+    Args:
+        radio_control (RadioControl): the radio to wake to
+        tone (SquareWaveGenerator): buzzer used as the fallback
+    """
+
+    STEP_MS = 100
+
+    # States
+    IDLE = 0
+    RAMPING = 1
+    PLAYING = 2
+    TONE = 3
+
+    def __init__(self, radio_control, tone):
+        self.radio_control = radio_control
+        self.tone = tone
+        self.timer = Timer(-1)
+        self.state = self.IDLE
+        self.started_ms = 0
+        self.ramp_ms = 0
+        self.target_volume = 0
+        self.volume = None
+
+        # Radio state from before the alarm, put back by stop()
+        self.saved = None
+
+        # Bound once: stop() may be called from the navigation thread
+        self._finish_ref = self._finish
+
+    def is_active(self):
+        return self.state != self.IDLE
+
+    def start(self):
+        """
+        Description: Sound the alarm. Does nothing if it is already sounding.
+        """
+        if self.state != self.IDLE:
+            return
+
+        if not settings.get("alarm_radio"):
+            self._sound_tone()
+            return
+
+        self.target_volume = max(0, min(15, settings.get("alarm_volume")))
+        self.ramp_ms = max(0, settings.get("alarm_ramp_s")) * 1000
+        self.volume = None
+        self.state = self.RAMPING
+        self.started_ms = utime.ticks_ms()
+        # The first step tunes and unmutes from the timer too
+        self.timer.init(mode=Timer.PERIODIC, period=self.STEP_MS, callback=self._step)
+
+    def stop(self):
+        """
+        Description: Silence the alarm and put the radio back the way it was.
+        Safe to call from either core; the radio is restored in the scheduled
+        context.
+        """
+        if self.state == self.IDLE:
+            return
+        try:
+            micropython.schedule(self._finish_ref, None)
+        except RuntimeError:
+            # Schedule queue full: finish from the timer instead
+            self.state = self.IDLE
+            self.timer.init(mode=Timer.ONE_SHOT, period=self.STEP_MS, callback=self._step)
+
+    def _step(self, timer=None):
+        if self.state == self.IDLE:
+            self._finish(None)
+            return
+
+        try:
+            if self.volume is None:
+                self._wake_radio()
+
+            elapsed = utime.ticks_diff(utime.ticks_ms(), self.started_ms)
+            if elapsed >= self.ramp_ms:
+                volume = self.target_volume
+            else:
+                volume = self.target_volume * elapsed // self.ramp_ms
+
+            if volume != self.volume:
+                self.volume = volume
+                self.radio_control.set_volume(volume)
+                # This step is the coalescing window: write now
+                if not self.radio_control.flush():
+                    self._fall_back()
+                    return
+
+            if volume == self.target_volume:
+                self.timer.deinit()
+                self.state = self.PLAYING
+
+        except Exception as e:
+            print(f"Error in alarm_action._step: {e}")
+            self._fall_back()
+
+    def _wake_radio(self):
+        radio_control = self.radio_control
+        self.saved = (
+            radio_control.muted,
+            radio_control.get_volume(),
+            radio_control.get_frequency(),
+        )
+
+        stations = radio_control.get_stations()
+        preset = settings.get("alarm_preset")
+        if 0 <= preset < len(stations):
+            radio_control.set_frequency(stations[preset][0])
+
+        # Start quiet; the first write carries the tune, unmute and volume
+        radio_control.set_volume(0)
+        radio_control.set_mute(False)
+
+    def _fall_back(self):
+        print("Alarm radio write failed, sounding the buzzer")
+        self.timer.deinit()
+        self._sound_tone()
+
+    def _sound_tone(self):
+        self.state = self.TONE
+        self.tone.start()
+
+    def _finish(self, _):
+        self.timer.deinit()
+        self.state = self.IDLE
+        self.tone.stop()
+
+        # Also after a failed write, so the settings are right for the next one
+        saved = self.saved
+        self.saved = None
+        if saved is None:
+            return
+
+        muted, volume, frequency = saved
+        radio_control = self.radio_control
+        try:
+            radio_control.set_frequency(frequency)
+            radio_control.set_volume(volume)
+            radio_control.set_mute(muted)
+            radio_control.flush()
+
+        except Exception as e:
+            print(f"Error in alarm_action restoring the radio: {e}")
+
+
+if __name__ == "__main__":
+    from radio_control import RadioControl
+    from square_wave_generator import SquareWaveGenerator
+
+    action = AlarmAction(RadioControl(), SquareWaveGenerator(22, 888))
+    action.start()
+    utime.sleep(70)
+    action.stop()
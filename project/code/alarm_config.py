@@ -25,6 +25,9 @@ class AlarmConfig(UI):
         self.max = self.ui_context.get("max", 24)
         self.current_value = self.min
 
+        # Set when the alarm could not be stored
+        self.table_full = False
+
         # Initialize the encoder
         try:
             self.encoder = RotaryEncoder(
@@ -81,21 +84,27 @@ class AlarmConfig(UI):
 
         if existing_alarm_time:
             # self.rtc.save_alarm_time(self.alarm_id, alarm_time, prefix)
-            self.rtc.save_time_to_file(self.alarm_id, alarm_time, prefix)
+            saved = self.rtc.save_time_to_file(self.alarm_id, alarm_time, prefix)
 
         else:
             # new alarm
             # self.alarm_id = self.rtc.new_alarm(alarm_time)
             self.alarm_id = self.rtc.new_id()
             # still use save_alarm_time?
-            self.rtc.save_time_to_file(self.alarm_id, alarm_time, prefix)
+            saved = self.rtc.save_time_to_file(self.alarm_id, alarm_time, prefix)
+        if not saved:
+            return False
         print(f"Alarm time saved: {alarm_time}, alarm_id: {self.alarm_id}")
+        return True
 
     def update_display(self):
-        self.display.clear()
-        # self.display.update_text(self.header.capitalize(), 0, 0)
-        self.display.update_text(self.header, 0, 0)
-        self.display.update_text(str(self.current_value), 0, 1)
+        with self.display:
+            self.display.clear()
+            # self.display.update_text(self.header.capitalize(), 0, 0)
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text(str(self.current_value), 0, 1)
+            if self.table_full:
+                self.display.update_text("Alarm table full", 0, 2)
 
     def poll_selection_change_and_update_display(self):
         new_value, direction = self.encoder.get_counter()
@@ -104,10 +113,32 @@ class AlarmConfig(UI):
             self.update_display()
 
     def button_release(self):
-        self.save_alarm_time()
+        if self.table_full:
+            # Message seen: leave for the main menu
+            self.build_main_menu_context()
+            return self.ui_context
+        if not self.save_alarm_time():
+            # Every slot is taken: say so and wait for another press
+            self.table_full = True
+            with self.display:
+                self.display.update_text("Alarm table full", 0, 2)
+            return self.ui_context
         self.build_context()
         return self.ui_context
 
+    def build_main_menu_context(self):
+        context = Context(
+            router_context={"next_ui_id": "main_menu"},
+            ui_context={
+                "header": "Main Menu",
+                "selectables": [
+                    {"display_text": "Time", "id": "time_menu"},
+                    {"display_text": "Radio", "id": "radio_menu"},
+                ],
+            },
+        )
+        context_queue.add_to_queue(context)
+
     def build_context(self):
         next_header = None
         next_ui_id = "set_alarm"
@@ -160,10 +191,7 @@ class AlarmConfig(UI):
 
     def disable_alarm(self):
         self.turn_off_alarm()
-        snooze_time = self.rtc.get_snooze_time()
-        if snooze_time:
-            snooze_id = self.rtc.find_alarm_by_time(snooze_time)
-            if snooze_id:
-                self.rtc.delete_alarm(snooze_id, snooze=True)
+        for snooze_id, snooze_time in self.rtc.get_snooze_time():
+            self.rtc.delete_alarm(snooze_id, snooze=True)
         self.reporting_queue.add_to_queue({"job_id": "snooze_disable", "msg": None})
         self.encoder.reset_counter()
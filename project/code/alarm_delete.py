@@ -69,10 +69,11 @@ class AlarmDelete(UI):
         """
         Update the display on encoder changes
         """
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        text_value = "Yes" if self.current_value else "No"
-        self.display.update_text(text_value, 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            text_value = "Yes" if self.current_value else "No"
+            self.display.update_text(text_value, 0, 1)
 
     def poll_selection_change_and_update_display(self):
         """
@@ -69,11 +69,12 @@ class AlarmDisable(UI):
         """
         Update the display on encoder changes
         """
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        # text_value = "Yes" if self.current_value else "No"
-        text_value = "Yes"
-        self.display.update_text(text_value, 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            # text_value = "Yes" if self.current_value else "No"
+            text_value = "Yes"
+            self.display.update_text(text_value, 0, 1)
 
     def poll_selection_change_and_update_display(self):
         """
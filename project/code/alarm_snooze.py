@@ -32,6 +32,9 @@ class AlarmSnooze(UI):
 
         self.current_value = 1  # Set to 1 to map to "Yes"
 
+        # Set when the snooze could not be stored
+        self.table_full = False
+
         # Initialize the encoder
         try:
             self.encoder = RotaryEncoder(
@@ -81,7 +84,13 @@ class AlarmSnooze(UI):
         self.rtc.delete_all_snooze_files()
 
         # Create a new snooze alarm file and get the snooze time
-        snooze_id, snooze_time = self.rtc.new_snooze(snooze_minutes)
+        snooze = self.rtc.new_snooze(snooze_minutes)
+        if snooze is None:
+            # Every slot is taken: say so rather than pretend it is snoozing
+            self.table_full = True
+            self.update_display()
+            return
+        snooze_id, snooze_time = snooze
         # print(f"HSHSHSHS: {snooze_time}")
         msg = f"Snooze active until {snooze_time['hour']:02d}:{snooze_time['minute']:02d}:{snooze_time['second']:02d}"
 
@@ -94,10 +103,13 @@ class AlarmSnooze(UI):
         """
         Update the display - but there aren't encoder changes.  Always display "Yes".
         """
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        text_value = "Yes"
-        self.display.update_text(text_value, 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            text_value = "Yes"
+            self.display.update_text(text_value, 0, 1)
+            if self.table_full:
+                self.display.update_text("Alarm table full", 0, 2)
 
     def poll_selection_change_and_update_display(self):
         """
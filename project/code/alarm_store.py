@@ -0,0 +1,263 @@
+import struct
+import uos
+from logger import Logger
+
+# Header: magic, format version, slot count
+HEADER_FORMAT = "<2sBB"
+HEADER_SIZE = 4
+MAGIC = b"AL"
+VERSION = 1
+
+# Record: flags, hour, minute, second, id (low 16 bits, high 8 bits), checksum
+RECORD_FORMAT = "<BBBBHBB"
+RECORD_SIZE = 8
+
+FLAG_USED = 0x01
+FLAG_SNOOZE = 0x02
+
+
+def record_checksum(buffer, offset):
+    """
+    Description: Checksum byte of the record at offset; the record bytes
+    including the checksum sum to zero (mod 256).
+    """
+    total = 0
+    for i in range(offset, offset + RECORD_SIZE - 1):
+        total += buffer[i]
+    return -total & 0xFF
+
+
+class AlarmStore:
+    """
+    Description: Fixed table of alarm and snooze records kept in a preallocated
+    buffer, one 8-byte slot per entry, with an id -> slot map for O(1) updates.
+    FileAlarmStore and NvramAlarmStore decide where the table lives with
+    read() (fill self.buffer, return False if nothing is stored) and
+    write_slot(slot) (persist one slot, or the whole table when slot is None).
+    Args:
+        slots (int): number of records the table holds
+    """
+
+    def __init__(self, slots):
+        self.logger = Logger(level=Logger.INFO)
+        self.slots = slots
+        self.buffer = bytearray(HEADER_SIZE + slots * RECORD_SIZE)
+        self.slot_of = {}
+
+    def load(self):
+        """
+        Description: Read the table and rebuild the slot map. A missing, blank
+        or unreadable table, or a record with a bad checksum, reads as empty.
+        Returns:
+            bool: True if a table was found
+        """
+        self.slot_of = {}
+        try:
+            found = self.read()
+        except Exception as e:
+            # Start empty but leave the stored table alone; the read may work
+            # on the next boot
+            msg = "Error in alarm_store.load reading the alarm table"
+            self.logger.error(e, msg)
+            self.format(persist=False)
+            return False
+
+        magic, version, slots = struct.unpack_from(HEADER_FORMAT, self.buffer, 0)
+        if not found or magic != MAGIC or version != VERSION or slots != self.slots:
+            # A fresh chip's RAM reads all zeros: no table yet, nothing to
+            # warn about
+            if found and any(self.buffer):
+                self.logger.warning("Alarm table has an unknown format, starting empty")
+            self.format()
+            return False
+
+        for slot in range(self.slots):
+            offset = HEADER_SIZE + slot * RECORD_SIZE
+            if not self.buffer[offset] & FLAG_USED:
+                continue
+            if record_checksum(self.buffer, offset) != self.buffer[offset + RECORD_SIZE - 1]:
+                self.logger.warning(f"Alarm table slot {slot} is corrupt, dropping it")
+                self._clear(slot)
+                continue
+            self.slot_of[self._id_at(offset)] = slot
+        return True
+
+    def format(self, persist=True):
+        """
+        Description: Reset to an empty table, and persist the header and slots
+        unless persist is False.
+        """
+        self.slot_of = {}
+        for i in range(len(self.buffer)):
+            self.buffer[i] = 0
+        struct.pack_into(HEADER_FORMAT, self.buffer, 0, MAGIC, VERSION, self.slots)
+        if persist:
+            self.write_slot(None)
+
+    def entries(self):
+        """
+        Description: List the stored entries.
+        Returns:
+            list: (time_id, time_data, snooze) tuples in slot order
+        """
+        entries = []
+        for slot in range(self.slots):
+            offset = HEADER_SIZE + slot * RECORD_SIZE
+            flags, hour, minute, second, _, _, _ = struct.unpack_from(
+                RECORD_FORMAT, self.buffer, offset
+            )
+            if flags & FLAG_USED:
+                entries.append(
+                    (
+                        self._id_at(offset),
+                        {"hour": hour, "minute": minute, "second": second},
+                        bool(flags & FLAG_SNOOZE),
+                    )
+                )
+        return entries
+
+    def put(self, time_id, time_data, snooze=False):
+        """
+        Description: Add or replace the entry for time_id.
+        Returns:
+            bool: False if the table is full
+        """
+        slot = self.slot_of.get(time_id)
+        if slot is None:
+            slot = self._free_slot()
+            if slot is None:
+                self.logger.warning(f"Alarm table full, cannot store {time_id}")
+                return False
+
+        number = int(time_id)
+        offset = HEADER_SIZE + slot * RECORD_SIZE
+        struct.pack_into(
+            RECORD_FORMAT,
+            self.buffer,
+            offset,
+            FLAG_USED | (FLAG_SNOOZE if snooze else 0),
+            time_data["hour"],
+            time_data["minute"],
+            time_data["second"],
+            number & 0xFFFF,
+            (number >> 16) & 0xFF,
+            0,
+        )
+        self.buffer[offset + RECORD_SIZE - 1] = record_checksum(self.buffer, offset)
+        self.slot_of[time_id] = slot
+        self.write_slot(slot)
+        return True
+
+    def remove(self, time_id):
+        """
+        Description: Delete the entry for time_id if it is stored.
+        """
+        slot = self.slot_of.pop(time_id, None)
+        if slot is not None:
+            self._clear(slot)
+            self.write_slot(slot)
+
+    def clear_snoozes(self):
+        """
+        Description: Delete every snooze entry.
+        """
+        for time_id, time_data, snooze in self.entries():
+            if snooze:
+                self.remove(time_id)
+
+    def _id_at(self, offset):
+        low, high = struct.unpack_from("<HB", self.buffer, offset + 4)
+        return str(high << 16 | low)
+
+    def _free_slot(self):
+        for slot in range(self.slots):
+            if not self.buffer[HEADER_SIZE + slot * RECORD_SIZE] & FLAG_USED:
+                return slot
+        return None
+
+    def _clear(self, slot):
+        offset = HEADER_SIZE + slot * RECORD_SIZE
+        for i in range(offset, offset + RECORD_SIZE):
+            self.buffer[i] = 0
+
+
+class FileAlarmStore(AlarmStore):
+    """
+    Description: Alarm table in a single binary file on flash. Every update
+    writes the whole table (a few hundred bytes) to a temporary file and renames
+    it over the old one, so a power cut leaves either the old or the new table.
+    Args:
+        filename (str): table file name
+        slots (int): number of records the table holds
+    """
+
+    def __init__(self, filename="alarms.bin", slots=16):
+        super().__init__(slots)
+        self.filename = filename
+        self.temp_filename = filename + ".tmp"
+
+    def read(self):
+        try:
+            with open(self.filename, "rb") as file:
+                count = file.readinto(self.buffer)
+        except OSError:
+            return False
+        return count == len(self.buffer)
+
+    def write_slot(self, slot):
+        try:
+            with open(self.temp_filename, "wb") as file:
+                file.write(self.buffer)
+            uos.rename(self.temp_filename, self.filename)
+
+        except Exception as e:
+            msg = f"Error in alarm_store writing {self.filename}"
+            self.logger.error(e, msg)
+
+
+class NvramAlarmStore(AlarmStore):
+    """
+    Description: Alarm table in the DS1307's 56 bytes of battery-backed RAM:
+    the header plus 6 records use 52 of them. Updating an entry writes only its
+    8-byte slot, one short I2C transaction with no flash erase.
+    Args:
+        ds1307 (DS1307): RTC driver
+        slots (int): number of records the table holds
+    """
+
+    def __init__(self, ds1307, slots=6):
+        super().__init__(slots)
+        self.ds1307 = ds1307
+        self.buffer_mv = memoryview(self.buffer)
+
+    def read(self):
+        self.ds1307.read_ram(self.buffer)
+        return True
+
+    def write_slot(self, slot):
+        try:
+            if slot is None:
+                self.ds1307.write_ram(self.buffer)
+            else:
+                offset = HEADER_SIZE + slot * RECORD_SIZE
+                self.ds1307.write_ram(
+                    self.buffer_mv[offset : offset + RECORD_SIZE], offset
+                )
+
+        except Exception as e:
+            msg = "Error in alarm_store writing the DS1307 RAM"
+            self.logger.error(e, msg)
+
+
+if __name__ == "__main__":
+
+    store = FileAlarmStore("alarms_test.bin", slots=4)
+    store.load()
+    store.put("123456", {"hour": 7, "minute": 30, "second": 0})
+    store.put("654321", {"hour": 7, "minute": 40, "second": 0}, snooze=True)
+    print(store.entries())
+
+    store.load()
+    store.clear_snoozes()
+    print(store.entries())
+    uos.remove("alarms_test.bin")
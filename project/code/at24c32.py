@@ -0,0 +1,230 @@
+"""
+AT24C32 4 KB I2C EEPROM on the TinyRTC board, sharing the bus with the DS1307.
+"""
+
+import struct
+import utime
+from micropython import const
+
+SIZE = const(4096)
+PAGE_SIZE = const(32)
+
+# Longest internal write cycle from the datasheet (tWR); polling normally
+# finishes well before this
+WRITE_CYCLE_MS = const(10)
+
+
+class AT24C32:
+    """
+    Description: Driver for the AT24C32. Writes are split on 32-byte page
+    boundaries so each chunk is one burst, and instead of sleeping a fixed time
+    after a write, the next access polls the chip until it ACKs again.
+    Args:
+        i2c (machine.I2C): bus the EEPROM is on
+        addr (int): I2C address, 0x50 with A0-A2 low
+    """
+
+    def __init__(self, i2c, addr=0x50):
+        self.i2c = i2c
+        self.addr = addr
+        self.busy = False
+
+    def wait_ready(self, timeout_ms=WRITE_CYCLE_MS * 2):
+        """
+        Description: ACK-poll until the last write cycle has finished. The chip
+        doesn't answer its address while it is programming.
+        """
+        if not self.busy:
+            return
+        start = utime.ticks_ms()
+        while True:
+            try:
+                self.i2c.writeto(self.addr, b"")
+                self.busy = False
+                return
+            except OSError:
+                if utime.ticks_diff(utime.ticks_ms(), start) > timeout_ms:
+                    raise
+                utime.sleep_us(100)
+
+    def read_into(self, memaddr, buf):
+        """
+        Description: Sequential read of len(buf) bytes from memaddr into buf,
+        without allocating.
+        """
+        if memaddr < 0 or memaddr + len(buf) > SIZE:
+            raise ValueError("EEPROM read out of range")
+        self.wait_ready()
+        self.i2c.readfrom_mem_into(self.addr, memaddr, buf, addrsize=16)
+
+    def write(self, memaddr, buf):
+        """
+        Description: Write buf at memaddr, one burst per page it touches. Returns
+        without waiting for the last write cycle to finish.
+        """
+        if memaddr < 0 or memaddr + len(buf) > SIZE:
+            raise ValueError("EEPROM write out of range")
+        mv = memoryview(buf)
+        offset = 0
+        while offset < len(buf):
+            chunk = min(len(buf) - offset, PAGE_SIZE - (memaddr + offset) % PAGE_SIZE)
+            self.wait_ready()
+            self.i2c.writeto_mem(
+                self.addr, memaddr + offset, mv[offset : offset + chunk], addrsize=16
+            )
+            self.busy = True
+            offset += chunk
+
+
+# Record: marker, sequence number, kind, payload length, payload, CRC-8
+RECORD_SIZE = PAGE_SIZE
+RECORD_HEADER = "<BHBB"
+RECORD_HEADER_SIZE = 5
+PAYLOAD_SIZE = RECORD_SIZE - RECORD_HEADER_SIZE - 1
+
+# Neither 0x00 nor 0xFF, so blank pages of either kind are never records
+RECORD_MARKER = 0xA5
+
+
+def _crc8_table():
+    # CRC-8, polynomial x^8 + x^2 + x + 1 (0x07)
+    table = bytearray(256)
+    for value in range(256):
+        crc = value
+        for _ in range(8):
+            crc = (crc << 1) ^ 0x07 if crc & 0x80 else crc << 1
+        table[value] = crc & 0xFF
+    return bytes(table)
+
+
+_CRC8_TABLE = _crc8_table()
+
+
+def crc8(buffer, length):
+    """
+    Description: CRC-8 of the first length bytes, started from 0xFF so a run
+    of zeros does not check out as zero.
+    """
+    table = _CRC8_TABLE
+    crc = 0xFF
+    for i in range(length):
+        crc = table[crc ^ buffer[i]]
+    return crc
+
+
+def _newer(a, b):
+    # 16-bit sequence numbers compared across the wrap
+    return 0 < (a - b) & 0xFFFF < 0x8000
+
+
+class RecordLog:
+    """
+    Description: Circular log of page-sized records in a region of the EEPROM.
+    Appends go to the slot after the newest record, so every page in the region
+    is written once per lap instead of one page being rewritten each time. The
+    newest record is found at start-up from the sequence numbers. A record
+    counts only with its marker byte and a good CRC-8, so blank pages and torn
+    writes are skipped.
+    Args:
+        eeprom (AT24C32): EEPROM driver
+        start (int): first byte of the region, page aligned
+        count (int): number of records (pages) in the region
+    """
+
+    def __init__(self, eeprom, start, count):
+        if start % RECORD_SIZE:
+            raise ValueError("RecordLog region must be page aligned")
+        self.eeprom = eeprom
+        self.start = start
+        self.count = count
+        self.buffer = bytearray(RECORD_SIZE)
+        self.next_slot = 0
+        self.sequence = 0
+        self.scan()
+
+    def _read_record(self, slot):
+        """
+        Description: Read a slot into self.buffer.
+        Returns:
+            tuple: (sequence, kind, length), or None if the slot is blank or corrupt
+        """
+        buffer = self.buffer
+        self.eeprom.read_into(self.start + slot * RECORD_SIZE, buffer)
+        marker, sequence, kind, length = struct.unpack_from(RECORD_HEADER, buffer, 0)
+        if marker != RECORD_MARKER or length > PAYLOAD_SIZE:
+            return None
+        if crc8(buffer, RECORD_SIZE - 1) != buffer[RECORD_SIZE - 1]:
+            return None
+        return sequence, kind, length
+
+    def scan(self):
+        """
+        Description: Find the newest record and continue after it.
+        """
+        newest = None
+        for slot in range(self.count):
+            record = self._read_record(slot)
+            if record and (newest is None or _newer(record[0], newest[0])):
+                newest = (record[0], slot)
+        if newest is None:
+            self.next_slot = 0
+            self.sequence = 0
+        else:
+            self.sequence = (newest[0] + 1) & 0xFFFF
+            self.next_slot = (newest[1] + 1) % self.count
+
+    def append(self, kind, payload):
+        """
+        Description: Write one record in a single page burst.
+        Args:
+            kind (int): caller-defined record type (0-255)
+            payload (bytes): up to PAYLOAD_SIZE bytes; longer payloads are cut
+        """
+        buffer = self.buffer
+        length = min(len(payload), PAYLOAD_SIZE)
+        struct.pack_into(
+            RECORD_HEADER, buffer, 0, RECORD_MARKER, self.sequence, kind, length
+        )
+        buffer[RECORD_HEADER_SIZE : RECORD_HEADER_SIZE + length] = payload[:length]
+        for i in range(RECORD_HEADER_SIZE + length, RECORD_SIZE - 1):
+            buffer[i] = 0
+        buffer[RECORD_SIZE - 1] = crc8(buffer, RECORD_SIZE - 1)
+
+        self.eeprom.write(self.start + self.next_slot * RECORD_SIZE, buffer)
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        self.next_slot = (self.next_slot + 1) % self.count
+
+    def records(self, limit=None):
+        """
+        Description: Read records newest first.
+        Returns:
+            list: (sequence, kind, payload) tuples
+        """
+        records = []
+        slot = self.next_slot
+        for _ in range(self.count if limit is None else min(limit, self.count)):
+            slot = (slot - 1) % self.count
+            record = self._read_record(slot)
+            if record is None or (records and not _newer(records[-1][0], record[0])):
+                break
+            sequence, kind, length = record
+            records.append(
+                (
+                    sequence,
+                    kind,
+                    bytes(self.buffer[RECORD_HEADER_SIZE : RECORD_HEADER_SIZE + length]),
+                )
+            )
+        return records
+
+
+if __name__ == "__main__":
+    import machine
+
+    i2c = machine.I2C(0, sda=machine.Pin(16), scl=machine.Pin(17))
+    eeprom = AT24C32(i2c)
+
+    log = RecordLog(eeprom, start=0, count=8)
+    log.append(1, b"hello")
+    log.append(1, b"world")
+    print(log.records())
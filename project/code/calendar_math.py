@@ -0,0 +1,117 @@
+"""
+Integer calendar arithmetic for the proleptic Gregorian calendar, counted from
+2000-01-01 UTC, the epoch of MicroPython's utime and the first year the DS1307
+holds. Timestamps stay below 2**30 until 2034, so on the Pico they are small
+ints and the per-tick adds and compares never allocate. Nothing here calls
+utime, so every module agrees on the epoch and the weekday numbering whatever
+the port's mktime does.
+
+Weekdays follow the DS1307 tuple: Sunday = 0 ... Saturday = 6.
+The day/civil conversions are Howard Hinnant's algorithms.
+"""
+
+SECONDS_PER_DAY = 86400
+
+# Days from 0000-03-01 to 2000-01-01
+_EPOCH_SHIFT = 730425
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    if month == 2 and is_leap(year):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+def days_from_civil(year, month, day):
+    """
+    Description: Days since 2000-01-01 of a date. A day past the end of the
+    month runs on into the next one.
+    """
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - _EPOCH_SHIFT
+
+
+def civil_from_days(days):
+    """
+    Description: Date of a day count since 2000-01-01.
+    Returns:
+        tuple: (year, month, day)
+    """
+    days += _EPOCH_SHIFT
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (
+        day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096
+    ) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153  # 0 = March
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = month_index + 3 if month_index < 10 else month_index - 9
+    year = year_of_era + era * 400
+    if month <= 2:
+        year += 1
+    return year, month, day
+
+
+def weekday(days):
+    """
+    Description: Weekday of a day count since 2000-01-01 (a Saturday).
+    """
+    return (days + 6) % 7
+
+
+def weekday_of(year, month, day):
+    return weekday(days_from_civil(year, month, day))
+
+
+def seconds_of_day(hour, minute, second):
+    return hour * 3600 + minute * 60 + second
+
+
+def split_seconds_of_day(seconds):
+    """
+    Description: Seconds since midnight as (hour, minute, second). Values
+    outside one day wrap around.
+    """
+    minutes, second = divmod(seconds % SECONDS_PER_DAY, 60)
+    hour, minute = divmod(minutes, 60)
+    return hour, minute, second
+
+
+def to_timestamp(year, month, day, hour, minute, second):
+    """
+    Description: Seconds since 2000-01-01 of a date and time, like mktime.
+    """
+    return days_from_civil(year, month, day) * SECONDS_PER_DAY + seconds_of_day(
+        hour, minute, second
+    )
+
+
+def to_datetime(timestamp):
+    """
+    Description: Seconds since 2000-01-01 as a DS1307 style tuple.
+    Returns:
+        tuple: (year, month, day, weekday, hour, minute, second)
+    """
+    days, seconds = divmod(timestamp, SECONDS_PER_DAY)
+    year, month, day = civil_from_days(days)
+    hour, minute, second = split_seconds_of_day(seconds)
+    return year, month, day, weekday(days), hour, minute, second
+
+
+if __name__ == "__main__":
+
+    print(to_datetime(0))  # 2000-01-01, Saturday
+    print(to_datetime(to_timestamp(2024, 2, 29, 23, 59, 59) + 1))  # 2024-03-01
+    print(days_in_month(2100, 2), days_in_month(2000, 2))  # 28 29
@@ -1,3 +1,6 @@
+import _thread
+import machine
+import utime
 from queue import Queue
 
 
@@ -8,31 +11,88 @@ class Context:
 
 
 class ContextQueue:
-    def __init__(self):
-        self.queue = Queue()
-        self.size_counter = 0
+    """
+    Description: Queue shared by the Timer callback, button/encoder IRQs and the
+    navigation thread.  Every access runs with interrupts disabled on the calling
+    core (so a callback can't preempt a half-done put/get on the same core) and
+    under a lock (so the other RP2040 core, where _thread runs, waits its turn).
+    The critical sections are a handful of loop-free statements.
+    Args:
+        capacity (int): ring buffer slots, see queue.Queue.
+        overflow (int): Queue.DROP_OLDEST or Queue.REJECT.
+        poll_ms (int): sleep between checks while a dequeue is waiting.
+    """
+
+    def __init__(self, capacity=16, overflow=Queue.DROP_OLDEST, poll_ms=5):
+        self.queue = Queue(capacity, overflow)
+        self.lock = _thread.allocate_lock()
+        self.poll_ms = poll_ms
+
+    def _enter(self):
+        irq_state = machine.disable_irq()
+        self.lock.acquire()
+        return irq_state
+
+    def _exit(self, irq_state):
+        self.lock.release()
+        machine.enable_irq(irq_state)
 
     def add_to_queue(self, context):
-        self.queue.put(context)
-        self.size_counter += 1
+        """
+        Returns False if the item was rejected because the queue is full.
+        """
+        irq_state = self._enter()
+        try:
+            return self.queue.put(context)
+        finally:
+            self._exit(irq_state)
 
-    def dequeue(self):
-        if not self.queue.empty():
-            self.size_counter -= 1
+    def _get(self):
+        irq_state = self._enter()
+        try:
             return self.queue.get()
-        return None
+        finally:
+            self._exit(irq_state)
+
+    def dequeue(self, timeout_ms=0):
+        """
+        Description: Take the oldest item.
+        Args:
+            timeout_ms (int): 0 returns immediately, None waits for an item,
+                otherwise wait up to timeout_ms.  Waiting sleeps between checks
+                rather than spinning, never call it with a timeout from an IRQ.
+        Returns:
+            The item, or None if the queue stayed empty.
+        """
+        item = self._get()
+        if item is not None or timeout_ms == 0:
+            return item
+
+        start = utime.ticks_ms()
+        while True:
+            utime.sleep_ms(self.poll_ms)
+            item = self._get()
+            if item is not None:
+                return item
+            if (
+                timeout_ms is not None
+                and utime.ticks_diff(utime.ticks_ms(), start) >= timeout_ms
+            ):
+                return None
 
     def is_empty(self):
         return self.queue.empty()
 
     def size(self):
-        return self.size_counter
+        return self.queue.size()
 
 
 # Initialize global context queue instances
-context_queue = ContextQueue()
-auxiliary_queue = ContextQueue()
-reporting_queue = ContextQueue()
+context_queue = ContextQueue(capacity=8)
+# Button presses; when flooded keep the newest requests
+auxiliary_queue = ContextQueue(capacity=8)
+# Nothing drains this yet, dropping the oldest keeps it bounded
+reporting_queue = ContextQueue(capacity=4)
 
 # Basic usage example for testing
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ from ui import UI
 from encoder import RotaryEncoder
 from context_queue import context_queue
 from context import Context
+from calendar_math import days_in_month
 
 
 class DateConfig(UI):
@@ -21,8 +22,14 @@ class DateConfig(UI):
             self.min = 1
             self.max = 12
         elif self.header == "day":
+            # Year and month were set on the previous screens
             self.min = 1
-            self.max = 31  # Simplification; actual max will depend on month/year
+            try:
+                year, month = self.rtc.local_datetime()[:2]
+                self.max = days_in_month(year, month)
+            except Exception as e:
+                print(f"date_config could not read the month, allowing 31 days: {e}")
+                self.max = 31
         self.current_value = self.min
 
         self.selected_index = None
@@ -64,9 +71,10 @@ class DateConfig(UI):
         return context if context else {}
 
     def update_display(self):
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        self.display.update_text(str(self.current_value), 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text(str(self.current_value), 0, 1)
 
     def poll_selection_change_and_update_display(self):
         new_value, direction = self.encoder.get_counter()
@@ -84,42 +92,8 @@ class DateConfig(UI):
         Description: Sets the date. Writes the date metric stored in current_value to
         the RTC module.
         """
-        try:
-            current_datetime = self.rtc.rtc.datetime()
-            new_year = current_datetime[0]
-            new_month = current_datetime[1]
-            new_day = current_datetime[2]
-            new_hour = current_datetime[4]
-            new_minute = current_datetime[5]
-            new_second = current_datetime[6]
-            new_weekday = current_datetime[3]
-
-            # Determine which metric to update depending on the header
-            if self.header == "year":
-                new_year = int(self.current_value)
-            elif self.header == "month":
-                new_month = int(self.current_value)
-            elif self.header == "day":
-                new_day = int(self.current_value)
-
-            # Update the RTC module
-            self.rtc.set_datetime(
-                new_year,
-                new_month,
-                new_day,
-                new_weekday,
-                new_hour,
-                new_minute,
-                new_second,
-            )
-
-            current_datetime = self.rtc.get_formatted_datetime_from_module()
-            print(f"after formatted: {current_datetime}")
-
-        except Exception as e:
-            print(
-                f"DateConfig.write_date_to_rtc Failed setting the date and time directly.\n{e}"
-            )
+        # Write only the register for the field being edited
+        self.rtc.set_time_field(self.header, int(self.current_value))
 
         # Reset the encoder counter after writing the date
         self.encoder.reset_counter()
@@ -74,15 +74,71 @@ class CR_SPI_Display:
         self.max_columns = self.oled.width // self.char_width_px
         self.max_rows = self.oled.height // self.char_height_px
 
+        # Nesting depth of open frames, see begin_frame/commit
+        self.frame_depth = 0
+
+        # Last text, column and colour written to each character row. "" marks a
+        # blank row, None a row whose contents are unknown (drawn around the memo).
+        self.row_text = [""] * self.max_rows
+        self.row_column = [0] * self.max_rows
+        self.row_color = [0] * self.max_rows
+
         # print(f"max columns: {self.max_columns}")
         # print(f"max rows: {self.max_rows}")
 
+    def begin_frame(self):
+        """
+        Description: Start a batched frame.  Until the matching commit(), drawing
+        calls only mutate the framebuffer and the panel is flushed once at commit.
+        Frames may be nested; only the outermost commit flushes.
+        """
+        self.frame_depth += 1
+
+    def commit(self):
+        """
+        Description: Close a frame opened by begin_frame and flush the changes
+        if this was the outermost frame.
+        """
+        if self.frame_depth > 0:
+            self.frame_depth -= 1
+        self._flush()
+
+    def __enter__(self):
+        self.begin_frame()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.commit()
+        return False
+
+    def _flush(self):
+        """
+        Send the framebuffer to the panel unless a frame is open.
+        """
+        if self.frame_depth == 0:
+            self.oled.show()
+
+    def _forget_rows(self, text):
+        for row in range(self.max_rows):
+            self.row_text[row] = text
+
     def clear(self):
         """
         Clear entire the buffer
         """
         self.oled.fill(0)
-        self.oled.show()
+        self._forget_rows("")
+        self._flush()
+
+    def refresh(self):
+        """
+        Description: Forced refresh escape hatch.  Forget the row memo so the next
+        update_text calls redraw unconditionally, and resend the whole framebuffer.
+        Use after the panel has been reset or drawn on through self.oled directly.
+        """
+        self._forget_rows(None)
+        self.oled.invalidate()
+        self._flush()
 
     def _clear_row(self, row, update_display=True):
         """
@@ -92,11 +148,15 @@ class CR_SPI_Display:
             row (int): specific row to clear
             update_display (bool): whether to update the display after clearing the row
         """
+        # Already blank, nothing to clear or send
+        if self.row_text[row] == "":
+            return
         y = row * self.char_height_px
         self.oled.fill_rect(0, y, self.oled.width, self.char_height_px, 0)
+        self.row_text[row] = ""
         # prevent multiple recursion error
         if update_display:
-            self.oled.show()
+            self._flush()
 
     def _update_row(self, text, column, row, color=1, tab=True, update_display=True):
         """
@@ -112,10 +172,12 @@ class CR_SPI_Display:
         x = column * self.char_width_px + 2
         y = row * self.char_height_px
         self.oled.text(text, x, y, color)
+        # Drawn on top of whatever was there, the memo no longer describes the row
+        self.row_text[row] = None
         if update_display:
-            self.oled.show()
+            self._flush()
 
-    def update_text(self, text, column, row, color=1):
+    def update_text(self, text, column, row, color=1, force=False):
         """
         Description:
         Letters are 8 (pixels) high, set rows to reflect sentence height.
@@ -127,6 +189,9 @@ class CR_SPI_Display:
         # using do not support different fonts out of the box. Instead, we need to
         # manually implement a way to handle different fonts for different sizes.
         # May need https://docs.circuitpython.org/projects/display_text/en/latest/
+
+        Writes identical to what the row already shows (same text, column and
+        colour) are skipped entirely unless force is set.
         """
 
         # Ensure column and row are within limits
@@ -141,13 +206,26 @@ class CR_SPI_Display:
         elif row >= self.max_rows:
             row = self.max_rows - 1
 
+        if not force and self.row_text[row] == text:
+            if text == "" or (
+                self.row_column[row] == column and self.row_color[row] == color
+            ):
+                return
+
         # Clear the specified row without updating the display immediately
+        if force:
+            self.row_text[row] = None
         self._clear_row(row, update_display=False)
         # Update the row without updating the display immediately
-        self._update_row(text, column, row, color, update_display=False)
+        if text:
+            self._update_row(text, column, row, color, update_display=False)
+
+        self.row_text[row] = text
+        self.row_column[row] = column
+        self.row_color[row] = color
 
         # Update the display
-        self.oled.show()
+        self._flush()
 
     def enable(self):
         self.oled.poweron()
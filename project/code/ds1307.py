@@ -31,9 +31,26 @@ import time
 from micropython import const
 
 DATETIME_REG = const(0)  # 0x00-0x06
+SECONDS_REG = const(0)
+MINUTES_REG = const(1)
+HOURS_REG = const(2)
+WEEKDAY_REG = const(3)
+DATE_REG = const(4)
+MONTH_REG = const(5)
+YEAR_REG = const(6)
 CHIP_HALT = const(128)
 CONTROL_REG = const(7)  # 0x07
 RAM_REG = const(8)  # 0x08-0x3F
+RAM_SIZE = const(56)
+
+# BCD register value -> decimal, indexed by the raw byte; every byte has an
+# entry so a garbled read decodes to 0 instead of raising in the Timer callback.
+# And decimal 0-99 -> BCD.
+_BCD2DEC = bytes(
+    (i >> 4) * 10 + (i & 0x0F) if i < 0xA0 and (i & 0x0F) < 10 else 0
+    for i in range(256)
+)
+_DEC2BCD = bytes((i // 10) << 4 | (i % 10) for i in range(100))
 
 
 class DS1307(object):
@@ -44,14 +61,44 @@ class DS1307(object):
         self.addr = addr
         self.weekday_start = 1
         self._halt = False
-
-    def _dec2bcd(self, value):
-        """Convert decimal to binary coded decimal (BCD) format"""
-        return (value // 10) << 4 | (value % 10)
+        # Preallocated so the tick's datetime_into doesn't allocate. Only that
+        # path uses it: datetime() runs on either core and reads into its own
+        self._buf = bytearray(7)
+        self._reg_buf = bytearray(1)
+
+    def _dec2bcd(self, value, low=0, high=99):
+        """Convert decimal to binary coded decimal (BCD) format, raising
+        ValueError outside low-high instead of writing a wrapped byte"""
+        if not low <= value <= high:
+            raise ValueError(f"DS1307 value {value} outside {low}-{high}")
+        return _DEC2BCD[value]
 
     def _bcd2dec(self, value):
         """Convert binary coded decimal (BCD) format to decimal"""
-        return ((value >> 4) * 10) + (value & 0x0F)
+        return _BCD2DEC[value]
+
+    def datetime_into(self, out):
+        """Read the datetime into out, a mutable sequence of at least 7 ints such
+        as array("H", [0] * 8), in the same order as datetime(). Uses the
+        preallocated register buffer and lookup tables, so nothing is allocated.
+        Returns out."""
+        buf = self._buf
+        for attempt in range(3):
+            try:
+                self.i2c.readfrom_mem_into(self.addr, DATETIME_REG, buf)
+                break
+            except OSError:
+                if attempt == 2:
+                    raise
+                time.sleep(0.1)  # small delay before retry
+        out[0] = _BCD2DEC[buf[6]] + 2000  # year
+        out[1] = _BCD2DEC[buf[5] & 0x1F]  # month
+        out[2] = _BCD2DEC[buf[4] & 0x3F]  # day
+        out[3] = (buf[3] - self.weekday_start) & 0x07  # weekday
+        out[4] = _BCD2DEC[buf[2] & 0x3F]  # hour
+        out[5] = _BCD2DEC[buf[1] & 0x7F]  # minute
+        out[6] = _BCD2DEC[buf[0] & 0x7F]  # second
+        return out
 
     def datetime(self, datetime=None):
         """Get or set datetime"""
@@ -59,12 +106,13 @@ class DS1307(object):
         for attempt in range(retries):
             try:
                 if datetime is None:
-                    buf = self.i2c.readfrom_mem(self.addr, DATETIME_REG, 7)
+                    buf = bytearray(7)
+                    self.i2c.readfrom_mem_into(self.addr, DATETIME_REG, buf)
                     return (
                         self._bcd2dec(buf[6]) + 2000,  # year
                         self._bcd2dec(buf[5]),  # month
                         self._bcd2dec(buf[4]),  # day
-                        self._bcd2dec(buf[3] - self.weekday_start),  # weekday
+                        (buf[3] - self.weekday_start) & 0x07,  # weekday
                         self._bcd2dec(buf[2]),  # hour
                         self._bcd2dec(buf[1]),  # minute
                         self._bcd2dec(buf[0] & 0x7F),  # second
@@ -72,13 +120,13 @@ class DS1307(object):
                     )
                 buf = bytearray(7)
                 buf[0] = (
-                    self._dec2bcd(datetime[6]) & 0x7F
+                    self._dec2bcd(datetime[6], 0, 59) & 0x7F
                 )  # second, msb = CH, 1=halt, 0=go
-                buf[1] = self._dec2bcd(datetime[5])  # minute
-                buf[2] = self._dec2bcd(datetime[4])  # hour
-                buf[3] = self._dec2bcd(datetime[3] + self.weekday_start)  # weekday
-                buf[4] = self._dec2bcd(datetime[2])  # day
-                buf[5] = self._dec2bcd(datetime[1])  # month
+                buf[1] = self._dec2bcd(datetime[5], 0, 59)  # minute
+                buf[2] = self._dec2bcd(datetime[4], 0, 23)  # hour
+                buf[3] = self._dec2bcd(datetime[3], 0, 6) + self.weekday_start  # weekday
+                buf[4] = self._dec2bcd(datetime[2], 1, 31)  # day
+                buf[5] = self._dec2bcd(datetime[1], 1, 12)  # month
                 buf[6] = self._dec2bcd(datetime[0] - 2000)  # year
                 if self._halt:
                     buf[0] |= 1 << 7
@@ -117,6 +165,39 @@ class DS1307(object):
             buf[0] |= 1 << 7
         self.i2c.writeto_mem(self.addr, DATETIME_REG, buf)
 
+    def _write_reg(self, reg, value):
+        """Write one register in a single short transaction"""
+        self._reg_buf[0] = value
+        self.i2c.writeto_mem(self.addr, reg, self._reg_buf)
+
+    def set_seconds(self, second):
+        """Set seconds (0-59), keeping the clock halt (CH) bit as it is"""
+        self._write_reg(SECONDS_REG, self._dec2bcd(second, 0, 59) | (CHIP_HALT if self._halt else 0))
+
+    def set_minutes(self, minute):
+        """Set minutes (0-59)"""
+        self._write_reg(MINUTES_REG, self._dec2bcd(minute, 0, 59))
+
+    def set_hours(self, hour):
+        """Set hours (0-23), in 24-hour mode"""
+        self._write_reg(HOURS_REG, self._dec2bcd(hour, 0, 23))
+
+    def set_weekday(self, weekday):
+        """Set weekday (0-6, Sunday = 0 as in datetime())"""
+        self._write_reg(WEEKDAY_REG, self._dec2bcd(weekday, 0, 6) + self.weekday_start)
+
+    def set_date(self, day):
+        """Set day of the month (1-31)"""
+        self._write_reg(DATE_REG, self._dec2bcd(day, 1, 31))
+
+    def set_month(self, month):
+        """Set month (1-12)"""
+        self._write_reg(MONTH_REG, self._dec2bcd(month, 1, 12))
+
+    def set_year(self, year):
+        """Set year (2000-2099)"""
+        self._write_reg(YEAR_REG, self._dec2bcd(year - 2000))
+
     def halt(self, val=None):
         """Power up, power down or check status"""
         if val is None:
@@ -129,6 +210,19 @@ class DS1307(object):
         self._halt = bool(val)
         self.i2c.writeto_mem(self.addr, DATETIME_REG, bytearray([reg]))
 
+    def read_ram(self, buf, offset=0):
+        """Read len(buf) bytes of battery-backed RAM starting at offset into buf,
+        without allocating"""
+        if offset < 0 or offset + len(buf) > RAM_SIZE:
+            raise ValueError("RAM read out of range")
+        self.i2c.readfrom_mem_into(self.addr, RAM_REG + offset, buf)
+
+    def write_ram(self, buf, offset=0):
+        """Write buf to battery-backed RAM starting at offset in one transaction"""
+        if offset < 0 or offset + len(buf) > RAM_SIZE:
+            raise ValueError("RAM write out of range")
+        self.i2c.writeto_mem(self.addr, RAM_REG + offset, buf)
+
     def square_wave(self, sqw=0, out=0):
         """Output square wave on pin SQ at 1Hz, 4.096kHz, 8.192kHz or 32.768kHz,
         or disable the oscillator and output logic level high/low."""
@@ -1,17 +1,27 @@
-from machine import Pin, Timer
+from machine import Pin
 import utime
 from button import Button
 from led import LED
 
+# Quadrature state transition table, indexed by (last_state << 2) | state where a
+# state is (A << 1) | B.  +1 for a clockwise step (0 -> 1 -> 3 -> 2 -> 0), -1 for
+# counterclockwise (0 -> 2 -> 3 -> 1 -> 0) and 0 for no change or an invalid jump
+# where both channels changed at once.
+TRANSITIONS = (0, 1, -1, 0, -1, 0, 0, 1, 1, 0, 0, -1, 0, -1, 1, 0)
+
+# Valid transitions per detent (one full quadrature)
+STEPS_PER_DETENT = 4
+
 
 class RotaryEncoder:
     """
     Description: General purpose API for an encoder switch. Detect, debounce and report
-    encoder dial and button events.  Debouncing strategy for the encoder is fairly involved.
-    We detect both edge transitions (together representing a reliable change event) and
-    decode the quadrature in a predetermined resolve window.  Incomplete quadratures are
-    discarded as noise after timeout.  If a quadrature is discovered, we report the
-    decoded direction and incr/decr the dial counter.
+    encoder dial and button events.  Every edge on either channel is decoded straight
+    from the pin IRQ through a 16-entry Gray-code transition table, and the signed
+    result is accumulated until a full quadrature (four valid transitions in the same
+    direction) has been seen.  Contact bounce shows up as a step forward and back and
+    cancels itself out; invalid transitions and partial quadratures that don't
+    complete within qtimeout_ms are discarded as noise.
     In our testing, less than a full quadrature (edge transition) could be triggered
     with subtle dial movements, making an overly sensitive encoder.
     """
@@ -34,9 +44,10 @@ class RotaryEncoder:
         Args:
             qtimeout_ms (ms): Specifies the time limit to which a full quadrature should be
                 resolved.
-            transition_count (int): tracks the four transition states of the encoder. If
-                all four states are detected before the timeout we know we've completed a
-                single unit of rotation and should report the counter and direction.
+            transition_count (int): signed sum of decoded transitions in the current
+                quadrature. Reaching +/-4 before the timeout completes a single unit of
+                rotation and we report the counter and direction.
+            steps (int): signed count of detents since the last reset_counter.
             last_transistion_time (ms): tracks when the last encoder state was last reported.
                 We assume noise and should reset transition_count to zero if we don't
                 complete a quadrature within a reasonable amount of time (qtimeout_ms).
@@ -54,18 +65,13 @@ class RotaryEncoder:
         # self.counter = 0
         self.counter = self.min
         self.direction = ""
-        self.state = (self.pin_a.value() * 2) + self.pin_b.value()
+        self.state = (self.pin_a.value() << 1) | self.pin_b.value()
         self.last_state = self.state
         self.transition_count = 0
+        self.steps = 0
         self.last_transition_time = utime.ticks_ms()
         self.qtimeout_ms = qtimeout_ms
 
-        self.encoder_triggered = False
-
-        # Timer for encoder debounce
-        self.encoder_timer = Timer(-1)
-        self.debounce_delay_ms = 2
-
         self.pin_a.irq(
             trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, handler=self.encoder_irq
         )
@@ -99,18 +105,47 @@ class RotaryEncoder:
 
     def encoder_irq(self, pin):
         """
-        Description: Debounce the encoder signal by catching the first detected edge and muting
-        consecutive signals (contact noise) within the encoder_timer interval by setting
-        encoder_triggered to True.  Call the actual handler after the timer interval.  We should reset the
-        encoder_triggered to False after the real handler has completed!
+        Description: Decode one edge on either channel.
+        1. Read both channels into a 2-bit state:
+                00: Both channels A and B are low.
+                01: pin A is low, and pin B is high.
+                10: pin A is high, and pin B is low.
+                11: A and B are high.
+        2. If the last transition is older than qtimeout_ms, the partial quadrature
+           is stale (likely noise), start again.
+        3. Look up the transition from the last state: +1 clockwise, -1
+           counterclockwise, 0 invalid (both channels moved, we missed an edge).
+           An invalid transition also throws away the partial quadrature.
+        4. Once four transitions in one direction have accumulated, report a
+           detent and incr/decr the counter.
         """
-        if not self.encoder_triggered:
-            self.encoder_triggered = True
-            self.encoder_timer.init(
-                mode=Timer.ONE_SHOT,
-                period=self.debounce_delay_ms,
-                callback=self.process_encoder,
-            )
+        state = (self.pin_a.value() << 1) | self.pin_b.value()
+        if state == self.last_state:
+            return
+
+        current_time = utime.ticks_ms()
+        if utime.ticks_diff(current_time, self.last_transition_time) > self.qtimeout_ms:
+            self.transition_count = 0  # Reset the transition count due to timeout
+        self.last_transition_time = current_time
+
+        delta = TRANSITIONS[(self.last_state << 2) | state]
+        self.last_state = state
+        if delta == 0:
+            self.transition_count = 0
+            return
+
+        count = self.transition_count + delta
+        if count >= STEPS_PER_DETENT:
+            count = 0
+            self.steps += 1
+            self.update_counter(True)
+            self.led.on_ms(50)
+        elif count <= -STEPS_PER_DETENT:
+            count = 0
+            self.steps -= 1
+            self.update_counter(False)
+            self.led.on_ms(50)
+        self.transition_count = count
 
     def update_counter(self, increment):
 
@@ -131,77 +166,6 @@ class RotaryEncoder:
                 else:
                     self.counter = self.min
 
-    def process_encoder(self, timer):
-        """
-        Description: Handle to debounced interrupt signal.
-        1. Check if we have expired our time trying to resolve a quadrature.
-            if we have expired, it is likely in a noisy state, reset it.
-        2. Each interrupt compares the current state of the encoder
-            with the previous state.  If a difference occurs we increment
-            transition_count.
-        3. When we've counted 4 states, we need to determine if state changed and
-           in which direction.
-           (self.pin_a.value() * 2) + self.pin_b.value() combines the pin values
-           into a single integer (below). Note: multiplying by 2
-           allows us to represent state 2,3 from 0,1.
-            combines the pin values into a single integer:
-                00: Both channels A and B are low.
-                01: pin A is low, and pin B is high.
-                10: pin A is high, and pin B is low.
-                11: A and B are high.
-        4. Directional patterns:
-            Clockwise (CW) Rotation:
-
-                Sequence: 00 -> 01 -> 11 -> 10 -> 00
-                Corresponding decimal states: 0 -> 1 -> 3 -> 2 -> 0
-
-            Counterclockwise (CCW) Rotation:
-
-                Sequence: 00 -> 10 -> 11 -> 01 -> 00
-                Corresponding decimal states: 0 -> 2 -> 3 -> 1 -> 0
-        """
-        state = (self.pin_a.value() * 2) + self.pin_b.value()
-        current_time = utime.ticks_ms()
-
-        # Check if too much time has passed since the last transition
-        if utime.ticks_diff(current_time, self.last_transition_time) > self.qtimeout_ms:
-            self.transition_count = 0  # Reset the transition count due to timeout
-
-        # Detect state change
-        if state != self.last_state:
-            self.transition_count += 1
-            self.last_transition_time = current_time  # Update the last transition time
-
-            # Check for a complete encoder cycle
-            if self.transition_count == 4:
-                self.transition_count = 0
-
-                self.led.on_ms(50)
-                # Determine direction and update counter
-                # Clockwise transitions
-                if (
-                    (self.last_state == 0 and state == 1)
-                    or (self.last_state == 1 and state == 3)
-                    or (self.last_state == 3 and state == 2)
-                    or (self.last_state == 2 and state == 0)
-                ):
-                    self.update_counter(True)
-                # Counterclockwise transitions
-                elif (
-                    (self.last_state == 0 and state == 2)
-                    or (self.last_state == 2 and state == 3)
-                    or (self.last_state == 3 and state == 1)
-                    or (self.last_state == 1 and state == 0)
-                ):
-                    self.update_counter(False)
-
-                # print("Counter: ", self.counter, " | Direction: ", self.direction)
-                # print("\n")
-
-            self.last_state = state
-
-        self.encoder_triggered = False
-
     def button_callback(self, identity):
         if callable(self.programmed_callback):
             self.programmed_callback()
@@ -210,6 +174,7 @@ class RotaryEncoder:
     def reset_counter(self):
         self.counter = self.min
         self.direction = ""
+        self.steps = 0
         # self.update_callback(self.counter, self.direction)
 
 
@@ -1,6 +1,35 @@
 from machine import Pin, I2C
 
 
+class RadioStatus:
+    """
+    Description: Tuner status from Radio.GetStatus. One instance is refilled
+    by every read so polling it each tick doesn't allocate.
+    """
+
+    __slots__ = (
+        "valid",
+        "tuned",
+        "seek_failed",
+        "stereo",
+        "channel",
+        "frequency",
+        "rssi",
+        "fm_true",
+    )
+
+    def __init__(self):
+        # valid is False until a read succeeds
+        self.valid = False
+        self.tuned = False
+        self.seek_failed = False
+        self.stereo = False
+        self.channel = None
+        self.frequency = 0.0
+        self.rssi = 0
+        self.fm_true = False
+
+
 class Radio:
 
     # def __init__( self, NewFrequency, NewVolume, NewMute ):
@@ -31,12 +60,31 @@ class Radio:
         #
         self.i2c_device = 1
         self.i2c_device_address = 0x10
+        #
+        # Random access interface, the first byte written selects the register
+        #
+        self.i2c_register_address = 0x11
 
         #
-        # Array used to configure the radio
+        # Array used to configure the radio, registers 02h to 05h
         #
         self.Settings = bytearray(8)
 
+        #
+        # Copy of the registers as last written to the chip. Only words that
+        # differ from it are sent; ShadowValid is cleared when a write fails so
+        # the next one sends the whole block again.
+        #
+        self.Shadow = bytearray(8)
+        self.ShadowValid = False
+
+        #
+        # Preallocated read buffers: status registers 0Ah-0Bh, and one register
+        #
+        self.StatusBuffer = bytearray(4)
+        self.RegisterBuffer = bytearray(2)
+        self.Status = RadioStatus()
+
         self.radio_i2c = I2C(
             self.i2c_device, scl=self.i2c_scl, sda=self.i2c_sda, freq=200000
         )
@@ -99,15 +147,8 @@ class Radio:
     # convert the frequency to 10 bit value for the radio chip
     #
     def ComputeChannelSetting(self, Frequency):
-        Frequency = int(Frequency * 10) - 870
-
-        ByteCode = bytearray(2)
-        #
-        # split the 10 bits into 2 bytes
-        #
-        ByteCode[0] = (Frequency >> 2) & 0xFF
-        ByteCode[1] = ((Frequency & 0x03) << 6) & 0xC0
-        return ByteCode
+        # Rounded, as e.g. 100.3 * 10 is not exactly 1003 in floating point
+        return int(Frequency * 10 + 0.5) - 870
 
     #
     # Configure the settings array with the mute, frequency and volume settings
@@ -120,52 +161,167 @@ class Radio:
             self.Settings[0] = 0xC0
 
         self.Settings[1] = 0x09 | 0x04
-        self.Settings[2:3] = self.ComputeChannelSetting(self.Frequency)
-        self.Settings[3] = self.Settings[3] | 0x10
+        #
+        # split the 10 channel bits into register 03h in place, with TUNE set
+        #
+        Channel = self.ComputeChannelSetting(self.Frequency)
+        self.Settings[2] = (Channel >> 2) & 0xFF
+        self.Settings[3] = ((Channel & 0x03) << 6) | 0x10
         self.Settings[4] = 0x04
         self.Settings[5] = 0x00
         self.Settings[6] = 0x84
         self.Settings[7] = 0x80 + self.Volume
 
     #
-    # Update the settings array and transmitt it to the radio
+    # Update the settings array and transmitt the changed registers to the radio
     #
     def ProgramRadio(self):
 
         self.UpdateSettings()
-        self.radio_i2c.writeto(self.i2c_device_address, self.Settings)
+
+        #
+        # First write, or after an error: the whole block through the
+        # sequential interface, which starts at register 02h
+        #
+        if not self.ShadowValid or len(self.Settings) != len(self.Shadow):
+            self.WriteRegisters(0, 4, self.i2c_device_address)
+            return True
+
+        #
+        # Write each run of changed register words. Runs are kept apart so
+        # that, say, a volume change never rewrites register 03h, whose TUNE
+        # bit would retune the chip.
+        #
+        Changed = False
+        First = None
+        for Word in range(5):
+            Offset = Word * 2
+            if Word < 4 and (
+                self.Settings[Offset] != self.Shadow[Offset]
+                or self.Settings[Offset + 1] != self.Shadow[Offset + 1]
+            ):
+                if First is None:
+                    First = Word
+            elif First is not None:
+                self.WriteRegisters(First, Word)
+                First = None
+                Changed = True
+
+        return Changed
 
     #
-    # Extract the settings from the radio registers
+    # Write register words First to End - 1 (0 is register 02h) and update the
+    # shadow. Through the random access interface unless an address is given.
     #
-    def GetSettings(self):
+    def WriteRegisters(self, First, End, Address=None):
+
+        Block = memoryview(self.Settings)[First * 2 : End * 2]
+        try:
+            if Address is None:
+                self.radio_i2c.writeto_mem(self.i2c_register_address, 0x02 + First, Block)
+            else:
+                self.radio_i2c.writeto(Address, Block)
+
+        except OSError:
+            self.ShadowValid = False
+            raise
+
+        self.Shadow[First * 2 : End * 2] = Block
+        self.ShadowValid = True
+
+    #
+    # Start a hardware seek from the current channel. Up selects SEEKUP; Wrap
+    # continues at the other end of the band instead of stopping at the edge
+    # with SF set. Only register 02h is written. The chip clears SEEK and sets
+    # STC when it stops, so poll GetStatus until tuned is True.
+    #
+    def Seek(self, Up=True, Wrap=True):
+
+        self.UpdateSettings()
+        Flags = 0x01  # SEEK
+        if Up:
+            Flags |= 0x02  # SEEKUP
+        self.Settings[0] |= Flags
+        if not Wrap:
+            self.Settings[1] |= 0x80  # SKMODE, stop at the band limit
+        self.WriteRegisters(0, 1)
+
+    #
+    # Record a frequency the chip tuned to by itself (after a seek) as the
+    # current one, without retuning. The shadow copy of register 03h is made
+    # to match, so a later tune back to the old frequency is still written.
+    #
+    def AdoptFrequency(self, NewFrequency):
+
+        self.Frequency = NewFrequency
+        self.UpdateSettings()
+        self.Shadow[2:4] = self.Settings[2:4]
+
+    #
+    # Read the status registers 0Ah and 0Bh into the reused status record.
+    # The sequential interface starts reading at 0Ah, so this is one 4 byte
+    # read with no register address phase.
+    #
+    def GetStatus(self):
+
+        Status = self.Status
+        Buffer = self.StatusBuffer
+        try:
+            self.radio_i2c.readfrom_into(self.i2c_device_address, Buffer)
+
+        except OSError:
+            Status.valid = False
+            return Status
+
         #
-        # Need to read the entire register space. This is allow access to the mute and volume settings
-        # After and address of 255 the
+        # 0Ah: STC, SF, ST and the 10 bit READCHAN. 0Bh: RSSI and FM_TRUE
         #
-        self.RadioStatus = self.radio_i2c.readfrom(self.i2c_device_address, 256)
+        Status.valid = True
+        Status.tuned = (Buffer[0] & 0x40) != 0x00
+        Status.seek_failed = (Buffer[0] & 0x20) != 0x00
+        Status.stereo = (Buffer[0] & 0x04) != 0x00
+        Channel = ((Buffer[0] & 0x03) << 8) | Buffer[1]
+        if Channel != Status.channel:
+            Status.channel = Channel
+            Status.frequency = (Channel * 0.1) + 87.0
+        Status.rssi = Buffer[2] >> 1
+        Status.fm_true = (Buffer[2] & 0x01) != 0x00
+        return Status
 
-        if (self.RadioStatus[0xF0] & 0x40) != 0x00:
-            MuteStatus = False
-        else:
-            MuteStatus = True
+    #
+    # Read registers 0Ah to 0Fh into a 12 byte Buffer: status (with RDSR and
+    # RDSS), RSSI and the block error rates, then RDS blocks A to D
+    #
+    def ReadRds(self, Buffer):
 
-        VolumeStatus = self.RadioStatus[0xF7] & 0x0F
+        self.radio_i2c.readfrom_into(self.i2c_device_address, Buffer)
 
+    #
+    # Read one 16 bit register through the random access interface
+    #
+    def ReadRegister(self, Register):
+
+        self.radio_i2c.readfrom_mem_into(
+            self.i2c_register_address, Register, self.RegisterBuffer
+        )
+        return (self.RegisterBuffer[0] << 8) | self.RegisterBuffer[1]
+
+    #
+    # Extract the settings from the radio registers
+    #
+    def GetSettings(self):
         #
-        # Convert the frequency 10 bit count into actual frequency in Mhz
+        # Mute is DMUTE in 02h, volume the low bits of 05h, and the frequency
+        # and stereo flag come from the status registers
         #
-        FrequencyStatus = ((self.RadioStatus[0x00] & 0x03) << 8) | (
-            self.RadioStatus[0x01] & 0xFF
-        )
-        FrequencyStatus = (FrequencyStatus * 0.1) + 87.0
+        MuteStatus = (self.ReadRegister(0x02) & 0x4000) == 0x0000
+        VolumeStatus = self.ReadRegister(0x05) & 0x000F
 
-        if (self.RadioStatus[0x00] & 0x04) != 0x00:
-            StereoStatus = True
-        else:
-            StereoStatus = False
+        Status = self.GetStatus()
+        if not Status.valid:
+            raise OSError("Radio status read failed")
 
-        return (MuteStatus, VolumeStatus, FrequencyStatus, StereoStatus)
+        return (MuteStatus, VolumeStatus, Status.frequency, Status.stereo)
 
 
 if __name__ == "__main__":
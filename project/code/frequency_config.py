@@ -60,15 +60,23 @@ class FrequencyConfig(UI):
         return context if context else {}
 
     def update_display(self):
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        self.display.update_text(str(self.current_value), 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text(str(self.current_value), 0, 1)
 
     def poll_selection_change_and_update_display(self):
         new_value, direction = self.encoder.get_counter()
         if new_value != self.current_value:
             self.current_value = new_value
             self.update_display()
+            # Tune while turning; RadioControl coalesces the writes
+            self.radio_control.set_frequency(self.preview_frequency(new_value))
+
+    def preview_frequency(self, value):
+        if self.header == "fractional_part":
+            return float(f"{int(self.current_frequency)}.{value}")
+        return float(value)
 
     def button_release(self):
         if self.header == "integer_part":
@@ -78,6 +86,7 @@ class FrequencyConfig(UI):
         elif self.header == "fractional_part":
             new_frequency = float(f"{int(self.current_frequency)}.{self.current_value}")
             self.radio_control.set_frequency(new_frequency)
+            self.radio_control.save_presets()
             self.build_context("Main Menu", "main_menu", None, None)
         print(f"current_frequency: {self.radio_control.get_frequency()}")
 
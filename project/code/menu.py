@@ -51,12 +51,13 @@ class Menu(UI):
             print("ENCODER NOT CREATED FOR MENU")
             raise
 
-        # Display header on row 0
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
+        # Display header on row 0, drawn with the selectables as one frame
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
 
-        self.last_count = self._get_cursor_position_modulus()
-        self._update_count_and_display(self.last_count)
+            self.last_count = self._get_cursor_position_modulus()
+            self._update_count_and_display(self.last_count)
 
     def _get_cursor_position_modulus(self):
         current_count = self.encoder.get_counter()[0]
@@ -85,11 +86,12 @@ class Menu(UI):
                 "display_text"
             ] = f"{self.cursor_icon} {self.selectables[index]['display_text']}"
 
-        # Update the display
-        self.display.update_text(self.header, 0, 0)
-        col = 0
-        for i, selectable in enumerate(self.selectables):
-            self.display.update_text(selectable["display_text"], col, i + 1)
+        # Update the display, flushing the header and all rows once
+        with self.display:
+            self.display.update_text(self.header, 0, 0)
+            col = 0
+            for i, selectable in enumerate(self.selectables):
+                self.display.update_text(selectable["display_text"], col, i + 1)
 
         # Restore the original texts
         for i, selectable in enumerate(self.selectables):
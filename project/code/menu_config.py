@@ -3,12 +3,15 @@ from time_config import TimeConfig
 from date_config import DateConfig
 from time_mode import TimeMode
 from timezone_config import TimeZoneConfig
+from timezones import MENU_ZONES
 from alarm_config import AlarmConfig
 from alarm_disable import AlarmDisable
 from alarm_delete import AlarmDelete
 from alarm_snooze import AlarmSnooze
 from volume_config import VolumeConfig
 from frequency_config import FrequencyConfig
+from scan_config import ScanConfig
+from preset_config import PresetConfig
 from context_queue import context_queue
 from context import Context
 
@@ -196,10 +199,7 @@ def start_timezone_config(display, rtc):
         {
             "header": "Time Menu",
             "selectables": [
-                # {"display_text": "UTC", "id": "UTC"},
-                {"display_text": "CST", "id": "CST"},
-                # {"display_text": "CDT", "id": "CDT"},
-                {"display_text": "PST", "id": "PST"},
+                {"display_text": zone_id, "id": zone_id} for zone_id in MENU_ZONES
             ],
         }
     )
@@ -225,6 +225,8 @@ def start_radio_menu(display):
                     "display_text": "Set Frequency",
                     "id": "set_frequency",
                 },  # Added new selectable
+                {"display_text": "Scan", "id": "scan_stations"},
+                {"display_text": "Presets", "id": "preset_stations"},
             ],
         }
     )
@@ -274,6 +276,38 @@ def start_frequency_fractional_config(display, radio_control):
     )
 
 
+def start_scan_config(display, radio_control):
+    current_context = context_queue.dequeue()
+    context = Context(
+        router_context={"next_ui_id": "main_menu"},
+        ui_context={"header": "Scan"},
+    )
+    context_queue.add_to_queue(context)
+
+    return ScanConfig(
+        display=display,
+        radio_control=radio_control,
+        encoder_pins=(19, 18, 20),
+        led_pin=15,
+    )
+
+
+def start_preset_config(display, radio_control):
+    current_context = context_queue.dequeue()
+    context = Context(
+        router_context={"next_ui_id": "main_menu"},
+        ui_context={"header": "Presets"},
+    )
+    context_queue.add_to_queue(context)
+
+    return PresetConfig(
+        display=display,
+        radio_control=radio_control,
+        encoder_pins=(19, 18, 20),
+        led_pin=15,
+    )
+
+
 def start_main_menu(display):
     context = context_queue.dequeue()
     # Check if router_context exists
@@ -353,6 +387,8 @@ menu_map = {
     "snooze": start_snooze_config,
     "set_frequency": start_frequency_config,
     "frequency_fractional": start_frequency_fractional_config,
+    "scan_stations": start_scan_config,
+    "preset_stations": start_preset_config,
 }
 
 
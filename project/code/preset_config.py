@@ -0,0 +1,131 @@
+from ui import UI
+from encoder import RotaryEncoder
+from context_queue import context_queue
+from context import Context
+
+
+class PresetConfig(UI):
+    """
+    Description: Lists the stored stations, strongest first. Turning the
+    encoder tunes to the highlighted station straight away, which is one
+    register write; pressing it keeps that station and saves it as the last
+    one.
+    """
+
+    def __init__(self, display, radio_control, encoder_pins, led_pin, cursor=">"):
+        self.display = display
+        self.radio_control = radio_control
+        self.cursor_icon = cursor
+
+        # Load context
+        self.ui_context = self.load_context()
+        self.header = self.ui_context.get("header", "Presets")
+
+        # One row for the header, the rest for stations
+        self.max_stations = self.display.max_rows - 1
+        self.stations = self.load_stations()
+        self.last_count = None
+
+        try:
+            self.encoder = RotaryEncoder(
+                pin_a=encoder_pins[0],
+                pin_b=encoder_pins[1],
+                pin_switch=encoder_pins[2],
+                led_pin=led_pin,
+                rollover=True,
+                max=max(len(self.stations or ()), 1),
+                min=1,
+                button_callback=self.button_release,
+                on_release=True,
+            )
+
+        except Exception as e:
+            print("ENCODER NOT CREATED FOR PRESET CONFIG")
+            raise
+
+        self.start()
+
+    def load_stations(self):
+        return self.radio_control.get_stations()[: self.max_stations]
+
+    def start(self):
+        # Start on the station that is playing, if it is in the list
+        frequency = self.radio_control.get_frequency()
+        for i, station in enumerate(self.stations):
+            if abs(station[0] - frequency) < 0.05:
+                self.encoder.set_counter(i + 1)
+        self.last_count = self.encoder.get_counter()[0]
+        self.update_station_list(self.last_count)
+
+    def load_context(self):
+        """
+        Dequeue context from the queue and return the ui_context.
+        """
+        context = context_queue.dequeue()
+        print(
+            f"preset_config,load_context,dequeue\n{context.router_context}\n{context.ui_context}\n{context_queue.size()}"
+        )
+
+        if isinstance(context, Context):
+            return context.ui_context
+
+        return context if context else {}
+
+    def station_text(self, station):
+        frequency, rssi, stereo = station
+        return "{:.1f} R{} {}".format(frequency, rssi, "ST" if stereo else "MO")
+
+    def poll_selection_change_and_update_display(self):
+        current_count = self.encoder.get_counter()[0]
+        if current_count != self.last_count:
+            self.last_count = current_count
+            self.update_station_list(current_count)
+            if self.stations:
+                # Coalesced by RadioControl, and only register 03h changes
+                self.radio_control.set_frequency(self.stations[current_count - 1][0])
+
+    def update_station_list(self, current_count):
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            if not self.stations:
+                self.display.update_text("No stations", 0, 1)
+                return
+            for i, station in enumerate(self.stations):
+                text = self.station_text(station)
+                if i == current_count - 1:
+                    text = f"{self.cursor_icon} {text}"
+                self.display.update_text(text, 0, i + 1)
+
+    def button_release(self):
+        if self.stations:
+            frequency = self.stations[self.encoder.get_counter()[0] - 1][0]
+            self.radio_control.set_frequency(frequency)
+            self.radio_control.save_presets()
+        self.build_context()
+
+    def build_context(self):
+        context = Context(
+            router_context={"next_ui_id": "main_menu"},
+            ui_context={
+                "header": "Main Menu",
+                "selectables": [
+                    {"display_text": "Time", "id": "time_menu"},
+                    {"display_text": "Radio", "id": "radio_menu"},
+                ],
+            },
+        )
+        context_queue.add_to_queue(context)
+
+    def is_encoder_button_pressed(self):
+        if self.encoder.get_button_state():
+            return True
+        return False
+
+    def stop(self):
+        if self.encoder:
+            self.encoder.pin_a.irq(handler=None)
+            self.encoder.pin_b.irq(handler=None)
+            self.encoder.button.disable_irq()
+        if self.display:
+            self.display.clear()
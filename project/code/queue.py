@@ -1,17 +1,61 @@
 class Queue:
-    def __init__(self):
-        self.queue = []
+    """
+    Description: Fixed-capacity FIFO on a preallocated ring buffer.  put/get are
+    O(1) and don't allocate, so the queue can be used from IRQ callbacks.
+    Args:
+        capacity (int): number of slots, allocated up front.
+        overflow (int): what put does when the queue is full.
+            DROP_OLDEST: discard the oldest item to make room (default).
+            REJECT: leave the queue untouched and return False.
+    """
+
+    DROP_OLDEST = 0
+    REJECT = 1
+
+    def __init__(self, capacity=16, overflow=DROP_OLDEST):
+        self.capacity = capacity
+        self.overflow = overflow
+        self.slots = [None] * capacity
+        self.head = 0  # next slot to read
+        self.count = 0
+        self.dropped = 0
 
     def put(self, item):
-        self.queue.append(item)
+        if self.count == self.capacity:
+            self.dropped += 1
+            if self.overflow == Queue.REJECT:
+                return False
+            # Overwrite the oldest item and move the read position past it
+            self.slots[self.head] = item
+            self.head = (self.head + 1) % self.capacity
+            return True
+        self.slots[(self.head + self.count) % self.capacity] = item
+        self.count += 1
+        return True
 
     def get(self):
-        if not self.empty():
-            return self.queue.pop(0)
-        return None
+        if self.count == 0:
+            return None
+        item = self.slots[self.head]
+        self.slots[self.head] = None  # don't keep the item alive
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+        return item
+
+    def peek(self):
+        if self.count == 0:
+            return None
+        return self.slots[self.head]
 
     def empty(self):
-        return len(self.queue) == 0
+        return self.count == 0
+
+    def full(self):
+        return self.count == self.capacity
 
     def size(self):
-        return len(self.queue)
+        return self.count
+
+    def clear(self):
+        while self.count:
+            self.get()
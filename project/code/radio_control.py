@@ -1,34 +1,144 @@
+from machine import Timer
 from fm_radio import Radio
+from station_scanner import StationScanner
+from radio_presets import RadioPresets
+from rds import RdsDecoder
 
 
 class RadioControl:
+    # Changes within this window are sent as one write at its end
+    COALESCE_MS = 50
+
     def __init__(self):
         print("Initializing RadioControl")
-        self.muted = True
+        # Last station, volume, mute state and scan results: one file read,
+        # then the radio is programmed once with them
+        self.presets = RadioPresets()
+        self.presets.load()
+        self.muted = self.presets.muted
         # GP 26 and 27
-        # self.radio = Radio(100.3, 2, self.muted, 26, 27) # uvic
-        # self.radio = Radio(98.5, 2, self.muted, 26, 27)
-        self.radio = Radio(103.1, 2, self.muted, 26, 27)
+        self.radio = Radio(
+            self.presets.frequency, self.presets.volume, self.muted, 26, 27
+        )
+
+        # One-shot timer for the trailing write of a burst of changes
+        self.program_timer = Timer(-1)
+        self.program_pending = False
+        self.program_armed = False
+
+        # Hardware seek and band scan, stepped by its own timer
+        self.scanner = StationScanner(self.radio)
+        self.scanner.stations = self.presets.stations
+
+        # Station name and RadioText, decoded only while the radio plays
+        self.rds = RdsDecoder(self.radio)
+        if not self.muted:
+            self.rds.start()
 
         print("RadioControl initialized")
 
     def toggle_mute(self):
-        self.muted = not self.muted
-        self.radio.SetMute(self.muted)
-        self.radio.ProgramRadio()
+        self.set_mute(not self.muted)
+        self.save_presets()
+
+    def set_mute(self, muted):
+        """
+        Description: Mute or unmute without saving it as the boot state.
+        """
+        self.muted = muted
+        self.radio.SetMute(muted)
+        self.request_program()
+        if muted:
+            self.rds.stop()
+        else:
+            self.rds.start()
+
+    def save_presets(self):
+        """
+        Description: Persist the current station, volume, mute state and the
+        last scan results. Call when a change is confirmed, not on every
+        encoder step; the file is only rewritten if something changed.
+        """
+        presets = self.presets
+        presets.frequency = self.radio.Frequency
+        presets.volume = self.radio.Volume
+        presets.muted = self.muted
+        presets.stations = self.scanner.stations
+        presets.save()
 
     def set_volume(self, volume):
         self.radio.SetVolume(volume)
-        self.radio.ProgramRadio()
-        print("RadioControl volume set to {volume}")
+        self.request_program()
+
+    def scan(self, on_done=None):
+        """
+        Description: Start a scan of 88-108 MHz in the background. Poll
+        is_scanning() and read get_stations() once it has finished.
+        """
+        self.scanner.scan(on_done)
 
-    def scan(self):
-        "50 to 115Mhz"
-        pass
+    def seek(self, up=True, on_done=None):
+        """
+        Description: Start a seek to the next station up or down the band.
+        """
+        self.scanner.seek(up, on_done)
+
+    def is_scanning(self):
+        return self.scanner.is_busy()
+
+    def get_stations(self):
+        """
+        Description: Stations from the last scan as (frequency, rssi, stereo)
+        tuples, strongest first.
+        """
+        return self.scanner.stations
 
     def set_frequency(self, frequency):
+        # Tuning by hand ends a scan or seek in progress
+        self.scanner.cancel()
         self.radio.SetFrequency(frequency)
-        self.radio.ProgramRadio()
+        self.request_program()
+
+    def request_program(self):
+        """
+        Description: Schedule the new settings to be sent to the radio. The
+        first change of a burst arms a COALESCE_MS one-shot timer and every
+        later change within the window only updates the settings, so spinning
+        the encoder costs one register write per window and the final state
+        lands at most COALESCE_MS later.
+        """
+        self.program_pending = True
+        if not self.program_armed:
+            self.program_armed = True
+            self.program_timer.init(
+                mode=Timer.ONE_SHOT, period=self.COALESCE_MS, callback=self.flush
+            )
+
+    def flush(self, timer=None):
+        """
+        Description: Send pending settings now. Called by the timer, or
+        directly when the write must not wait.
+        Returns:
+            bool: False if the radio write failed
+        """
+        self.program_armed = False
+        if not self.program_pending:
+            return True
+        self.program_pending = False
+        try:
+            self.radio.ProgramRadio()
+            return True
+
+        except Exception as e:
+            print(f"Error in radio_control.flush programming the radio: {e}")
+            return False
+
+    def get_status(self):
+        """
+        Description: Tuner status (stereo, RSSI, tuned frequency) from one
+        short register read into a reused record, cheap enough for every tick.
+        """
+        return self.radio.GetStatus()
 
     def get_volume(self):
         return self.radio.Volume
@@ -0,0 +1,150 @@
+import struct
+import uos
+from logger import Logger
+
+# Header: magic, format version, station count, last channel, volume, flags,
+# checksum
+HEADER_FORMAT = "<2sBBHBBB"
+HEADER_SIZE = 9
+MAGIC = b"RP"
+VERSION = 1
+
+# Station: channel, rssi, flags
+STATION_FORMAT = "<HBB"
+STATION_SIZE = 4
+
+FLAG_MUTED = 0x01
+FLAG_STEREO = 0x01
+
+# Channels are 100 kHz steps up from 87.0 MHz, as on the tuner
+BAND_BASE = 870
+
+
+def to_channel(frequency):
+    return int(frequency * 10 + 0.5) - BAND_BASE
+
+
+def to_frequency(channel):
+    return (channel + BAND_BASE) / 10
+
+
+class RadioPresets:
+    """
+    Description: Last tuned frequency, volume, mute state and the stations
+    from the last scan, kept in one small binary file. Boot reads it once;
+    save() rewrites it through a temporary file and a rename, and only when
+    something changed, so a power cut leaves either the old or the new record.
+    Args:
+        filename (str): preset file name
+        slots (int): most stations kept; the presets menu shows one per row
+    """
+
+    DEFAULT_FREQUENCY = 103.1
+    DEFAULT_VOLUME = 2
+
+    def __init__(self, filename="radio.bin", slots=7):
+        self.logger = Logger(level=Logger.INFO)
+        self.filename = filename
+        self.temp_filename = filename + ".tmp"
+        self.slots = slots
+        self.buffer = bytearray(HEADER_SIZE + slots * STATION_SIZE)
+
+        self.frequency = self.DEFAULT_FREQUENCY
+        self.volume = self.DEFAULT_VOLUME
+        self.muted = True
+        # (frequency, rssi, stereo), strongest first
+        self.stations = []
+
+    def load(self):
+        """
+        Description: Read the preset file. A missing, short or corrupt file
+        leaves the defaults.
+        Returns:
+            bool: True if presets were loaded
+        """
+        try:
+            with open(self.filename, "rb") as file:
+                count = file.readinto(self.buffer)
+        except OSError:
+            return False
+
+        magic, version, stations, channel, volume, flags, _ = struct.unpack_from(
+            HEADER_FORMAT, self.buffer, 0
+        )
+        if (
+            count != len(self.buffer)
+            or magic != MAGIC
+            or version != VERSION
+            or stations > self.slots
+            or sum(self.buffer) & 0xFF
+        ):
+            self.logger.warning(f"{self.filename} is not a valid preset file, using defaults")
+            return False
+
+        self.frequency = to_frequency(channel)
+        self.volume = volume
+        self.muted = bool(flags & FLAG_MUTED)
+        self.stations = []
+        for i in range(stations):
+            channel, rssi, flags = struct.unpack_from(
+                STATION_FORMAT, self.buffer, HEADER_SIZE + i * STATION_SIZE
+            )
+            self.stations.append((to_frequency(channel), rssi, bool(flags & FLAG_STEREO)))
+        return True
+
+    def save(self):
+        """
+        Description: Write the current values if they differ from the file.
+        """
+        packed = self._pack()
+        if packed == self.buffer:
+            return
+        try:
+            with open(self.temp_filename, "wb") as file:
+                file.write(packed)
+            uos.rename(self.temp_filename, self.filename)
+            self.buffer = packed
+
+        except Exception as e:
+            msg = f"Error in radio_presets writing {self.filename}"
+            self.logger.error(e, msg)
+
+    def _pack(self):
+        packed = bytearray(len(self.buffer))
+        stations = self.stations[: self.slots]
+        struct.pack_into(
+            HEADER_FORMAT,
+            packed,
+            0,
+            MAGIC,
+            VERSION,
+            len(stations),
+            to_channel(self.frequency),
+            self.volume,
+            FLAG_MUTED if self.muted else 0,
+            0,
+        )
+        for i, (frequency, rssi, stereo) in enumerate(stations):
+            struct.pack_into(
+                STATION_FORMAT,
+                packed,
+                HEADER_SIZE + i * STATION_SIZE,
+                to_channel(frequency),
+                rssi,
+                FLAG_STEREO if stereo else 0,
+            )
+        # The whole record sums to zero (mod 256)
+        packed[HEADER_SIZE - 1] = -sum(packed) & 0xFF
+        return packed
+
+
+if __name__ == "__main__":
+
+    presets = RadioPresets("radio_test.bin")
+    presets.stations = [(98.5, 48, True), (93.1, 22, False)]
+    presets.frequency = 98.5
+    presets.save()
+
+    presets = RadioPresets("radio_test.bin")
+    print(presets.load(), presets.frequency, presets.volume, presets.muted, presets.stations)
+    uos.remove("radio_test.bin")
@@ -0,0 +1,307 @@
+"""
+RDS (Radio Data System) decoding for the RDA5807 tuner: station name (PS,
+groups 0A/0B) and RadioText (RT, groups 2A/2B).
+"""
+
+import array
+import micropython
+from machine import Timer
+
+# Groups kept between the read and the decoder
+RING_GROUPS = 8
+
+# Words per ring entry: blocks A-D and the error byte from register 0Bh
+ENTRY_WORDS = 5
+
+# Highest block error rate accepted: 0 = no errors, 1 = 1-2 corrected bits
+MAX_BLER = 1
+
+PS_LENGTH = 8
+RT_LENGTH = 64
+
+
+def _printable(buffer, length):
+    # RDS uses its own character table; anything outside ASCII shows as a space
+    out = bytearray(length)
+    for i in range(length):
+        value = buffer[i]
+        out[i] = value if 0x20 <= value < 0x7F else 0x20
+    return bytes(out).decode().rstrip()
+
+
+class RdsDecoder:
+    """
+    Description: Polls the tuner for RDS groups and assembles the station name
+    and RadioText. A Timer only schedules the work; the read and the decoding
+    run in the scheduled (main) context, never in the Timer IRQ. Each poll is
+    one 12-byte read of registers 0Ah-0Fh into a preallocated buffer, and each
+    good group goes through a preallocated ring, so nothing is allocated per
+    block. Text is rebuilt and on_change called only when a complete PS or RT
+    differs from the last one published.
+    Args:
+        radio (Radio): tuner driver
+        on_change (function): called with no arguments after ps or radiotext
+            changed, in the scheduled context
+        poll_ms (int): poll period; groups arrive about every 88 ms
+    """
+
+    POLL_MS = 40
+
+    def __init__(self, radio, on_change=None, poll_ms=POLL_MS):
+        self.radio = radio
+        self.on_change = on_change
+        self.poll_ms = poll_ms
+        self.timer = Timer(-1)
+        self.running = False
+        self.pending = False
+
+        self.read_buffer = bytearray(12)
+        self.ring = array.array("H", [0] * (RING_GROUPS * ENTRY_WORDS))
+        self.head = 0
+        self.count = 0
+        self.overruns = 0
+        self.groups = 0
+        self.errors = 0
+
+        self.ps_buffer = bytearray(PS_LENGTH)
+        self.ps_published = bytearray(PS_LENGTH)
+        self.rt_buffer = bytearray(RT_LENGTH)
+        self.rt_published = bytearray(RT_LENGTH)
+        self.rt_published_length = 0
+        self.ps = ""
+        self.radiotext = ""
+        # Set when the text changed; on_change is only called from _service
+        self.changed = False
+
+        # Bound once: creating the bound method in the IRQ would allocate
+        self._service_ref = self._service
+        self.reset()
+
+    def reset(self):
+        """
+        Description: Forget everything received, e.g. after a retune. May be
+        called from either core; the change is published from the scheduled
+        context.
+        """
+        self.channel = None
+        self.pi = None
+        self.ps_bitmap = 0
+        self.rt_bitmap = 0
+        self.rt_flag = None
+        self.rt_segment_size = 4
+        self.head = 0
+        self.count = 0
+        if self.ps or self.radiotext:
+            self.changed = True
+        self.ps = ""
+        self.radiotext = ""
+        for i in range(PS_LENGTH):
+            self.ps_buffer[i] = 0x20
+            self.ps_published[i] = 0
+        for i in range(RT_LENGTH):
+            self.rt_buffer[i] = 0x20
+        self.rt_published_length = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.timer.init(mode=Timer.PERIODIC, period=self.poll_ms, callback=self._tick)
+
+    def stop(self):
+        self.timer.deinit()
+        self.running = False
+        self.reset()
+        if self.changed:
+            # The timer no longer runs _service: publish the cleared text
+            # from the scheduled context
+            self._schedule()
+
+    def _tick(self, timer):
+        # IRQ context: hand the work to the main context
+        self._schedule()
+
+    def _schedule(self):
+        if self.pending:
+            return
+        self.pending = True
+        try:
+            micropython.schedule(self._service_ref, None)
+        except RuntimeError:
+            # Schedule queue full, try on the next tick
+            self.pending = False
+
+    def _service(self, _):
+        self.pending = False
+        try:
+            if self.running:
+                self.poll()
+                self.decode()
+
+            if self.changed:
+                self.changed = False
+                if self.on_change:
+                    self.on_change()
+
+        except Exception as e:
+            print(f"Error in rds service: {e}")
+
+    def poll(self):
+        """
+        Description: Read the RDS registers and queue the group if a new one
+        is ready and the decoder is synchronised.
+        """
+        buffer = self.read_buffer
+        try:
+            self.radio.ReadRds(buffer)
+        except OSError:
+            return
+
+        channel = ((buffer[0] & 0x03) << 8) | buffer[1]
+        if channel != self.channel:
+            # Retuned: the old station's text no longer applies
+            self.reset()
+            self.channel = channel
+
+        # RDSR (new group ready) and RDSS (synchronised)
+        if not buffer[0] & 0x80 or not buffer[0] & 0x10:
+            return
+
+        if self.count == RING_GROUPS:
+            # Decoder fell behind, drop the oldest group
+            self.head = (self.head + 1) % RING_GROUPS
+            self.count -= 1
+            self.overruns += 1
+
+        ring = self.ring
+        index = ((self.head + self.count) % RING_GROUPS) * ENTRY_WORDS
+        ring[index] = (buffer[4] << 8) | buffer[5]
+        ring[index + 1] = (buffer[6] << 8) | buffer[7]
+        ring[index + 2] = (buffer[8] << 8) | buffer[9]
+        ring[index + 3] = (buffer[10] << 8) | buffer[11]
+        ring[index + 4] = buffer[3]  # BLERA and BLERB
+        self.count += 1
+
+    def decode(self):
+        """
+        Description: Decode every queued group.
+        """
+        ring = self.ring
+        while self.count:
+            index = self.head * ENTRY_WORDS
+            self.head = (self.head + 1) % RING_GROUPS
+            self.count -= 1
+            self.decode_group(
+                ring[index],
+                ring[index + 1],
+                ring[index + 2],
+                ring[index + 3],
+                ring[index + 4],
+            )
+
+    def decode_group(self, block_a, block_b, block_c, block_d, errors):
+        """
+        Description: Apply one group. BLERA rates block A; the chip reports one
+        rate, BLERB, for blocks B-D, so a group is used only if that is good.
+        """
+        self.groups += 1
+        if errors & 0x03 > MAX_BLER:
+            self.errors += 1
+            return
+
+        if (errors >> 2) & 0x03 <= MAX_BLER:
+            # Block A carries the station's PI code
+            if self.pi is not None and block_a != self.pi:
+                channel = self.channel
+                self.reset()
+                self.channel = channel
+            self.pi = block_a
+
+        group = block_b >> 11  # type and version
+        if group == 0x00 or group == 0x01:
+            self._decode_ps(block_b & 0x03, block_d)
+        elif group == 0x04:
+            self._decode_rt(block_b, block_c, block_d, 4)
+        elif group == 0x05:
+            self._decode_rt(block_b, block_d, None, 2)
+
+    def _decode_ps(self, segment, block_d):
+        offset = segment * 2
+        self.ps_buffer[offset] = block_d >> 8
+        self.ps_buffer[offset + 1] = block_d & 0xFF
+        self.ps_bitmap |= 1 << segment
+        if self.ps_bitmap != 0x0F:
+            return
+
+        self.ps_bitmap = 0
+        if self.ps_buffer == self.ps_published:
+            return
+        self.ps_published[:] = self.ps_buffer
+        self.ps = _printable(self.ps_published, PS_LENGTH)
+        self.changed = True
+
+    def _decode_rt(self, block_b, first, second, segment_size):
+        # The A/B flag toggles when the station starts a new text
+        flag = (block_b >> 4) & 0x01
+        if flag != self.rt_flag or segment_size != self.rt_segment_size:
+            self.rt_flag = flag
+            self.rt_segment_size = segment_size
+            self.rt_bitmap = 0
+            for i in range(RT_LENGTH):
+                self.rt_buffer[i] = 0x20
+
+        segment = block_b & 0x0F
+        offset = segment * segment_size
+        buffer = self.rt_buffer
+        buffer[offset] = first >> 8
+        buffer[offset + 1] = first & 0xFF
+        if second is not None:
+            buffer[offset + 2] = second >> 8
+            buffer[offset + 3] = second & 0xFF
+        self.rt_bitmap |= 1 << segment
+
+        # Complete once every segment up to the end marker (0x0D) or the end
+        # of the buffer has arrived
+        length = segment_size * 16
+        for i in range(length):
+            if buffer[i] == 0x0D and self.rt_bitmap >> (i // segment_size) & 0x01:
+                length = i
+                break
+        segments = (length + segment_size - 1) // segment_size
+        if self.rt_bitmap & ((1 << segments) - 1) != (1 << segments) - 1:
+            return
+
+        published = self.rt_published
+        if length == self.rt_published_length:
+            for i in range(length):
+                if buffer[i] != published[i]:
+                    break
+            else:
+                return
+        for i in range(length):
+            published[i] = buffer[i]
+        self.rt_published_length = length
+        self.radiotext = _printable(self.rt_published, length)
+        self.changed = True
+
+    def text(self, width):
+        """
+        Description: One display line: the station name, then as much of the
+        RadioText as fits.
+        """
+        if not self.radiotext:
+            return self.ps
+        if not self.ps:
+            return self.radiotext[:width]
+        return f"{self.ps} {self.radiotext}"[:width]
+
+
+if __name__ == "__main__":
+    import utime
+    from fm_radio import Radio
+
+    radio = Radio(103.1, 2, False, 26, 27)
+    decoder = RdsDecoder(radio, on_change=lambda: print(decoder.ps, "|", decoder.radiotext))
+    decoder.start()
+    utime.sleep(10)
+    decoder.stop()
@@ -1,19 +1,277 @@
+import array
+import heapq
 import machine
 import utime
 import time
 import uos
 import random
+import struct
 from ds1307 import DS1307
+from at24c32 import AT24C32, RecordLog
+from alarm_store import FileAlarmStore, NvramAlarmStore
 from square_wave_generator import SquareWaveGenerator
 from logger import Logger
+from settings import settings
+from timezones import TimeZone
+import calendar_math
+
+
+class AlarmScheduler:
+    """
+    Description: Min-heap of upcoming alarm and snooze fire times so each tick
+    compares the current time against the head only, instead of scanning every
+    alarm for an exact hour/minute/second match.
+
+    Fire times are absolute seconds (RTC timestamp), so an alarm crossed between
+    two ticks still fires when a tick is late or an I2C read failed. Alarms
+    re-arm for the next day; snoozes fire once.
+    Args:
+        rtc (RealTimeClock): owner of the alarm and snooze index
+    """
+
+    SECONDS_PER_DAY = calendar_math.SECONDS_PER_DAY
+
+    # Largest gap between two good ticks that is treated as jitter. Anything
+    # longer (or a backwards step) is the clock being set, so re-anchor to the
+    # new time instead of firing every alarm in between.
+    MAX_CATCHUP_S = 300
+
+    def __init__(self, rtc):
+        self.rtc = rtc
+        self.heap = []
+        self.last_time = None
+        self.version = None
+
+    def next_fire_time(self, time_data, after):
+        """
+        Description: First timestamp strictly after `after` at which the given
+        hour/minute/second occurs.
+        """
+        second_of_day = calendar_math.seconds_of_day(
+            time_data["hour"], time_data["minute"], time_data["second"]
+        )
+        fire_at = after - after % self.SECONDS_PER_DAY + second_of_day
+        if fire_at <= after:
+            fire_at += self.SECONDS_PER_DAY
+        return fire_at
+
+    def rebuild(self, after):
+        """
+        Description: Rebuild the heap from the alarm index with every entry's
+        next fire time after the timestamp `after`.
+        """
+        rtc = self.rtc
+        self.version = rtc.alarm_version
+        heap = []
+        for alarm_id, alarm_time in rtc.get_alarm_times():
+            heap.append(
+                (self.next_fire_time(alarm_time, after), rtc.ALARM_FILE_PREFIX, alarm_id)
+            )
+        for snooze_id, snooze_time in rtc.snoozes:
+            heap.append(
+                (self.next_fire_time(snooze_time, after), rtc.SNOOZE_FILE_PREFIX, snooze_id)
+            )
+        heapq.heapify(heap)
+        self.heap = heap
+
+    def poll(self, now):
+        """
+        Description: Advance the scheduler to timestamp `now`.
+        Args:
+            now (int): current RTC timestamp in seconds, from a good read only
+        Returns:
+            list: (prefix, id) for every alarm or snooze due since the last
+            poll, or None when nothing is due.
+        """
+        last_time = self.last_time
+        if (
+            last_time is None
+            or now < last_time
+            or now - last_time > self.MAX_CATCHUP_S
+        ):
+            # First tick or the clock was set: only the current second counts
+            last_time = now - 1
+            self.version = None
+
+        if self.version != self.rtc.alarm_version:
+            # Alarms changed since the last tick; anything set for a second
+            # between the last tick and now still fires
+            self.rebuild(last_time)
+        self.last_time = now
+
+        heap = self.heap
+        if not heap or heap[0][0] > now:
+            return None
+
+        due = []
+        while heap and heap[0][0] <= now:
+            fire_at, prefix, time_id = heapq.heappop(heap)
+            due.append((prefix, time_id))
+            if prefix == self.rtc.ALARM_FILE_PREFIX:
+                while fire_at <= now:
+                    fire_at += self.SECONDS_PER_DAY
+                heapq.heappush(heap, (fire_at, prefix, time_id))
+        return due
+
+
+class SquareWaveClock:
+    """
+    Description: Software seconds counter driven by the DS1307's 1 Hz SQW output
+    on a GPIO, so the tick is phase-locked to the RTC and the time is known
+    without an I2C read every second. The counter is re-read from the chip every
+    resync_s seconds, after a missed edge, and after the time is set.
+    Args:
+        rtc (RealTimeClock): owner, used to read the chip time on resync
+        pin_id (int): GPIO wired to SQW (open drain, so pulled up here)
+        on_tick (function): called with the timestamp after every edge
+        resync_s (int): seconds between I2C resyncs
+    """
+
+    RESYNC_S = 300
+
+    # An edge arriving later than this means at least one was missed
+    MAX_EDGE_GAP_MS = 1500
+
+    def __init__(self, rtc, pin_id, on_tick=None, resync_s=RESYNC_S):
+        self.rtc = rtc
+        self.on_tick = on_tick
+        self.resync_s = resync_s
+        self.timestamp = None
+        self.since_sync = 0
+        self.last_edge_ms = None
+        self.pin = machine.Pin(pin_id, machine.Pin.IN, machine.Pin.PULL_UP)
+
+        # SQW falls when the seconds register rolls over
+        rtc.rtc.square_wave(sqw=1)
+        self.pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=self.edge)
+
+    def edge(self, pin):
+        now_ms = utime.ticks_ms()
+        missed = (
+            self.last_edge_ms is not None
+            and utime.ticks_diff(now_ms, self.last_edge_ms) > self.MAX_EDGE_GAP_MS
+        )
+        self.last_edge_ms = now_ms
+
+        if self.timestamp is None or missed or self.since_sync >= self.resync_s:
+            self.resync()
+        else:
+            self.timestamp += 1
+            self.since_sync += 1
+
+        if self.on_tick:
+            self.on_tick(self.timestamp)
+
+    def resync(self):
+        """
+        Description: Reload the counter from the chip. On a failed read the
+        counter keeps running from the edges and the next edge tries again.
+        """
+        try:
+            timestamp = self.rtc.read_timestamp()
+            if self.timestamp is not None and timestamp != self.timestamp + 1:
+                self.rtc.logger.debug(
+                    f"SQW clock drifted {timestamp - self.timestamp - 1}s, resynced"
+                )
+            self.timestamp = timestamp
+            self.since_sync = 0
+
+        except Exception as e:
+            print(f"SQW clock resync failed, retrying next edge: {e}")
+            if self.timestamp is not None:
+                self.timestamp += 1
+
+    def invalidate(self):
+        """
+        Description: Force a resync on the next edge, e.g. after setting the time.
+        """
+        self.since_sync = self.resync_s
+
+    def datetime(self):
+        """
+        Description: Counter as a DS1307 datetime tuple
+        (year, month, day, weekday, hour, minute, second, subseconds).
+        """
+        return tuple(self.datetime_into([0] * 8))
+
+    def datetime_into(self, out):
+        """
+        Description: Counter written into out in DS1307.datetime_into order.
+        """
+        year, month, day, weekday, hour, minute, second = calendar_math.to_datetime(
+            self.timestamp
+        )
+        out[0] = year
+        out[1] = month
+        out[2] = day
+        out[3] = weekday
+        out[4] = hour
+        out[5] = minute
+        out[6] = second
+        return out
+
+    def deinit(self):
+        self.pin.irq(handler=None)
+        self.rtc.rtc.square_wave(sqw=0)
+
+
+class TickSnapshot:
+    """
+    Description: The current time for one report tick, read once at the top of
+    the tick by RealTimeClock.fill_snapshot and shared by every renderer and the
+    alarm check. One instance is reused for every tick.
+    """
+
+    __slots__ = (
+        "valid",
+        "timestamp",
+        "year",
+        "month",
+        "day",
+        "weekday",
+        "hour",
+        "minute",
+        "second",
+        "timezone",
+        "time_text",
+        "date_text",
+    )
+
+    def __init__(self):
+        # valid is False until a read succeeds; the texts keep the last good
+        # values so a failed read doesn't blank the display
+        self.valid = False
+        self.timestamp = None
+        self.year = 0
+        self.month = 0
+        self.day = 0
+        self.weekday = 0
+        self.hour = 0
+        self.minute = 0
+        self.second = 0
+        self.timezone = "*"
+        self.time_text = "00:00:00"
+        self.date_text = "0000-00-00"
 
 
 class RealTimeClock:
-    CONFIG_FILE = "time_mode_config.txt"
-    TIMEZONE_FILE = "timezone_config.txt"
     SNOOZE_FILE_PREFIX = "snooze_"
     ALARM_FILE_PREFIX = "alarm_"
     ALARM_FILE_SUFFIX = ".txt"
+    ALARM_STORE_FILE = "alarms.bin"
+
+    # AT24C32 layout: the first 2 KB hold the event log, the rest is free
+    EVENT_LOG_START = 0
+    EVENT_LOG_RECORDS = 64
+
+    # Event log record kinds
+    EVENT_ALARM = 1
+    EVENT_SNOOZE = 2
+
+    # rtc_utc setting values
+    RTC_LOCAL = 0
+    RTC_UTC = 1
+    RTC_CONVERTING = 2
 
     def __init__(self):
 
@@ -32,14 +290,6 @@ class RealTimeClock:
             "saturday": 6,
         }
 
-        # Timezone offsets
-        self.tz_map = {
-            "UTC": 0,
-            "CST": -6,  # Mexico City
-            "CDT": -5,  # Mexico City Daylight Time
-            "PST": -8,
-        }
-
         self.reverse_weekday_map = {v: k for k, v in self.weekday_map.items()}
 
         # Initialize I2C0
@@ -48,25 +298,63 @@ class RealTimeClock:
         # Initialize DS1307
         self.rtc = DS1307(i2c)
 
-        # Load time mode configuration
-        self.is_12_hour = self.load_time_mode() == 0
+        # The AT24C32 on the same board keeps a history of fired alarms
+        self.eeprom = AT24C32(i2c)
+        try:
+            self.event_log = RecordLog(
+                self.eeprom, self.EVENT_LOG_START, self.EVENT_LOG_RECORDS
+            )
+        except Exception as e:
+            msg = "Error in rtc reading the EEPROM, event log disabled"
+            self.logger.error(e, msg)
+            self.event_log = None
 
-        # Load timezone from file
+        # Time mode and timezone come from the settings loaded at boot and are
+        # kept current by the subscription
+        self.is_12_hour = self.load_time_mode() == 0
         self.timezone = self.load_timezone()
+        self.tz = TimeZone(self.timezone)
+        settings.subscribe(self.on_setting_changed)
+
+        # Set by enable_square_wave_tick
+        self.sqw_clock = None
 
-        # Set the time (year, month, day, weekday, hour, minute, second)
+        # The chip keeps UTC; self.tz turns it into local time for display,
+        # alarms and the time menus
         current_time = self.rtc.datetime()
         self.logger.info(f"Loaded RTC. Time: {current_time}")
+        self.migrate_to_utc()
 
         # Create alarm sound instances
         self.alarm = SquareWaveGenerator(22, 888)  # GP22, 1 kHz frequency
 
+        # Set by the server to wake to the radio; the buzzer alone otherwise
+        self.alarm_action = None
+
         # Initialize alarm active flag
         self.alarm_active = None
         self.alarm_off()
 
         self.lock = False
 
+        # In-memory index of alarms and snoozes as lists of (id, time) tuples,
+        # read once here so the per-second report tick never touches flash.
+        # Mutations build a new list and swap it in, so the timer callback
+        # always sees a complete list even while the navigation thread edits.
+        self.alarms = []
+        self.snoozes = []
+        # Bumped on every index change so the scheduler knows to rebuild
+        self.alarm_version = 0
+        # Alarms live in the DS1307's battery-backed RAM
+        self.alarm_store = NvramAlarmStore(self.rtc)
+        self.load_alarm_index()
+
+        # Next-alarm scheduler polled from the report tick
+        self.scheduler = AlarmScheduler(self)
+
+        # Reused by fill_snapshot for every tick's read
+        self.datetime_fields = array.array("H", [0] * 8)
+
     def read_battery_voltage(self):
         adc_value = self.battery_pin.read_u16()  # Read ADC value (0-65535)
         voltage = (
@@ -93,51 +381,30 @@ class RealTimeClock:
 
     def alarm_on(self):
         self.alarm_active = True
-        self.alarm.start()
+        if self.alarm_action:
+            self.alarm_action.start()
+        else:
+            self.alarm.start()
 
     def alarm_off(self):
         self.alarm_active = False
-        self.alarm.stop()
+        if self.alarm_action:
+            self.alarm_action.stop()
+        else:
+            self.alarm.stop()
 
     def load_time_mode(self):
-        try:
-            if self.file_exists(self.CONFIG_FILE):
-                with open(self.CONFIG_FILE, "r") as file:
-                    mode = int(file.read().strip())
-                    self.logger.debug(
-                        f"Time mode {mode} loaded from {self.CONFIG_FILE}"
-                    )
-                    return mode
-            else:
-                # Create the file with default 24-hour mode
-                with open(self.CONFIG_FILE, "w") as file:
-                    file.write("1")
-                return 1
-
-        except Exception as e:
-            msg = "Error in rtc.load_time_mode loading time mode from file, setting to 24h mode"
-            self.logger.error(e, msg)
-            return 1  # Default to 24-hour mode if loading fails
+        return settings.get("time_mode")
 
     def load_timezone(self):
-        try:
-            if self.file_exists(self.TIMEZONE_FILE):
-                with open(self.TIMEZONE_FILE, "r") as file:
-                    timezone = file.read().strip()
-                    self.logger.debug(
-                        f"Timezone {timezone} loaded from {self.TIMEZONE_FILE}"
-                    )
-                    return timezone
-            else:
-                # Create the file with default timezone 'PST'
-                with open(self.TIMEZONE_FILE, "w") as file:
-                    file.write("PST")
-                return "PST"
+        return settings.get("timezone")
 
-        except Exception as e:
-            msg = "Error in rtc.load_timezone loading timezone from file, setting to default PST"
-            self.logger.error(e, msg)
-            return "PST"  # Default to PST if loading fails
+    def on_setting_changed(self, key, value):
+        if key == "time_mode":
+            self.is_12_hour = value == 0
+        elif key == "timezone":
+            self.timezone = value
+            self.tz = TimeZone(value)
 
     def find_alarm_by_time(self, alarm):
         """
@@ -156,24 +423,13 @@ class RealTimeClock:
                 return alarm_id
         return None
 
-    def delete_alarm(self, alarm_id):
+    def delete_alarm(self, alarm_id, snooze=False):
         """
-        Delete the alarm file corresponding to the given alarm ID.
+        Delete the alarm (or snooze) from the index and the alarm store.
         """
-        print("IN rtc.delete_alarm")
-        alarm_file = f"{self.ALARM_FILE_PREFIX}{alarm_id}{self.ALARM_FILE_SUFFIX}"
-        try:
-            if self.file_exists(alarm_file):
-                print("AFTER file_Exists")
-                uos.remove(alarm_file)
-                # recursion
-                # self.logger.info(f"Deleted alarm: {alarm_id}")
-
-        except Exception as e:
-            msg = f"Error in rtc.delete_alarm while deleting alarm {alarm_id}"
-            print(f"{msg}\n{e}")
-            # max recursion depth
-            # self.logger.error(e, msg)
+        prefix = self.SNOOZE_FILE_PREFIX if snooze else self.ALARM_FILE_PREFIX
+        self._remove_from_index(alarm_id, prefix)
+        self.alarm_store.remove(alarm_id)
 
     def save_alarm_timeNOTUSING(self, alarm_id, alarm_time, prefix):
         # max recursion
@@ -182,19 +438,23 @@ class RealTimeClock:
 
     def save_time_to_file(self, time_id, time_data, prefix):
         """
-        Save alarm time data to a file with the specified prefix.
+        Save alarm time data to the index and the alarm store. The prefix
+        selects alarm or snooze; the name is kept from the file-per-alarm days.
+        Returns False if the alarm table is full.
         """
-        filename = f"{prefix}{time_id}.txt"
-        try:
-            with open(filename, "w") as file:
-                file.write(f"{time_data['hour']:02d}\n")
-                file.write(f"{time_data['minute']:02d}\n")
-                file.write(f"{time_data['second']:02d}\n")
-            self.logger.debug(f"Time saved to {filename}: {time_data}")
-
-        except Exception as e:
-            msg = f"Error in save_time_to_file saving {filename}"
-            self.logger.error(e, msg)
+        time_data = {
+            "hour": time_data["hour"],
+            "minute": time_data["minute"],
+            "second": time_data["second"],
+        }
+        if not self.alarm_store.put(
+            time_id, time_data, snooze=prefix == self.SNOOZE_FILE_PREFIX
+        ):
+            self.logger.warning(f"No room to save {prefix}{time_id}")
+            return False
+        self._add_to_index(time_id, time_data, prefix)
+        self.logger.debug(f"Time saved for {prefix}{time_id}: {time_data}")
+        return True
 
     def new_alarmNOTUSING(self, alarm_time):
         """
@@ -208,15 +468,19 @@ class RealTimeClock:
     def new_snooze(self, snooze_minutes):
         """
         Create a new snooze with a unique ID and save the snooze time to a file.
+        Returns (snooze_id, snooze_time), or None if the alarm table is full.
         """
-        current_time = self.rtc.datetime()
-        snooze_time = {
-            "hour": (current_time[4] + (current_time[5] + snooze_minutes) // 60) % 24,
-            "minute": (current_time[5] + snooze_minutes) % 60,
-            "second": current_time[6],
-        }
+        _, _, _, _, hour, minute, second = self.local_datetime()
+        # Wraps past midnight; the scheduler fires it at its next occurrence
+        hour, minute, second = calendar_math.split_seconds_of_day(
+            calendar_math.seconds_of_day(hour, minute + snooze_minutes, second)
+        )
+        snooze_time = {"hour": hour, "minute": minute, "second": second}
         snooze_id = self.new_id()
-        self.save_time_to_file(snooze_id, snooze_time, prefix=self.SNOOZE_FILE_PREFIX)
+        if not self.save_time_to_file(
+            snooze_id, snooze_time, prefix=self.SNOOZE_FILE_PREFIX
+        ):
+            return None
         return snooze_id, snooze_time
 
     def new_id(self):
@@ -227,7 +491,16 @@ class RealTimeClock:
 
     def load_time(self, alarm_id, prefix):
         """
-        load alarm time data from file
+        Look up alarm time data in the index. Returns a copy the caller may edit.
+        """
+        for time_id, time_data in self._index(prefix):
+            if time_id == alarm_id:
+                return dict(time_data)
+        return None
+
+    def read_time_file(self, alarm_id, prefix):
+        """
+        Read an alarm text file written by older firmware, for the migration.
         """
         try:
             with open(f"{prefix}{alarm_id}.txt", "r") as file:
@@ -240,13 +513,13 @@ class RealTimeClock:
                     }
 
         except Exception as e:
-            msg = "Error in rtc.load_time reading {prefix}{alarm_id}.txt"
+            msg = f"Error in rtc.read_time_file reading {prefix}{alarm_id}.txt"
             self.logger.error(e, msg)
 
         return None
 
     def get_alarm_time(self, alarm_id):
-        return self.load_time(alarm_id, prefix=ALARM_FILE_PREFIX)
+        return self.load_time(alarm_id, prefix=self.ALARM_FILE_PREFIX)
 
     def get_all_alarm_times(self):
         alarms = self.get_alarm_times()
@@ -257,39 +530,167 @@ class RealTimeClock:
 
     def get_snooze_time(self):
         """
-        Scan for all snooze files and return a list of tuples (snooze_id, time).
-        Raises an error if more than one snooze file is found.
+        Return the indexed snoozes as a list of tuples (snooze_id, time).
+        Raises an error if more than one snooze is found.
         """
-        snooze_times = []
-        for filename in uos.listdir():
-            if filename.startswith(self.SNOOZE_FILE_PREFIX):
-                snooze_id = filename[
-                    len(self.SNOOZE_FILE_PREFIX) : -4
-                ]  # Remove prefix and .txt suffix
-                snooze_time = self.load_time(snooze_id, prefix=self.SNOOZE_FILE_PREFIX)
-                if snooze_time:
-                    snooze_times.append((snooze_id, snooze_time))
-
+        snooze_times = self.snoozes
         if len(snooze_times) > 1:
             raise Exception("More than one snooze file found")
-        return snooze_times if snooze_times else []
+        return snooze_times
 
     def get_alarm_times(self):
         """
-        Scan for all alarm files and return a list of tuples (alarm_id, time).
+        Return the indexed alarms as a list of tuples (alarm_id, time).
         """
-        alarm_times = []
-        for filename in uos.listdir():
-            if filename.startswith(self.ALARM_FILE_PREFIX) and filename.endswith(
-                self.ALARM_FILE_SUFFIX
-            ):
-                alarm_id = filename[
-                    len(self.ALARM_FILE_PREFIX) : -len(self.ALARM_FILE_SUFFIX)
-                ]
-                alarm_time = self.load_time(alarm_id, prefix=self.ALARM_FILE_PREFIX)
-                if alarm_time:
-                    alarm_times.append((alarm_id, alarm_time))
-        return alarm_times
+        return self.alarms
+
+    def load_alarm_index(self):
+        """
+        Load the alarm store once and build the in-memory index from it,
+        migrating any alarms.bin or alarm_*.txt/snooze_*.txt files left by
+        older firmware.
+        """
+        self.alarm_store.load()
+        self.migrate_alarm_file()
+        self.migrate_time_files()
+
+        alarms = []
+        snoozes = []
+        for time_id, time_data, snooze in self.alarm_store.entries():
+            (snoozes if snooze else alarms).append((time_id, time_data))
+
+        self.alarms = alarms
+        self.snoozes = snoozes
+        self.alarm_version += 1
+        self.logger.info(f"Loaded {len(alarms)} alarms, {len(snoozes)} snoozes")
+
+    def migrate_alarm_file(self):
+        """
+        Move the entries of the flash alarm table into the alarm store and
+        remove the file. If they don't all fit, keep using the file instead.
+        """
+        try:
+            uos.stat(self.ALARM_STORE_FILE)
+        except OSError:
+            return
+
+        file_store = FileAlarmStore(self.ALARM_STORE_FILE)
+        file_store.load()
+        entries = file_store.entries()
+        free = self.alarm_store.slots - len(self.alarm_store.slot_of)
+        if len(entries) > free:
+            self.logger.warning(
+                f"{len(entries)} alarms in {self.ALARM_STORE_FILE} don't fit in the RTC RAM, keeping the file"
+            )
+            self.alarm_store = file_store
+            return
+
+        try:
+            for time_id, time_data, snooze in entries:
+                self.alarm_store.put(time_id, time_data, snooze=snooze)
+            uos.remove(self.ALARM_STORE_FILE)
+            self.logger.info(f"Migrated {self.ALARM_STORE_FILE} to the RTC RAM")
+
+        except Exception as e:
+            msg = f"Error in rtc.migrate_alarm_file migrating {self.ALARM_STORE_FILE}"
+            self.logger.error(e, msg)
+
+    def migrate_time_files(self):
+        """
+        Move alarm and snooze text files into the alarm store. Each file is
+        removed only after its entry is stored, so an interrupted migration
+        simply resumes on the next boot.
+        """
+        try:
+            filenames = uos.listdir()
+        except Exception as e:
+            msg = "Error in rtc.migrate_time_files listing files"
+            self.logger.error(e, msg)
+            return
+
+        for filename in filenames:
+            if not filename.endswith(self.ALARM_FILE_SUFFIX):
+                continue
+            if filename.startswith(self.ALARM_FILE_PREFIX):
+                prefix = self.ALARM_FILE_PREFIX
+            elif filename.startswith(self.SNOOZE_FILE_PREFIX):
+                prefix = self.SNOOZE_FILE_PREFIX
+            else:
+                continue
+            time_id = filename[len(prefix) : -len(self.ALARM_FILE_SUFFIX)]
+            time_data = self.read_time_file(time_id, prefix)
+            try:
+                if not time_data:
+                    uos.remove(filename)
+                    self.logger.warning(f"Dropped unreadable {filename}")
+                    continue
+                if not self.alarm_store.put(
+                    time_id, time_data, snooze=prefix == self.SNOOZE_FILE_PREFIX
+                ):
+                    continue
+                uos.remove(filename)
+                self.logger.info(f"Migrated {filename} to the alarm store")
+
+            except Exception as e:
+                msg = f"Error in rtc.migrate_time_files migrating {filename}"
+                self.logger.error(e, msg)
+
+    def _index(self, prefix):
+        if prefix == self.SNOOZE_FILE_PREFIX:
+            return self.snoozes
+        return self.alarms
+
+    def _set_index(self, prefix, index):
+        if prefix == self.SNOOZE_FILE_PREFIX:
+            self.snoozes = index
+        else:
+            self.alarms = index
+        self.alarm_version += 1
+
+    def _add_to_index(self, time_id, time_data, prefix):
+        # Replace in place if the id exists so the display order is kept
+        index = [
+            (item_id, time_data if item_id == time_id else item_time)
+            for item_id, item_time in self._index(prefix)
+        ]
+        if not any(item_id == time_id for item_id, _ in index):
+            index.append((time_id, time_data))
+        self._set_index(prefix, index)
+
+    def _remove_from_index(self, time_id, prefix):
+        self._set_index(
+            prefix,
+            [item for item in self._index(prefix) if item[0] != time_id],
+        )
+
+    def log_event(self, kind, timestamp, text):
+        """
+        Append an event to the EEPROM log: one page write, no flash.
+        Args:
+            kind (int): EVENT_ALARM or EVENT_SNOOZE
+            timestamp (int): RTC timestamp in seconds
+            text (str): detail, cut to fit the record
+        """
+        if self.event_log is None:
+            return
+        try:
+            self.event_log.append(kind, struct.pack("<I", timestamp) + text.encode())
+
+        except Exception as e:
+            msg = "Error in rtc.log_event writing the EEPROM"
+            self.logger.error(e, msg)
+
+    def get_event_history(self, limit=10):
+        """
+        Read logged events newest first as (timestamp, kind, text) tuples.
+        """
+        if self.event_log is None:
+            return []
+        events = []
+        for sequence, kind, payload in self.event_log.records(limit):
+            timestamp = struct.unpack_from("<I", payload, 0)[0]
+            events.append((timestamp, kind, payload[4:].decode()))
+        return events
 
     def convert_to_12_hour(self, hour):
         # NOTE: save in time_mode config - consider changing
@@ -302,52 +703,128 @@ class RealTimeClock:
         else:
             return hour, "AM"
 
-    def convert_timezone(self, datetime_tuple, desired_tz):
+    def enable_square_wave_tick(self, pin_id, on_tick):
         """
-        Convert the given datetime to the desired timezone.
+        Run the 1 s tick from the DS1307 SQW output on pin_id instead of a
+        Timer. fill_snapshot then reads the software counter and only goes to
+        the chip on a resync.
         """
-        # NOTE: save in tz_config - consider changing
-        # Recursion error.. cant do this here
-        current_tz = self.load_timezone()
+        self.sqw_clock = SquareWaveClock(self, pin_id, on_tick)
+        return self.sqw_clock
 
-        if current_tz != desired_tz:
-            # Extract the current datetime components
-            year, month, day, weekday, hour, minute, second, *_ = datetime_tuple
+    def read_timestamp(self):
+        """
+        Read the chip time over I2C as UTC seconds since the epoch.
+        """
+        year, month, day, _, hour, minute, second, _ = self.rtc.datetime()
+        return calendar_math.to_timestamp(year, month, day, hour, minute, second)
 
-            # Calculate current timestamp in seconds
-            timestamp = utime.mktime(
-                (year, month, day, hour, minute, second, weekday, 0)
-            )
+    def write_timestamp(self, utc):
+        """
+        Write UTC seconds since the epoch to the chip, weekday included.
+        """
+        self.rtc.datetime(calendar_math.to_datetime(utc))
+        if self.sqw_clock:
+            self.sqw_clock.invalidate()
 
-            # Get timezone offsets in seconds
-            current_offset = self.tz_map.get(current_tz, 0) * 3600
-            desired_offset = self.tz_map.get(desired_tz, 0) * 3600
+    def migrate_to_utc(self):
+        """
+        Older firmware kept local time on the chip. Convert it to UTC once, in
+        the zone that was saved. The rtc_utc setting is moved to RTC_CONVERTING
+        and read back before the chip is touched, so a failed flag write or a
+        power cut can never shift the clock a second time.
+        """
+        state = settings.get("rtc_utc")
+        if state == self.RTC_UTC:
+            return
+        if state == self.RTC_CONVERTING:
+            # Power was lost right after the chip write: it already holds UTC
+            settings.set("rtc_utc", self.RTC_UTC)
+            self.logger.warning("RTC conversion to UTC was interrupted, assuming done")
+            return
+
+        settings.set("rtc_utc", self.RTC_CONVERTING)
+        if settings.stored("rtc_utc") != self.RTC_CONVERTING:
+            # Don't leave a half-written flag to be trusted on the next boot
+            settings.set("rtc_utc", self.RTC_LOCAL)
+            self.logger.warning("Can't save rtc_utc, RTC left on local time")
+            return
 
-            # Calculate the new timestamp
-            new_timestamp = timestamp - current_offset + desired_offset
+        try:
+            self.write_timestamp(self.tz.to_utc(self.read_timestamp()))
 
-            # Convert the new timestamp back to a datetime tuple
-            new_datetime_tuple = utime.localtime(new_timestamp)[:7]
+        except Exception as e:
+            # The chip was not rewritten; try again on the next boot
+            settings.set("rtc_utc", self.RTC_LOCAL)
+            msg = "Error in rtc.migrate_to_utc converting the RTC to UTC"
+            self.logger.error(e, msg)
+            return
 
-            return new_datetime_tuple, desired_tz
-        return datetime_tuple, current_tz
+        settings.set("rtc_utc", self.RTC_UTC)
+        self.logger.info(f"RTC converted from {self.timezone} to UTC")
 
-    def set_datetime(self, year, month, day, weekday, hour, minute, second):
+    def local_datetime(self):
+        """
+        Read the chip and return the local time as
+        (year, month, day, weekday, hour, minute, second).
+        """
+        return calendar_math.to_datetime(self.tz.to_local(self.read_timestamp()))
 
-        # Normalize the weekday to an integer
-        if isinstance(weekday, str):
-            weekday_lower = weekday.lower()
+    def set_time_field(self, field, value):
+        """
+        Set one local datetime field ("year", "month", "day", "hour", "minute"
+        or "second"). The new local time is converted to UTC and only the chip
+        registers that change are written, so the other fields keep running
+        and a second that ticked meanwhile isn't rolled back.
+        """
+        # Positions in the DS1307 datetime tuple
+        fields = {"year": 0, "month": 1, "day": 2, "hour": 4, "minute": 5, "second": 6}
+        setters = (
+            self.rtc.set_year,
+            self.rtc.set_month,
+            self.rtc.set_date,
+            self.rtc.set_weekday,
+            self.rtc.set_hours,
+            self.rtc.set_minutes,
+            self.rtc.set_seconds,
+        )
+        try:
+            utc = self.read_timestamp()
+            local = list(calendar_math.to_datetime(self.tz.to_local(utc)))
+            local[fields[field]] = value
+            year, month, day, _, hour, minute, second = local
+            # Keep the day inside the month, e.g. 31 March -> February
+            day = min(day, calendar_math.days_in_month(year, month))
+            new_utc = self.tz.to_utc(
+                calendar_math.to_timestamp(year, month, day, hour, minute, second)
+            )
 
-            # Default to 0 (Sunday) if not found
-            weekday_int = self.weekday_map.get(weekday_lower, 0)
-        else:
-            weekday_int = weekday
+            # The weekday follows from the date
+            old = calendar_math.to_datetime(utc)
+            new = calendar_math.to_datetime(new_utc)
+            for i, setter in enumerate(setters):
+                if new[i] != old[i]:
+                    setter(new[i])
+
+            if self.sqw_clock:
+                self.sqw_clock.invalidate()
+            self.logger.debug(f"RTC {field} set to {value}")
+
+        except Exception as e:
+            msg = f"Error in rtc.set_time_field setting {field} to {value}"
+            self.logger.error(e, msg)
 
+    def set_datetime(self, year, month, day, weekday, hour, minute, second):
+        """
+        Set the clock from a local date and time. The weekday is worked out
+        from the date; the argument is kept for older callers.
+        """
         try:
             print(
-                f"Setting RTC datetime to: {year}-{month}-{day} {hour}:{minute}:{second} Weekday: {weekday_int}"
+                f"Setting RTC datetime to: {year}-{month}-{day} {hour}:{minute}:{second} {self.timezone}"
             )
-            self.rtc.datetime((year, month, day, weekday_int, hour, minute, second))
+            local = calendar_math.to_timestamp(year, month, day, hour, minute, second)
+            self.write_timestamp(self.tz.to_utc(local))
             # self.logger.info(f"RTC datetime set to: {self.rtc.datetime()}")  # Confirm setting time
             print(f"RTC datetime set to: {self.rtc.datetime()}")
 
@@ -398,56 +875,97 @@ class RealTimeClock:
             msg = "Error in rtc.format_datetime"
             print(f"{msg}\n{e}")
 
+    def fill_snapshot(self, snapshot):
+        """
+        Fill a TickSnapshot in place with one I2C read (none in SQW mode) and no
+        file access. The chip's UTC time is made local by self.tz, normally a
+        compare and an add. The texts are only re-formatted when the second
+        changed. Sets snapshot.valid to False if the read fails.
+        """
+        try:
+            sqw_clock = self.sqw_clock
+            if sqw_clock and sqw_clock.timestamp is not None:
+                utc = sqw_clock.timestamp
+            else:
+                # Decoded in place into the preallocated field buffer
+                fields = self.datetime_fields
+                self.rtc.datetime_into(fields)
+                year, month, day, _, hour, minute, second, _ = fields
+
+                # Ensure month and day are set correctly if they are zero
+                if month == 0:
+                    month = 1
+                if day == 0:
+                    day = 1
+                utc = calendar_math.to_timestamp(year, month, day, hour, minute, second)
+
+        except Exception as e:
+            print(f"IGNORE - THIS RECOVERS ITSELF. Error fetching datetime: {e}")
+            snapshot.valid = False
+            return snapshot
+
+        # Local wall clock seconds; the alarms and the display work in these
+        tz = self.tz
+        timestamp = tz.to_local(utc)
+        timezone = tz.name
+
+        snapshot.valid = True
+        if timestamp == snapshot.timestamp and timezone == snapshot.timezone:
+            return snapshot
+
+        year, month, day, weekday, hour, minute, second = calendar_math.to_datetime(
+            timestamp
+        )
+
+        snapshot.timestamp = timestamp
+        snapshot.year = year
+        snapshot.month = month
+        snapshot.day = day
+        snapshot.weekday = weekday
+        snapshot.hour = hour
+        snapshot.minute = minute
+        snapshot.second = second
+        snapshot.timezone = timezone
+
+        if self.is_12_hour:
+            hour, am_pm = self.convert_to_12_hour(hour)
+            snapshot.time_text = "{:02d}:{:02d}:{:02d} {}".format(hour, minute, second, am_pm)
+        else:
+            snapshot.time_text = "{:02d}:{:02d}:{:02d}".format(hour, minute, second)
+        snapshot.date_text = "{:04d}-{:02d}-{:02d}".format(year, month, day)
+        return snapshot
+
     def get_formatted_datetime_from_module(self):
         """
-        Get the current datetime data via i2c. If an interrupt handling operation
+        Get the current datetime data via i2c, or from the SQW software clock
+        when that is enabled. If an interrupt handling operation
         takes a long time (menu transitions), then we might see an i2c
         timeout issue here as a result. Assume the interrupt handling has higher
         priority, ignore the error, and get the time on the next cycle.
         """
-        try:
-            current_tz = self.load_timezone()
-            datetime_raw = self.rtc.datetime()
-            # print(f"RAW: {datetime_raw}")
-            # return self.format_datetime(datetime_raw, current_tz)
-            year, month, day, weekday, hour, minute, second, *_ = (
-                datetime_raw  # Use * to handle additional values
-            )
-            # print(f"hour: {hour} minute: {minute} second: {second}")
-
-            # Ensure month and day are set correctly if they are zero
-            if month == 0:
-                month = 1
-            if day == 0:
-                day = 1
-
+        snapshot = self.fill_snapshot(TickSnapshot())
+        if snapshot.valid:
+            hour = snapshot.hour
             if self.is_12_hour:
-                hour, am_pm = self.convert_to_12_hour(hour)
-                time = "{:02d}:{:02d}:{:02d} {}".format(hour, minute, second, am_pm)
-            else:
-                time = "{:02d}:{:02d}:{:02d}".format(hour, minute, second)
-
-            date = "{:04d}-{:02d}-{:02d}".format(year, month, day)
-            weekday_str = self.reverse_weekday_map.get(weekday, "Invalid weekday")
+                hour, _ = self.convert_to_12_hour(hour)
 
             return {
-                "time": time,
-                "date": date,
-                "year": year,
-                "month": month,
-                "day": day,
-                "weekday": weekday_str,
+                "time": snapshot.time_text,
+                "date": snapshot.date_text,
+                "year": snapshot.year,
+                "month": snapshot.month,
+                "day": snapshot.day,
+                "weekday": self.reverse_weekday_map.get(snapshot.weekday, "Invalid weekday"),
                 "hour": hour,
-                "minute": minute,
-                "second": second,
-                "timezone": current_tz,  # self.timezone,
+                "minute": snapshot.minute,
+                "second": snapshot.second,
+                "timezone": snapshot.timezone,
+                # Local seconds since the epoch in 24 hour time
+                "timestamp": snapshot.timestamp,
+                "valid": True,
             }
-        except Exception as e:
-            # Print and retry
-            msg = f"IGNORE - THIS RECOVERS ITSELF. Error fetching datetime: {e}"
-            print(msg)
 
-        # If all retries fail, return null values
+        # If the read failed, return null values
         return {
             "time": "00:00:00",
             "date": "0000-00-00",
@@ -459,6 +977,9 @@ class RealTimeClock:
             "minute": 0,
             "second": 0,
             "timezone": "*",
+            "timestamp": 0,
+            # Placeholder values; never schedule alarms from them
+            "valid": False,
         }
 
     def file_exists(self, filepath):
@@ -468,22 +989,12 @@ class RealTimeClock:
 
         except OSError as e:
             msg = f"Error in rtc.file_exists while check path name: {filepath}"
-            self.logger.error(msg, e)
+            self.logger.error(e, msg)
             return False
 
     def delete_all_snooze_files(self):
-        files = uos.listdir()
-        for file in files:
-            if file.startswith(self.SNOOZE_FILE_PREFIX):
-                try:
-                    uos.remove(file)
-                    print(f"Deleted snooze file: {file}")
-                    # Recursion
-                    # self.logger.info(f"Deleted snooze file: {file}")
-
-                except Exception as e:
-                    msg = f"Error in rtc.delete_all_snooze_Files while deleting snooze file: {file}"
-                    self.logger.error(e, msg)
+        self._set_index(self.SNOOZE_FILE_PREFIX, [])
+        self.alarm_store.clear_snoozes()
 
     def sync_system_time(self):
         try:
@@ -558,7 +1069,6 @@ if __name__ == "__main__":
     print(f"Current system time AFTER sync: {current_time}")
     
     # Test timezone conversion
-    test_datetime = (2024, 7, 13, 5, 12, 0, 0)  # Example datetime
-    new_datetime, new_tz = rtc.convert_timezone(test_datetime, "CST")
-    print(f"Converted datetime: {new_datetime} to timezone: {new_tz}")
+    utc = rtc.read_timestamp()
+    print(f"UTC: {calendar_math.to_datetime(utc)}, local: {rtc.local_datetime()} {rtc.tz.name}")
     """
@@ -0,0 +1,50 @@
+from preset_config import PresetConfig
+
+
+class ScanConfig(PresetConfig):
+    """
+    Description: Runs a band scan, then lists the stations found like the
+    presets screen and saves them as the new presets. Pressing the encoder
+    while the scan is still running cancels it.
+    """
+
+    def load_stations(self):
+        # None until the scan has finished
+        return None
+
+    def start(self):
+        self.last_progress = None
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text("Scanning...", 0, 1)
+
+        self.radio_control.scan()
+
+    def poll_selection_change_and_update_display(self):
+        if self.stations is not None:
+            return super().poll_selection_change_and_update_display()
+
+        if self.radio_control.is_scanning():
+            # Show the channel the tuner is checking
+            progress = self.radio_control.scanner.progress
+            if progress != self.last_progress:
+                self.last_progress = progress
+                self.display.update_text("{:.1f} MHz".format(progress), 0, 2)
+            return
+
+        # Scan finished: keep the results and show them
+        self.radio_control.save_presets()
+        self.stations = super().load_stations()
+        self.encoder.max = max(len(self.stations), 1)
+        self.encoder.reset_counter()
+        self.last_count = self.encoder.get_counter()[0]
+        self.update_station_list(self.last_count)
+
+    def button_release(self):
+        if self.stations is None:
+            # Still scanning: stop and stay on the station from before
+            self.radio_control.set_frequency(self.radio_control.scanner.return_frequency)
+            self.build_context()
+            return
+        super().button_release()
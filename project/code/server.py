@@ -1,11 +1,12 @@
 # TODO: event loop pattern
+import micropython
 import utime
 import time  # need this strangely or we get strange conflict w/ utime when importing radio_control
 from machine import Timer
 from button import Button
 from menu import Menu
 from thread_manager import ThreadManager
-from rtc import RealTimeClock
+from rtc import RealTimeClock, TickSnapshot
 from menu_config import (
     start_main_menu,
     start_volume_config,
@@ -17,7 +18,9 @@ from display_config import create_navigation_display, create_report_display
 from context_queue import context_queue, auxiliary_queue
 from context import Context
 from radio_control import RadioControl
+from alarm_action import AlarmAction
 from logger import Logger
+from settings import settings
 
 # print(f"recursion limit: {sys.getrecursionlimit()}")
 # MicroPython's recursion depth is inherently limited by the available stack space of the microcontroller.
@@ -42,9 +45,21 @@ report_display = create_report_display()
 
 radio_control = RadioControl()
 
+# Alarms wake to the radio, with the RTC's buzzer as the fallback
+rtc.alarm_action = AlarmAction(radio_control, rtc.alarm)
+
 # Store time since boot to display boot messages
 boot_time = utime.time()
 
+# Drive the 1 s report tick from the DS1307 SQW output instead of a free-running
+# Timer. Needs SQW wired to SQW_TICK_PIN; the RTC is then read over I2C only on
+# a periodic resync instead of every tick.
+USE_SQW_TICK = False
+SQW_TICK_PIN = 21
+
+# Longest the navigation thread waits for a menu context before polling the encoder again
+NAVIGATION_POLL_MS = 20
+
 
 def get_menu_from_auxiliary(id, rtc):
     """
@@ -113,6 +128,8 @@ def load_menu(current_menu, context, rtc):
                     "set_volume",
                     "set_frequency",
                     "frequency_fractional",
+                    "scan_stations",
+                    "preset_stations",
                 ]:
                     new_menu = menu_map[next_ui_id](navigation_display, radio_control)
                 elif next_ui_id in [
@@ -158,16 +175,16 @@ def navigation_monitor(menu, auxiliary_queue, thread_manager, rtc):
             # Check if the encoder rotated
             menu.poll_selection_change_and_update_display()
 
-            # Dequeue the context for the next menu
-            if context_queue.size() > 0:
-                context = context_queue.dequeue()
+            # Wait briefly for the context of the next menu, sleeping rather
+            # than spinning when nothing is queued
+            context = context_queue.dequeue(timeout_ms=NAVIGATION_POLL_MS)
+            if context:
                 logger.debug(
                     f"runner,nav_mon,dequeue\n{context.router_context}\n{context.ui_context}\n{context_queue.size()}"
                 )
 
-                if context:
-                    # Load the next menu
-                    menu = load_menu(menu, context, rtc)
+                # Load the next menu
+                menu = load_menu(menu, context, rtc)
 
                 utime.sleep(0.1)
 
@@ -235,9 +252,19 @@ def display_radio_status():
         if not radio_control.muted:
             current_frequency = radio_control.get_frequency()
             current_volume = radio_control.get_volume()
-            radio_status_text = "{:.1f}MHz Vol: {}".format(
-                current_frequency, current_volume
-            )
+            status = radio_control.get_status()
+            if status.valid:
+                # e.g. "103.1 V2 ST R42": stereo or mono, and the RSSI
+                radio_status_text = "{:.1f} V{} {} R{}".format(
+                    current_frequency,
+                    current_volume,
+                    "ST" if status.stereo else "MO",
+                    status.rssi,
+                )
+            else:
+                radio_status_text = "{:.1f}MHz Vol: {}".format(
+                    current_frequency, current_volume
+                )
             report_display.update_text(radio_status_text, 0, 3)
 
         else:
@@ -248,24 +275,41 @@ def display_radio_status():
         logger.error(e, msg)
 
 
-def display_datetime_status():
+def display_rds_status():
     try:
-        rtc_data = rtc.get_formatted_datetime_from_module()
+        # Station name, then as much RadioText as fits
+        text = "" if radio_control.muted else radio_control.rds.text(report_display.max_columns)
+        if text:
+            report_display.update_text(text, 0, 0)
+        else:
+            report_display._clear_row(0)
+
+    except Exception as e:
+        msg = "Error in display_rds_status"
+        logger.error(e, msg)
+
+
+def on_rds_changed():
+    # Runs in the scheduled context after new text was decoded; the battery
+    # status owns row 0 during boot
+    if utime.time() - boot_time < 5:
+        return
+    with report_display:
+        display_rds_status()
 
-        if rtc_data:
-            date = rtc_data.get("date")
-            zone = rtc_data.get("timezone")
-            report_display.update_text(f"{date}-{zone}", 0, 1)
-            report_display.update_text(rtc_data.get("time"), 0, 2)
+
+def display_datetime_status(snapshot):
+    try:
+        report_display.update_text(f"{snapshot.date_text}-{snapshot.timezone}", 0, 1)
+        report_display.update_text(snapshot.time_text, 0, 2)
 
     except Exception as e:
         msg = "Error in display_time_status"
         logger.error(e, msg)
 
 
-def display_snooze_status(auxiliary_queue):
+def display_snooze_status():
     try:
-        rtc_data = rtc.get_formatted_datetime_from_module()
         snooze = rtc.get_snooze_time()
 
         if snooze:
@@ -273,18 +317,7 @@ def display_snooze_status(auxiliary_queue):
             snooze_text = "Snooze: {:02d}:{:02d}:{:02d}".format(
                 snooze_time["hour"], snooze_time["minute"], snooze_time["second"]
             )
-            report_display._clear_row(4)
             report_display.update_text(snooze_text, 0, 4)
-
-            # Check if the current time matches the snooze time
-            if (
-                rtc_data["hour"] == snooze_time["hour"]
-                and rtc_data["minute"] == snooze_time["minute"]
-                and rtc_data["second"] == snooze_time["second"]
-            ):
-                rtc.alarm_on()
-                auxiliary_queue.add_to_queue("alarm_disable")
-                rtc.delete_all_snooze_files()
             return True
         return False
 
@@ -293,9 +326,8 @@ def display_snooze_status(auxiliary_queue):
         logger.error(e, msg)
 
 
-def display_alarm_status(auxiliary_queue):
+def display_alarm_status():
     try:
-        rtc_data = rtc.get_formatted_datetime_from_module()
         alarm_times = rtc.get_all_alarm_times()
 
         alarm_row_position = 4
@@ -309,23 +341,6 @@ def display_alarm_status(auxiliary_queue):
                 # report_display._clear_row(alarm_row_position)
                 report_display.update_text(alarm_text, 0, alarm_row_position)
 
-                # Check if the current time matches the alarm time
-                if (
-                    rtc_data["hour"] == alarm_time["hour"]
-                    and rtc_data["minute"] == alarm_time["minute"]
-                    and rtc_data["second"] == alarm_time["second"]
-                ):
-                    rtc.alarm_on()
-
-                    # Enqueue the alarm disable config job
-                    logger.debug(f"alarm should go on!! {rtc.is_alarm_active()}")
-                    alarm_disable_context = Context(
-                        router_context={"next_ui_id": "alarm_disable"},
-                        ui_context={"header": "Disable Alarm"},
-                    )
-                    context_queue.add_to_queue(alarm_disable_context)
-                    auxiliary_queue.add_to_queue("alarm_disable")
-
                 alarm_row_position += 1
         else:
             report_display._clear_row(4)
@@ -335,38 +350,82 @@ def display_alarm_status(auxiliary_queue):
         logger.error(e, msg)
 
 
+def check_alarms(auxiliary_queue, snapshot):
+    """
+    Fire every alarm and snooze the scheduler reports due. Skipped on a failed
+    RTC read; the next good tick catches up on anything crossed meanwhile.
+    """
+    try:
+        if not snapshot.valid:
+            return
+
+        due = rtc.scheduler.poll(snapshot.timestamp)
+        if not due:
+            return
+
+        for prefix, time_id in due:
+            rtc.alarm_on()
+            if prefix == rtc.SNOOZE_FILE_PREFIX:
+                rtc.log_event(rtc.EVENT_SNOOZE, snapshot.timestamp, time_id)
+                auxiliary_queue.add_to_queue("alarm_disable")
+                rtc.delete_all_snooze_files()
+            else:
+                rtc.log_event(rtc.EVENT_ALARM, snapshot.timestamp, time_id)
+                # Enqueue the alarm disable config job
+                logger.debug(f"alarm should go on!! {rtc.is_alarm_active()}")
+                alarm_disable_context = Context(
+                    router_context={"next_ui_id": "alarm_disable"},
+                    ui_context={"header": "Disable Alarm"},
+                )
+                context_queue.add_to_queue(alarm_disable_context)
+                auxiliary_queue.add_to_queue("alarm_disable")
+
+    except Exception as e:
+        msg = "Error in check_alarms"
+        logger.error(e, msg)
+
+
 def boot_messages():
     display_battery_status()
 
 
+# Reused by every tick
+tick_snapshot = TickSnapshot()
+
+
 def timer_callback(timer, auxiliary_queue):
     try:
         current_time = utime.time()
 
-        # Display battery status for the first 5 seconds
-        if current_time - boot_time < 5:
-            boot_messages()
+        # Read the time once for everything below
+        rtc.fill_snapshot(tick_snapshot)
 
-        else:
-            report_display._clear_row(
-                0
-            )  # Clear the battery status display after 5 seconds
-            report_display._clear_row(
-                1
-            )  # Clear the battery status display after 5 seconds
+        # Fire due alarms first, even while the boot messages are showing
+        check_alarms(auxiliary_queue, tick_snapshot)
 
-            # Check if the radio is muted and display the current frequency
-            display_radio_status()
+        # All renderers draw into one frame, flushed once at the end of the tick
+        with report_display:
+            # Display battery status for the first 5 seconds
+            if current_time - boot_time < 5:
+                boot_messages()
 
-            # Get RTC data and update the display
-            display_datetime_status()
+            else:
+                # Row 0 shows RDS text once the battery status is gone
+                display_rds_status()
+                # Row 1 is overwritten by the date below
 
-            # Get the snooze time and display it if active
-            if display_snooze_status(auxiliary_queue):
-                return  # Return early if snooze is active
+                # Check if the radio is muted and display the current frequency
+                display_radio_status()
 
-            # Get all alarm times
-            display_alarm_status(auxiliary_queue)
+                # Get RTC data and update the display
+                display_datetime_status(tick_snapshot)
+
+                # Get the snooze time and display it if active
+                if display_snooze_status():
+                    return  # Return early if snooze is active
+
+                # Get all alarm times
+                display_alarm_status()
 
     except Exception as e:
         msg = "Error in timer_callback"
@@ -374,16 +433,38 @@ def timer_callback(timer, auxiliary_queue):
         # logger.error(e, msg)
 
 
+def refresh_report(_):
+    # Redraw now rather than on the next tick, re-formatting the time texts
+    tick_snapshot.timestamp = None
+    timer_callback(None, auxiliary_queue)
+
+
+def on_setting_changed(key, value):
+    # Called on the navigation thread; draw from the main context instead
+    micropython.schedule(refresh_report, None)
+
+
+settings.subscribe(on_setting_changed)
+radio_control.rds.on_change = on_rds_changed
+
+
 try:
-    # Initialize the Timer
-    timer = Timer()
-
-    # Set the timer to call the callback function every 1 second and pass in aux_queue
-    timer.init(
-        period=1000,
-        mode=Timer.PERIODIC,
-        callback=lambda t: timer_callback(t, auxiliary_queue),
-    )
+    if USE_SQW_TICK:
+        # Tick on every falling SQW edge; deinit on exit like the Timer
+        timer = rtc.enable_square_wave_tick(
+            SQW_TICK_PIN, lambda timestamp: timer_callback(None, auxiliary_queue)
+        )
+
+    else:
+        # Initialize the Timer
+        timer = Timer()
+
+        # Set the timer to call the callback function every 1 second and pass in aux_queue
+        timer.init(
+            period=1000,
+            mode=Timer.PERIODIC,
+            callback=lambda t: timer_callback(t, auxiliary_queue),
+        )
 
 except Exception as e:
     msg = "Error in main thread initializing timer_callback"
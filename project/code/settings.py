@@ -0,0 +1,114 @@
+from logger import Logger
+
+
+class Settings:
+    """
+    Description: User settings loaded from flash once at boot and served from
+    memory. set() writes the new value through to its file straight away and
+    then calls every subscriber, so dependents (the RTC formatting, the report
+    display) pick the change up without polling the files.
+    Each setting keeps its own one-line text file, as before.
+    """
+
+    # key: (file, type, default)
+    SPECS = {
+        "time_mode": ("time_mode_config.txt", int, 1),  # 0 = 12-hour, 1 = 24-hour
+        "timezone": ("timezone_config.txt", str, "PST"),
+        # 1 once the DS1307 holds UTC, 2 while it is being converted; older
+        # firmware kept local time on it
+        "rtc_utc": ("rtc_utc_config.txt", int, 0),
+        # Alarm wake-up: 1 = radio with a volume ramp, 0 = buzzer only
+        "alarm_radio": ("wake_radio_config.txt", int, 1),
+        # Preset to wake to, 0 = strongest; the last station if there is none
+        "alarm_preset": ("wake_preset_config.txt", int, 0),
+        "alarm_volume": ("wake_volume_config.txt", int, 8),  # 0-15
+        "alarm_ramp_s": ("wake_ramp_config.txt", int, 60),
+    }
+
+    def __init__(self):
+        self.logger = Logger(level=Logger.INFO)
+        self.values = {}
+        self.subscribers = []
+        self.load()
+
+    def load(self):
+        """
+        Description: Read every setting file, creating missing ones with the
+        default value.
+        """
+        for key, (filename, kind, default) in self.SPECS.items():
+            try:
+                with open(filename, "r") as file:
+                    self.values[key] = kind(file.read().strip())
+                    continue
+            except OSError:
+                # First boot, write the default below
+                pass
+            except Exception as e:
+                msg = f"Error in settings.load reading {filename}, using {default}"
+                self.logger.error(e, msg)
+
+            self.values[key] = default
+            self._write(key)
+
+    def get(self, key):
+        return self.values[key]
+
+    def stored(self, key):
+        """
+        Description: Read a setting back from its file, bypassing the cached
+        value, to confirm a write reached flash.
+        Returns:
+            The stored value, or None if the file can't be read.
+        """
+        filename, kind, _ = self.SPECS[key]
+        try:
+            with open(filename, "r") as file:
+                return kind(file.read().strip())
+        except Exception:
+            return None
+
+    def set(self, key, value):
+        """
+        Description: Change a setting, persist it and notify subscribers.
+        Setting the current value again does nothing.
+        """
+        value = self.SPECS[key][1](value)
+        if self.values.get(key) == value:
+            return
+        self.values[key] = value
+        self._write(key)
+        for callback in self.subscribers:
+            try:
+                callback(key, value)
+            except Exception as e:
+                msg = f"Error in settings subscriber for {key}"
+                self.logger.error(e, msg)
+
+    def subscribe(self, callback):
+        """
+        Description: Call callback(key, value) after every change.
+        """
+        self.subscribers.append(callback)
+
+    def _write(self, key):
+        filename = self.SPECS[key][0]
+        try:
+            with open(filename, "w") as file:
+                file.write(str(self.values[key]))
+
+        except Exception as e:
+            msg = f"Error in settings writing {filename}"
+            self.logger.error(e, msg)
+
+
+settings = Settings()
+
+
+if __name__ == "__main__":
+
+    settings.subscribe(lambda key, value: print(f"{key} changed to {value}"))
+    print(settings.get("timezone"), settings.get("time_mode"))
+    settings.set("time_mode", 0)
+    settings.set("time_mode", 0)
+    settings.set("time_mode", 1)
@@ -0,0 +1,125 @@
+"""
+Host-side simulation of the clock radio hardware.
+
+Installs drop-in replacements for `machine`, `framebuf`, `utime`, `uos`,
+`_thread` and `micropython` so the modules in project/code run unchanged under
+CPython, with the DS1307, its AT24C32, the FM tuner and both SSD1306 panels
+modelled on their buses.  Time is virtual: it only moves when the main thread
+sleeps, which makes timer-driven code deterministic and lets scripts inject
+button presses and encoder turns between ticks.
+
+    import sim
+    board = sim.install()
+    from display_config import create_report_display
+    ...
+    board.rotate(19, 18, 3)
+    print(board.devices["nav_panel"].render())
+
+See run_server.py to boot the full server.py stack and bench.py for timings.
+"""
+
+import os
+import sys
+import types
+
+from . import board as _board
+from .board import Board
+from .devices import AT24C32Device, DS1307Device, RDA5807Device, SSD1306Device
+
+CODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Raw ADC reading for ~3.0 V on the battery sense pin
+DEFAULT_BATTERY_U16 = 59577
+
+DEFAULT_STATIONS = {
+    889: (40, True),
+    931: (22, False),
+    985: (48, True),
+    1003: (35, True),
+    1031: (52, True),
+    1067: (18, False),
+}
+
+# {MHz * 10: (pi, station name, radiotext)}
+DEFAULT_RDS = {
+    1031: (0xC0DE, "CFUV", "Campus and community radio"),
+    985: (0xC1A5, "OCEAN", "Island hits all day"),
+}
+
+
+def _print_exception(e, file=None):
+    import traceback
+
+    if not isinstance(e, BaseException):
+        # Same failure as the firmware when handed something else
+        raise TypeError("can't convert {} to exception".format(type(e).__name__))
+    traceback.print_exception(type(e), e, e.__traceback__, file=file or sys.stdout)
+
+
+def _time_module(utime):
+    import time as host_time
+
+    module = types.ModuleType("time")
+    module.__dict__.update(host_time.__dict__)
+    for name in dir(utime):
+        if not name.startswith("_"):
+            setattr(module, name, getattr(utime, name))
+    return module
+
+
+def install(flash_dir=None, epoch=None, stations=None, rds=None):
+    """
+    Description: Create the simulated board, wire the default devices and
+    register the stand-in modules in sys.modules.
+    Args:
+        flash_dir (str): directory used as the Pico filesystem; the process
+            changes into it.  Defaults to the current directory.
+        epoch (int): wall clock seconds at simulated boot, also loaded into the
+            DS1307.  Defaults to the host time.
+        stations (dict): {MHz * 10: (rssi, stereo)} for the tuner model.
+        rds (dict): {MHz * 10: (pi, station name, radiotext)} for the tuner
+            model.
+    Returns:
+        Board: the simulated board; devices are in board.devices.
+    """
+    # Imported here so traceback and friends bind the real time module
+    import traceback  # noqa: F401
+
+    board = Board(epoch)
+    _board.current = board
+
+    board.devices = {
+        # SQW wired to GP21, server.SQW_TICK_PIN
+        "rtc": board.attach_i2c(0, DS1307Device(0x68, sqw_pin=21)),
+        "eeprom": board.attach_i2c(0, AT24C32Device(0x50)),
+        "radio": board.attach_i2c(
+            1,
+            RDA5807Device(
+                DEFAULT_STATIONS if stations is None else stations,
+                rds=DEFAULT_RDS if rds is None else rds,
+            ),
+            0x10,
+            0x11,
+        ),
+        "nav_panel": board.attach_spi(0, SSD1306Device(cs=5, dc=6)),
+        "report_panel": board.attach_spi(1, SSD1306Device(cs=13, dc=12)),
+    }
+    board.adc_values[28] = DEFAULT_BATTERY_U16
+
+    from . import framebuf, machine, micropython, thread, uos, utime
+
+    sys.modules["machine"] = machine
+    sys.modules["framebuf"] = framebuf
+    sys.modules["utime"] = utime
+    sys.modules["time"] = _time_module(utime)
+    sys.modules["uos"] = uos
+    sys.modules["_thread"] = thread
+    sys.modules["micropython"] = micropython
+    sys.print_exception = _print_exception
+
+    if CODE_DIR not in sys.path:
+        sys.path.insert(0, CODE_DIR)
+    if flash_dir:
+        os.chdir(flash_dir)
+
+    return board
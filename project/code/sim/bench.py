@@ -0,0 +1,169 @@
+"""
+Micro-benchmarks of the render, input, calendar, radio and alarm paths on the simulated board.
+
+    cd project/code
+    python -m sim.bench
+
+Host timings are only useful for comparing two versions of the code on the same
+machine; the bus figures (bytes and wire time at the configured baudrate) are
+what the device would actually see.
+"""
+
+import tempfile
+from time import perf_counter as _perf
+
+import sim
+
+
+def _bench(label, func, repeat):
+    start = _perf()
+    for i in range(repeat):
+        func(i)
+    elapsed = _perf() - start
+    print("{:<36} {:>10.1f} us/op".format(label, elapsed * 1e6 / repeat))
+
+
+def bench_render(board, repeat=200):
+    from display_config import create_report_display
+
+    display = create_report_display()
+    stats = board.stats
+
+    def spi_delta(func):
+        before = stats["spi_bytes"], stats["spi_wire_us"]
+        func()
+        return stats["spi_bytes"] - before[0], stats["spi_wire_us"] - before[1]
+
+    _bench(
+        "update_text (changing)",
+        lambda i: display.update_text("12:00:{:02d}".format(i % 60), 0, 2),
+        repeat,
+    )
+    _bench("update_text (unchanged)", lambda i: display.update_text("same", 0, 3), repeat)
+
+    def frame():
+        with display:
+            for row in range(display.max_rows):
+                display.update_text("row {}".format(row), 0, row)
+
+    sent, wire = spi_delta(display.clear)
+    sent, wire = spi_delta(frame)
+    print("{:<36} {:>10} bytes {:>8} us on the wire".format("full screen frame", sent, wire))
+    sent, wire = spi_delta(lambda: display.update_text("12:34:56", 0, 2))
+    print("{:<36} {:>10} bytes {:>8} us on the wire".format("one row", sent, wire))
+
+
+def bench_input(board, detents=200):
+    from encoder import RotaryEncoder
+
+    encoder = RotaryEncoder(pin_a=19, pin_b=18, pin_switch=20, led_pin=15, max=100000)
+    for edge_ms in (5, 1, 0):
+        encoder.reset_counter()
+        start = _perf()
+        board.rotate(19, 18, detents, edge_ms=edge_ms)
+        elapsed = _perf() - start
+        print(
+            "{:<36} {:>10.1f} us/edge, counted {} of {} detents".format(
+                "encoder, {} ms per edge".format(edge_ms),
+                elapsed * 1e6 / (detents * 4),
+                encoder.counter - encoder.min,
+                detents,
+            )
+        )
+
+
+def bench_rtc(board, repeat=500):
+    import array
+    import machine
+    from ds1307 import DS1307
+
+    ds1307 = DS1307(machine.I2C(0))
+    fields = array.array("H", [0] * 8)
+    _bench("DS1307.datetime", lambda i: ds1307.datetime(), repeat)
+    _bench("DS1307.datetime_into", lambda i: ds1307.datetime_into(fields), repeat)
+
+
+def bench_calendar(board, repeat=2000):
+    import utime
+    import calendar_math
+
+    # Check against mktime/localtime first, 1970-2099 in steps of ~7.3 days.
+    # The host counts from 1970, calendar_math from 2000 like the Pico.
+    unix_2000 = 946684800
+    for unix in range(0, 4102444800, 631139):
+        year, month, day, hour, minute, second, weekday, _ = utime.localtime(unix)
+        expected = (year, month, day, (weekday + 1) % 7, hour, minute, second)
+        timestamp = unix - unix_2000
+        assert calendar_math.to_datetime(timestamp) == expected, timestamp
+        assert calendar_math.to_timestamp(year, month, day, hour, minute, second) == timestamp
+
+    base = 1700000000
+    _bench("utime.localtime", lambda i: utime.localtime(base + i * 3607), repeat)
+    _bench("calendar_math.to_datetime", lambda i: calendar_math.to_datetime(base - unix_2000 + i * 3607), repeat)
+    _bench(
+        "utime.mktime",
+        lambda i: utime.mktime((2024, 1 + i % 12, 1 + i % 28, i % 24, 30, 0, 0, 0)),
+        repeat,
+    )
+    _bench(
+        "calendar_math.to_timestamp",
+        lambda i: calendar_math.to_timestamp(2024, 1 + i % 12, 1 + i % 28, i % 24, 30, 0),
+        repeat,
+    )
+
+
+def bench_radio(board, steps=60, step_ms=5):
+    import utime
+    from radio_control import RadioControl
+
+    tuner = board.devices["radio"]
+    control = RadioControl()
+    utime.sleep_ms(control.COALESCE_MS * 2)
+
+    # A fast spin of the volume knob: one change every step_ms
+    before = tuner.writes, tuner.bytes_written
+    for i in range(steps):
+        control.set_volume(i % 16)
+        utime.sleep_ms(step_ms)
+    utime.sleep_ms(control.COALESCE_MS * 2)
+    print(
+        "{:<36} {:>10} writes {:>8} bytes, volume {} (want {})".format(
+            "{} volume steps".format(steps),
+            tuner.writes - before[0],
+            tuner.bytes_written - before[1],
+            tuner.volume(),
+            (steps - 1) % 16,
+        )
+    )
+
+
+def bench_alarms(board, alarms=6, repeat=100):
+    from rtc import RealTimeClock
+
+    rtc = RealTimeClock()
+    for i in range(alarms):
+        rtc.save_time_to_file(
+            str(100000 + i), {"hour": 7, "minute": i, "second": 0}, "alarm_"
+        )
+    _bench("get_all_alarm_times, {} alarms".format(alarms), lambda i: rtc.get_all_alarm_times(), repeat)
+    _bench("get_formatted_datetime_from_module", lambda i: rtc.get_formatted_datetime_from_module(), repeat)
+
+
+def main():
+    board = sim.install(flash_dir=tempfile.mkdtemp(prefix="clockradio-bench-"))
+    print("--- render ---")
+    bench_render(board)
+    print("--- input ---")
+    bench_input(board)
+    print("--- rtc ---")
+    bench_rtc(board)
+    print("--- calendar ---")
+    bench_calendar(board)
+    print("--- radio ---")
+    bench_radio(board)
+    print("--- alarms ---")
+    bench_alarms(board)
+
+
+if __name__ == "__main__":
+    main()
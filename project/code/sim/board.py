@@ -0,0 +1,139 @@
+"""
+The simulated Pico: pin levels, bus wiring and scriptable inputs.
+
+machine.* objects are thin handles onto the single Board instance in `current`,
+so two Pin(19) objects see the same level and a device on I2C(0) is reachable
+from every I2C(0) handle, as on the real chip.
+"""
+
+from .clock import VirtualClock
+
+IRQ_FALLING = 4
+IRQ_RISING = 8
+
+# Board instance used by the machine stand-ins, set by sim.install()
+current = None
+
+
+class PinState:
+    def __init__(self, id):
+        self.id = id
+        self.value = 0
+        self.mode = None
+        self.pull = None
+        self.handler = None
+        self.trigger = 0
+        self.listeners = []
+
+
+class Board:
+    def __init__(self, epoch=None):
+        self.clock = VirtualClock(epoch)
+        self.pins = {}
+        self.i2c_devices = {}  # bus id -> {addr: device}
+        self.spi_devices = {}  # bus id -> [device]
+        self.adc_values = {}  # pin -> raw u16 reading
+        self.pwm = {}  # pin -> PWM handle
+        self.i2c_faults = {}  # bus id -> number of transactions to fail
+        self.stats = {
+            "i2c_transactions": 0,
+            "i2c_bytes": 0,
+            "spi_transactions": 0,
+            "spi_bytes": 0,
+            "spi_wire_us": 0,
+        }
+
+    # Pins
+    def pin(self, id):
+        state = self.pins.get(id)
+        if state is None:
+            state = PinState(id)
+            self.pins[id] = state
+        return state
+
+    def set_level(self, id, value):
+        """
+        Description: Change the level of a pin and fire its IRQ handler on a
+        matching edge.  Used by the test scripts to press buttons and turn the
+        encoder, and by devices driving their output pins.
+        """
+        state = self.pin(id)
+        value = 1 if value else 0
+        old = state.value
+        state.value = value
+        if old == value:
+            return
+        for listener in state.listeners:
+            listener(value)
+        edge = IRQ_RISING if value else IRQ_FALLING
+        if state.handler is not None and state.trigger & edge:
+            self.clock.run_irq(state.handler, _PinRef(id))
+
+    def level(self, id):
+        return self.pin(id).value
+
+    def press(self, id, hold_ms=50, settle_ms=50):
+        """
+        Press and release an active-low button wired to pin id.
+        """
+        self.set_level(id, 0)
+        self.clock.advance(hold_ms)
+        self.set_level(id, 1)
+        self.clock.advance(settle_ms)
+
+    def rotate(self, pin_a, pin_b, detents, edge_ms=1, settle_ms=20):
+        """
+        Description: Turn a quadrature encoder by a number of detents, positive is
+        clockwise (00 -> 01 -> 11 -> 10 -> 00 on A,B), with edge_ms between edges.
+        """
+        sequence = ((0, 1), (1, 1), (1, 0), (0, 0))
+        if detents < 0:
+            sequence = ((1, 0), (1, 1), (0, 1), (0, 0))
+        for _ in range(abs(detents)):
+            for a, b in sequence:
+                self.set_level(pin_a, a)
+                self.set_level(pin_b, b)
+                self.clock.advance(edge_ms)
+        self.clock.advance(settle_ms)
+
+    # Buses
+    def attach_i2c(self, bus, device, *addrs):
+        devices = self.i2c_devices.setdefault(bus, {})
+        for addr in addrs or (device.addr,):
+            devices[addr] = device
+        return device
+
+    def attach_spi(self, bus, device):
+        self.spi_devices.setdefault(bus, []).append(device)
+        return device
+
+    def fail_i2c(self, bus, count=1):
+        """
+        Make the next count transactions on the bus time out (OSError 110).
+        """
+        self.i2c_faults[bus] = self.i2c_faults.get(bus, 0) + count
+
+    def i2c_device(self, bus, addr):
+        remaining = self.i2c_faults.get(bus, 0)
+        if remaining:
+            self.i2c_faults[bus] = remaining - 1
+            raise OSError(110)
+        device = self.i2c_devices.get(bus, {}).get(addr)
+        if device is None:
+            raise OSError(5)
+        return device
+
+
+class _PinRef:
+    """
+    What an IRQ handler receives as its pin argument.
+    """
+
+    def __init__(self, id):
+        self.id = id
+
+    def value(self):
+        return current.level(self.id)
+
+    def __repr__(self):
+        return "Pin({})".format(self.id)
@@ -0,0 +1,123 @@
+"""
+Virtual clock shared by the simulated utime, machine.Timer and devices.
+
+Time only moves when the main thread sleeps (or advance() is called directly).
+Every advance walks the timer list in deadline order and runs due callbacks, so a
+1000 ms periodic Timer fires exactly once per simulated second no matter how fast
+the host is.  Other threads that sleep block until the main thread has advanced
+the clock past their wake-up time.
+"""
+
+import threading
+import time as _host_time
+
+
+class VirtualClock:
+    def __init__(self, epoch=None):
+        # Simulated wall clock (seconds since 1970) at now_us == 0
+        self.epoch = int(_host_time.time()) if epoch is None else int(epoch)
+        self.now_us = 0
+        self.timers = []
+        self.scheduled = []
+
+        # Held while an "interrupt" handler runs; machine.disable_irq takes it too
+        self.irq_lock = threading.RLock()
+        self.cond = threading.Condition()
+        self.dispatching = False
+        self.running = True
+
+        # Raise KeyboardInterrupt in the main thread once this many ms have passed
+        self.stop_at_ms = None
+
+        # Real seconds to yield per main thread sleep so other threads get the GIL
+        self.realtime_yield = 0
+
+    def ticks_ms(self):
+        return self.now_us // 1000
+
+    def ticks_us(self):
+        return self.now_us
+
+    def time(self):
+        return self.epoch + self.now_us // 1000000
+
+    def add_timer(self, timer):
+        if timer not in self.timers:
+            self.timers.append(timer)
+
+    def remove_timer(self, timer):
+        if timer in self.timers:
+            self.timers.remove(timer)
+
+    def schedule(self, func, arg):
+        self.scheduled.append((func, arg))
+        return True
+
+    def run_irq(self, func, arg):
+        """
+        Run func(arg) as if it were an interrupt handler.
+        """
+        with self.irq_lock:
+            func(arg)
+
+    def _next_timer(self, limit_us):
+        best = None
+        for timer in self.timers:
+            if timer.deadline_us <= limit_us and (
+                best is None or timer.deadline_us < best.deadline_us
+            ):
+                best = timer
+        return best
+
+    def _run_scheduled(self):
+        while self.scheduled:
+            func, arg = self.scheduled.pop(0)
+            self.run_irq(func, arg)
+
+    def advance(self, ms):
+        """
+        Description: Move the clock forward by ms, firing timers and scheduled
+        callbacks on the way.  Sleeps inside a callback (e.g. an I2C retry) only
+        move the clock; they don't dispatch nested callbacks.
+        """
+        target_us = self.now_us + int(ms * 1000)
+        if self.dispatching:
+            self.now_us = max(self.now_us, target_us)
+            return
+
+        self.dispatching = True
+        try:
+            self._run_scheduled()
+            while True:
+                timer = self._next_timer(target_us)
+                if timer is None:
+                    break
+                self.now_us = max(self.now_us, timer.deadline_us)
+                timer.expire()
+                self._run_scheduled()
+            self.now_us = max(self.now_us, target_us)
+        finally:
+            self.dispatching = False
+
+        with self.cond:
+            self.cond.notify_all()
+
+    def sleep_ms(self, ms):
+        if threading.current_thread() is threading.main_thread():
+            self.advance(ms)
+            _host_time.sleep(self.realtime_yield)
+            if self.stop_at_ms is not None and self.ticks_ms() >= self.stop_at_ms:
+                self.stop_at_ms = None
+                raise KeyboardInterrupt
+            return
+
+        # Worker threads wait for the main thread to move time along
+        wake_us = self.now_us + int(ms * 1000)
+        with self.cond:
+            while self.running and self.now_us < wake_us:
+                self.cond.wait(0.05)
+
+    def stop(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
@@ -0,0 +1,508 @@
+"""
+Scriptable models of the parts wired to the Pico: DS1307 RTC, AT24C32 EEPROM,
+RDA5807-style FM tuner and SSD1306 panels.  Each model keeps its registers in plain Python so a
+script can inspect or poke them, and counts the traffic it receives.
+"""
+
+import calendar as _calendar
+import time as _host_time
+
+from . import board as _board
+
+
+def _bcd(value):
+    return (value // 10) << 4 | (value % 10)
+
+
+def _dec(value):
+    return (value >> 4) * 10 + (value & 0x0F)
+
+
+class I2CDevice:
+    """
+    Register-pointer device: the first byte of a write sets the pointer, the rest
+    is written from there, reads continue from the pointer.
+    """
+
+    size = 256
+
+    def __init__(self, addr):
+        self.addr = addr
+        self.regs = bytearray(self.size)
+        self.pointer = 0
+        self.writes = 0
+        self.reads = 0
+
+    def i2c_write(self, addr, data):
+        self.writes += 1
+        if not data:
+            return
+        self.pointer = data[0] % self.size
+        for value in data[1:]:
+            self.write_reg(self.pointer, value)
+            self.pointer = (self.pointer + 1) % self.size
+
+    def i2c_read(self, addr, nbytes):
+        self.reads += 1
+        out = bytearray(nbytes)
+        for i in range(nbytes):
+            out[i] = self.read_reg(self.pointer)
+            self.pointer = (self.pointer + 1) % self.size
+        return out
+
+    def write_reg(self, reg, value):
+        self.regs[reg] = value
+
+    def read_reg(self, reg):
+        return self.regs[reg]
+
+
+class DS1307Device(I2CDevice):
+    """
+    DS1307 with a running clock.  Time registers are derived from the virtual
+    clock on read; writing any of them re-anchors the clock.  Registers 0x08-0x3F
+    are the 56 bytes of battery-backed RAM.  With sqw_pin set, enabling the 1 Hz
+    square wave in the control register drives that pin: falling on each seconds
+    rollover, rising half way through the second.  The weekday register counts
+    from Sunday = 1, as RealTimeClock writes it.
+    """
+
+    size = 64
+
+    def __init__(self, addr=0x68, epoch=None, sqw_pin=None):
+        super().__init__(addr)
+        clock = _board.current.clock
+        self.base = clock.time() if epoch is None else epoch
+        self.anchor_us = clock.now_us
+        self.weekday_reg = (_host_time.gmtime(self.base)[6] + 1) % 7 + 1
+        self.weekday_days = self.base // 86400
+        self.halted = False
+        self.sqw_pin = sqw_pin
+        self.deadline_us = 0
+        self.sqw_next_level = 0
+
+    def write_reg(self, reg, value):
+        super().write_reg(reg, value)
+        if reg == 7:
+            self._update_sqw()
+
+    def _update_sqw(self):
+        if self.sqw_pin is None:
+            return
+        board = _board.current
+        control = self.regs[7]
+        if control & 0x10 and not control & 0x03 and not self.halted:
+            self._next_sqw_edge()
+            board.clock.add_timer(self)
+        else:
+            board.clock.remove_timer(self)
+            board.set_level(self.sqw_pin, control & 0x80)
+
+    def _next_sqw_edge(self):
+        now_us = _board.current.clock.now_us
+        phase = (now_us - self.anchor_us) % 1000000
+        if phase < 500000:
+            self.deadline_us = now_us - phase + 500000
+            self.sqw_next_level = 1
+        else:
+            self.deadline_us = now_us - phase + 1000000
+            self.sqw_next_level = 0
+
+    def expire(self):
+        # Called by the virtual clock like a Timer at each SQW edge
+        _board.current.set_level(self.sqw_pin, self.sqw_next_level)
+        self._next_sqw_edge()
+
+    def now(self):
+        if self.halted:
+            return self.base
+        return self.base + (_board.current.clock.now_us - self.anchor_us) // 1000000
+
+    def _materialise(self):
+        now = self.now()
+        tm = _host_time.gmtime(now)
+        days = now // 86400
+        weekday = (self.weekday_reg - 1 + days - self.weekday_days) % 7 + 1
+        self.regs[0] = _bcd(tm[5]) | (0x80 if self.halted else 0)
+        self.regs[1] = _bcd(tm[4])
+        self.regs[2] = _bcd(tm[3])
+        self.regs[3] = weekday
+        self.regs[4] = _bcd(tm[2])
+        self.regs[5] = _bcd(tm[1])
+        self.regs[6] = _bcd(tm[0] % 100)
+
+    def i2c_write(self, addr, data):
+        if data and data[0] < 7:
+            self._materialise()
+        super().i2c_write(addr, data)
+        if data and data[0] < 7:
+            self._anchor()
+
+    def _anchor(self):
+        regs = self.regs
+        self.halted = bool(regs[0] & 0x80)
+        try:
+            self.base = _calendar.timegm(
+                (
+                    2000 + _dec(regs[6]),
+                    _dec(regs[5]),
+                    _dec(regs[4]),
+                    _dec(regs[2] & 0x3F),
+                    _dec(regs[1]),
+                    _dec(regs[0] & 0x7F),
+                    0,
+                    0,
+                    0,
+                )
+            )
+        except (ValueError, OverflowError):
+            pass
+        self.anchor_us = _board.current.clock.now_us
+        self.weekday_reg = regs[3]
+        self.weekday_days = self.base // 86400
+        self._update_sqw()
+
+    def i2c_read(self, addr, nbytes):
+        if self.pointer < 7:
+            self._materialise()
+        return super().i2c_read(addr, nbytes)
+
+    def datetime(self):
+        """
+        Host-side view of the chip time as a time.struct_time.
+        """
+        return _host_time.gmtime(self.now())
+
+
+class AT24C32Device:
+    """
+    AT24C32 EEPROM: two address bytes, burst writes wrap inside the 32-byte page,
+    and the chip NACKs everything (OSError) for write_cycle_us after each write.
+    Erased cells read 0xFF.
+    """
+
+    size = 4096
+    page_size = 32
+
+    def __init__(self, addr=0x50, write_cycle_us=5000):
+        self.addr = addr
+        self.mem = bytearray(b"\xff" * self.size)
+        self.pointer = 0
+        self.write_cycle_us = write_cycle_us
+        self.busy_until_us = 0
+        self.writes = 0
+        self.reads = 0
+        self.page_writes = [0] * (self.size // self.page_size)
+
+    def _check_ready(self):
+        if _board.current.clock.now_us < self.busy_until_us:
+            raise OSError(5)
+
+    def i2c_write(self, addr, data):
+        self._check_ready()
+        if len(data) < 2:
+            # Address-only probe (ACK polling) or a one-byte address
+            return
+        self.pointer = (data[0] << 8 | data[1]) % self.size
+        payload = data[2:]
+        if not payload:
+            return
+        self.writes += 1
+        page = self.pointer - self.pointer % self.page_size
+        for i, value in enumerate(payload):
+            self.mem[page + (self.pointer - page + i) % self.page_size] = value
+        self.page_writes[page // self.page_size] += 1
+        self.busy_until_us = _board.current.clock.now_us + self.write_cycle_us
+
+    def i2c_read(self, addr, nbytes):
+        self._check_ready()
+        self.reads += 1
+        out = bytearray(nbytes)
+        for i in range(nbytes):
+            out[i] = self.mem[self.pointer]
+            self.pointer = (self.pointer + 1) % self.size
+        return out
+
+
+class RDA5807Device:
+    """
+    RDA5807-style tuner.  Address 0x10 is the sequential interface (writes start at
+    register 02h, reads at 0Ah, both wrapping the 64-word register file) and 0x11
+    is random access (first byte selects the register).  Tuning sets READCHAN and
+    STC from the station table.  A seek (SEEK in 02h) steps through the band
+    taking seek_us_per_channel of virtual time per channel and stops on the next
+    station in the table with an RSSI of at least SEEKTH (05h); until then STC
+    reads 0 and READCHAN shows the channel being checked.
+
+    Stations in the rds table broadcast RDS while RDS_EN (02h) is set: one
+    group every group_us of virtual time, cycling through the 0A groups for the
+    station name and the 2A groups for the RadioText.  RDSR and RDSS (0Ah) are
+    set while a group is waiting in 0Ch-0Fh, and a sequential read that reaches
+    0Fh takes it.
+    """
+
+    # 87-108 MHz in 100 kHz steps
+    CHANNELS = 211
+
+    def __init__(self, stations=None, seek_us_per_channel=5000, rds=None, group_us=87600):
+        self.addr = 0x10
+        self.regs = [0] * 0x40
+        self.regs[0x00] = 0x5804  # chip id
+        self.pointer = 0
+        # {MHz * 10: (rssi 0-127, stereo)}
+        self.stations = stations if stations is not None else {}
+        self.writes = 0
+        self.reads = 0
+        self.bytes_written = 0
+        self.seek_us_per_channel = seek_us_per_channel
+        # (start_us, start channel, direction, steps, found, channel) while seeking
+        self.seek = None
+        self.seeks = 0
+        # {MHz * 10: (pi, station name, radiotext)}
+        self.rds = rds if rds is not None else {}
+        self.group_us = group_us
+        self.rds_groups = []
+        self.rds_index = 0
+        self.rds_since_us = None
+        self.rds_ready = False
+        self.rds_sent = 0
+
+    def i2c_write(self, addr, data):
+        self.writes += 1
+        self.bytes_written += len(data)
+        if addr == 0x11:
+            if not data:
+                return
+            reg = data[0] & 0x3F
+            data = data[1:]
+            self.pointer = reg
+        else:
+            reg = 0x02
+        for i in range(0, len(data) - 1, 2):
+            self.write_reg((reg + i // 2) & 0x3F, data[i] << 8 | data[i + 1])
+
+    def i2c_read(self, addr, nbytes):
+        self.reads += 1
+        if self.seek:
+            self._update_seek()
+        self._update_rds()
+        reg = self.pointer if addr == 0x11 else 0x0A
+        out = bytearray(nbytes)
+        for i in range(0, nbytes, 2):
+            word = self.regs[(reg + i // 2) & 0x3F]
+            out[i] = word >> 8
+            if i + 1 < nbytes:
+                out[i + 1] = word & 0xFF
+        if addr == 0x10 and nbytes >= 12 and self.rds_ready:
+            # Blocks read: RDSR drops until the next group
+            self.rds_ready = False
+            self.regs[0x0A] &= ~0x8000
+        return out
+
+    def write_reg(self, reg, word):
+        self.regs[reg] = word
+        if reg == 0x03 and word & 0x0010:
+            self.tune(word >> 6)
+            # The chip clears TUNE once the tune operation has started
+            self.regs[0x03] = word & ~0x0010
+        elif reg == 0x02 and word & 0x0100:
+            self._start_seek(word)
+
+    def _start_seek(self, word):
+        self.seeks += 1
+        up = bool(word & 0x0200)
+        wrap = not word & 0x0080
+        threshold = (self.regs[0x05] >> 8) & 0x0F
+        start = self.regs[0x0A] & 0x03FF
+        direction = 1 if up else -1
+        steps = 0
+        found = False
+        channel = start
+        while steps < self.CHANNELS:
+            channel += direction
+            steps += 1
+            if not 0 <= channel < self.CHANNELS:
+                if not wrap:
+                    channel -= direction
+                    break
+                channel %= self.CHANNELS
+            station = self.stations.get(self.channel_frequency(channel))
+            if station and station[0] >= threshold:
+                found = True
+                break
+        self.seek = (_board.current.clock.now_us, start, direction, steps, found, channel)
+        self.regs[0x0A] &= ~0x6000  # clear STC and SF
+
+    def _update_seek(self):
+        start_us, start, direction, steps, found, channel = self.seek
+        elapsed = (_board.current.clock.now_us - start_us) // self.seek_us_per_channel
+        if elapsed < steps:
+            checking = (start + direction * elapsed) % self.CHANNELS
+            self.regs[0x0A] = self.regs[0x0A] & ~0x03FF | checking
+            return
+        self.seek = None
+        self.regs[0x02] &= ~0x0100  # the chip clears SEEK when it stops
+        rssi, stereo = self.stations.get(self.channel_frequency(channel), (8, False))
+        self._set_status(channel, rssi, stereo, seek_fail=not found)
+
+    def _start_rds(self, channel):
+        self.rds_groups = []
+        self.rds_index = 0
+        self.rds_ready = False
+        self.rds_since_us = _board.current.clock.now_us
+        station = self.rds.get(self.channel_frequency(channel))
+        if not station:
+            return
+        pi, name, text = station
+        name = name.ljust(8)[:8].encode()
+        for segment in range(4):
+            block_b = 0x0000 | segment  # group 0A
+            self.rds_groups.append(
+                (pi, block_b, 0xE0CD, name[segment * 2] << 8 | name[segment * 2 + 1])
+            )
+        text = text[:64].encode()
+        if len(text) < 64:
+            text += b"\r"
+        text = text.ljust((len(text) + 3) // 4 * 4, b" ")
+        for segment in range(len(text) // 4):
+            chars = text[segment * 4 : segment * 4 + 4]
+            block_b = 0x2000 | segment  # group 2A, text flag A
+            self.rds_groups.append(
+                (pi, block_b, chars[0] << 8 | chars[1], chars[2] << 8 | chars[3])
+            )
+
+    def _update_rds(self):
+        if not self.rds_groups or not self.regs[0x02] & 0x0008 or self.seek:
+            self.regs[0x0A] &= ~0x9000
+            return
+        now = _board.current.clock.now_us
+        due = (now - self.rds_since_us) // self.group_us
+        if due <= 0:
+            return
+        self.rds_since_us += due * self.group_us
+        # Later groups overwrite any the host did not read in time
+        self.rds_index = (self.rds_index + due - 1) % len(self.rds_groups)
+        group = self.rds_groups[self.rds_index]
+        self.rds_index = (self.rds_index + 1) % len(self.rds_groups)
+        for i, word in enumerate(group):
+            self.regs[0x0C + i] = word
+        self.regs[0x0B] &= ~0x000F  # BLERA, BLERB: no errors
+        self.regs[0x0A] |= 0x9000  # RDSR, RDSS
+        self.rds_ready = True
+        self.rds_sent += 1
+
+    def channel_frequency(self, channel):
+        return 870 + channel
+
+    def tune(self, channel):
+        rssi, stereo = self.stations.get(self.channel_frequency(channel), (8, False))
+        self._set_status(channel, rssi, stereo, seek_fail=False)
+
+    def _set_status(self, channel, rssi, stereo, seek_fail):
+        status = 0x4000 | (channel & 0x03FF)  # STC
+        if seek_fail:
+            status |= 0x2000
+        if stereo:
+            status |= 0x0400
+        self.regs[0x0A] = status
+        self.regs[0x0B] = (rssi & 0x7F) << 9 | 0x0100  # RSSI, FM_TRUE
+        self._start_rds(channel)
+
+    # Host-side views
+    def frequency(self):
+        return (870 + (self.regs[0x0A] & 0x03FF)) / 10
+
+    def volume(self):
+        return self.regs[0x05] & 0x0F
+
+    def muted(self):
+        return not self.regs[0x02] & 0x4000
+
+
+_SSD1306_ARGS = {
+    0x20: 1,
+    0x21: 2,
+    0x22: 2,
+    0x81: 1,
+    0x8D: 1,
+    0xA8: 1,
+    0xAD: 1,
+    0xD3: 1,
+    0xD5: 1,
+    0xD9: 1,
+    0xDA: 1,
+    0xDB: 1,
+}
+
+
+class SSD1306Device:
+    """
+    SSD1306/SH1106 panel on an SPI bus.  Listens only while its CS pin is low and
+    uses the DC pin to split the stream into commands and GDDRAM data using page
+    addressing (0xB0 page, 0x0X/0x1X column), the mode the driver uses.
+    """
+
+    def __init__(self, cs, dc, width=128, height=64, columns=132, column_offset=2):
+        self.cs = cs
+        self.dc = dc
+        self.width = width
+        self.height = height
+        self.columns = columns
+        self.column_offset = column_offset
+        self.ram = bytearray(columns * (height // 8))
+        self.page = 0
+        self.column = 0
+        self.on = False
+        self.pending = 0
+        self.command_bytes = 0
+        self.data_bytes = 0
+
+    def spi_write(self, data):
+        b = _board.current
+        if b.level(self.cs):
+            return
+        if b.level(self.dc):
+            self.data_bytes += len(data)
+            for value in data:
+                if self.column < self.columns:
+                    self.ram[self.page * self.columns + self.column] = value
+                self.column += 1
+            return
+        for value in data:
+            self.command_bytes += 1
+            self._command(value)
+
+    def _command(self, value):
+        if self.pending:
+            self.pending -= 1
+            return
+        if value in _SSD1306_ARGS:
+            self.pending = _SSD1306_ARGS[value]
+        elif 0xB0 <= value <= 0xB7:
+            self.page = value & 0x07
+        elif value <= 0x0F:
+            self.column = (self.column & 0xF0) | value
+        elif value <= 0x1F:
+            self.column = (self.column & 0x0F) | (value & 0x0F) << 4
+        elif value == 0xAE:
+            self.on = False
+        elif value == 0xAF:
+            self.on = True
+
+    def pixel(self, x, y):
+        col = x + self.column_offset
+        return (self.ram[(y >> 3) * self.columns + col] >> (y & 7)) & 1
+
+    def render(self):
+        """
+        ASCII-art dump of the visible area, two pixel rows per text line.
+        """
+        lines = []
+        for y in range(0, self.height, 2):
+            line = []
+            for x in range(self.width):
+                top = self.pixel(x, y)
+                bottom = self.pixel(x, y + 1)
+                line.append(" '.:"[top | bottom << 1])
+            lines.append("".join(line).rstrip())
+        return "\n".join(lines)
@@ -0,0 +1,150 @@
+"""
+Pure-Python stand-in for MicroPython's `framebuf`, MONO_VLSB format only.
+
+The pixel layout matches the firmware byte for byte: one byte per column per
+8-pixel page, LSB at the top.  Text uses an 8x8 cell like the built-in font, but
+the glyph shapes are placeholders derived from the character code, so the bytes
+pushed to the panel (and therefore dirty areas and bus traffic) match the device
+while the rendered letters do not.
+"""
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+
+def _glyph(code):
+    if code <= 32 or code > 126:
+        return bytes(8)
+    seed = (code * 2654435761) & 0xFFFFFFFF
+    cols = bytearray(8)
+    for i in range(1, 6):
+        cols[i] = ((seed >> (i * 5)) & 0x7E) | 0x02
+    return bytes(cols)
+
+
+_FONT = [_glyph(code) for code in range(128)]
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format != MONO_VLSB:
+            raise ValueError("only MONO_VLSB is simulated")
+        self._buf = buffer
+        self._width = width
+        self._height = height
+        self._stride = stride or width
+
+    def _set(self, x, y, c):
+        index = (y >> 3) * self._stride + x
+        if c:
+            self._buf[index] |= 1 << (y & 7)
+        else:
+            self._buf[index] &= ~(1 << (y & 7)) & 0xFF
+
+    def _fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self._width)
+        y1 = min(y + h, self._height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        for page in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+            top = max(y0, page << 3) & 7
+            bottom = min(y1, (page + 1) << 3) - (page << 3)
+            mask = ((1 << bottom) - 1) & ~((1 << top) - 1) & 0xFF
+            row = page * self._stride
+            for col in range(row + x0, row + x1):
+                if c:
+                    self._buf[col] |= mask
+                else:
+                    self._buf[col] &= ~mask & 0xFF
+
+    def fill(self, c):
+        value = 0xFF if c else 0x00
+        size = ((self._height + 7) >> 3) * self._stride
+        self._buf[0:size] = bytes([value]) * size
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            return (self._buf[(y >> 3) * self._stride + x] >> (y & 7)) & 1
+        self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._fill_rect(x, y, w, h, c)
+
+    def hline(self, x, y, w, c):
+        self._fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self._fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self._fill_rect(x, y, w, h, c)
+            return
+        self._fill_rect(x, y, w, 1, c)
+        self._fill_rect(x, y + h - 1, w, 1, c)
+        self._fill_rect(x, y, 1, h, c)
+        self._fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x0, y0, x1, y1, c):
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            if 0 <= x0 < self._width and 0 <= y0 < self._height:
+                self._set(x0, y0, c)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def text(self, s, x, y, c=1):
+        for ch in s:
+            glyph = _FONT[ord(ch) & 0x7F]
+            for i in range(8):
+                col = x + i
+                if col < 0 or col >= self._width:
+                    continue
+                bits = glyph[i]
+                for j in range(8):
+                    if bits & (1 << j):
+                        row = y + j
+                        if 0 <= row < self._height:
+                            self._set(col, row, c)
+            x += 8
+
+    def scroll(self, xstep, ystep):
+        pixels = [
+            [self.pixel(x, y) for x in range(self._width)] for y in range(self._height)
+        ]
+        for y in range(self._height):
+            for x in range(self._width):
+                sx = x - xstep
+                sy = y - ystep
+                if 0 <= sx < self._width and 0 <= sy < self._height:
+                    self._set(x, y, pixels[sy][sx])
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        for sy in range(fbuf._height):
+            for sx in range(fbuf._width):
+                c = fbuf.pixel(sx, sy)
+                if c != key:
+                    dx = x + sx
+                    dy = y + sy
+                    if 0 <= dx < self._width and 0 <= dy < self._height:
+                        self._set(dx, dy, c)
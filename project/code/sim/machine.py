@@ -0,0 +1,278 @@
+"""
+Stand-in for MicroPython's `machine` module, backed by sim.board.current.
+Only the pieces used by project/code are provided.
+"""
+
+from . import board as _board
+
+
+def _b():
+    if _board.current is None:
+        raise RuntimeError("sim.install() has not been called")
+    return _board.current
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    ALT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = _board.IRQ_FALLING
+    IRQ_RISING = _board.IRQ_RISING
+
+    def __init__(self, id, mode=-1, pull=-1, value=None, **kwargs):
+        self.id = id
+        self._state = _b().pin(id)
+        self.init(mode, pull, value=value)
+
+    def init(self, mode=-1, pull=-1, value=None, **kwargs):
+        state = self._state
+        if mode != -1:
+            state.mode = mode
+        if pull != -1:
+            state.pull = pull
+            # An untouched input with a pull-up idles high
+            if pull == Pin.PULL_UP and state.mode == Pin.IN:
+                state.value = 1
+        if value is not None:
+            _b().set_level(self.id, value)
+
+    def value(self, x=None):
+        if x is None:
+            return self._state.value
+        _b().set_level(self.id, x)
+
+    def __call__(self, x=None):
+        return self.value(x)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(not self._state.value)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        self._state.handler = handler
+        self._state.trigger = trigger if handler else 0
+
+    def __repr__(self):
+        return "Pin({})".format(self.id)
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self.callback = None
+        self.mode = Timer.PERIODIC
+        self.period_us = 0
+        self.deadline_us = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, tick_hz=1000, callback=None):
+        clock = _b().clock
+        if freq > 0:
+            self.period_us = int(1000000 / freq)
+        else:
+            self.period_us = int(period * 1000000 / tick_hz)
+        self.mode = mode
+        self.callback = callback
+        self.deadline_us = clock.now_us + max(self.period_us, 1)
+        clock.add_timer(self)
+
+    def deinit(self):
+        _b().clock.remove_timer(self)
+
+    def expire(self):
+        clock = _b().clock
+        if self.mode == Timer.PERIODIC:
+            self.deadline_us += max(self.period_us, 1)
+        else:
+            clock.remove_timer(self)
+        if self.callback is not None:
+            clock.run_irq(self.callback, self)
+
+
+class I2C:
+    def __init__(self, id, scl=None, sda=None, freq=400000, timeout=50000):
+        self.id = id
+        self.freq = freq
+
+    def _device(self, addr):
+        return _b().i2c_device(self.id, addr)
+
+    def _count(self, nbytes):
+        stats = _b().stats
+        stats["i2c_transactions"] += 1
+        stats["i2c_bytes"] += nbytes
+
+    def scan(self):
+        return sorted(_b().i2c_devices.get(self.id, {}))
+
+    def writeto(self, addr, buf, stop=True):
+        self._device(addr).i2c_write(addr, bytes(buf))
+        self._count(len(buf) + 1)
+        # MicroPython returns the number of ACKs received
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(b) for b in vector)
+        return self.writeto(addr, data, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        data = self._device(addr).i2c_read(addr, nbytes)
+        self._count(nbytes + 1)
+        return bytes(data)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf), stop)
+
+    def _memaddr(self, memaddr, addrsize):
+        return memaddr.to_bytes(addrsize // 8, "big")
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        device = self._device(addr)
+        device.i2c_write(addr, self._memaddr(memaddr, addrsize) + bytes(buf))
+        self._count(len(buf) + 1 + addrsize // 8)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        device = self._device(addr)
+        device.i2c_write(addr, self._memaddr(memaddr, addrsize))
+        data = device.i2c_read(addr, nbytes)
+        self._count(nbytes + 2 + addrsize // 8)
+        return bytes(data)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf), addrsize)
+
+
+class SPI:
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id, baudrate=1000000, **kwargs):
+        self.id = id
+        self.baudrate = baudrate
+        self.init(baudrate=baudrate, **kwargs)
+
+    def init(self, baudrate=None, polarity=0, phase=0, bits=8, firstbit=MSB, **kwargs):
+        if baudrate:
+            self.baudrate = baudrate
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        data = bytes(buf)
+        stats = _b().stats
+        stats["spi_transactions"] += 1
+        stats["spi_bytes"] += len(data)
+        stats["spi_wire_us"] += len(data) * 8 * 1000000 // self.baudrate
+        for device in _b().spi_devices.get(self.id, []):
+            device.spi_write(data)
+
+    def read(self, nbytes, write=0x00):
+        return bytes(nbytes)
+
+    def readinto(self, buf, write=0x00):
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    def write_readinto(self, write_buf, read_buf):
+        self.write(write_buf)
+        self.readinto(read_buf)
+
+
+class ADC:
+    def __init__(self, pin):
+        self.pin = pin if isinstance(pin, int) else pin.id
+
+    def read_u16(self):
+        return _b().adc_values.get(self.pin, 0)
+
+
+class PWM:
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin if isinstance(pin, int) else pin.id
+        self._freq = 0
+        self._duty = 0
+        self.running = False
+        _b().pwm[self.pin] = self
+        if freq is not None or duty_u16 is not None:
+            self.init(freq=freq, duty_u16=duty_u16)
+
+    def init(self, freq=None, duty_u16=None, **kwargs):
+        if freq is not None:
+            self._freq = freq
+        if duty_u16 is not None:
+            self._duty = duty_u16
+        self.running = True
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+        self.running = True
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = value
+        self.running = True
+
+    def deinit(self):
+        self.running = False
+
+
+class RTC:
+    def __init__(self, id=0):
+        self.offset = 0
+
+    def datetime(self, datetimetuple=None):
+        import time as _t
+
+        clock = _b().clock
+        if datetimetuple is None:
+            tm = _t.gmtime(clock.time() + self.offset)
+            return (tm[0], tm[1], tm[2], tm[6], tm[3], tm[4], tm[5], 0)
+        year, month, day, weekday, hour, minute, second = datetimetuple[:7]
+        import calendar as _calendar
+
+        wanted = _calendar.timegm((year, month, day, hour, minute, second, 0, 0, 0))
+        self.offset = wanted - clock.time()
+
+
+def disable_irq():
+    _b().clock.irq_lock.acquire()
+    return 1
+
+
+def enable_irq(state=1):
+    _b().clock.irq_lock.release()
+
+
+def freq(hz=None):
+    return 125000000
+
+
+def unique_id():
+    return b"\xe6\x61\x38\x52\x83\x2f\x29\x2b"
+
+
+def idle():
+    _b().clock.sleep_ms(1)
+
+
+def reset():
+    raise SystemExit("machine.reset()")
@@ -0,0 +1,35 @@
+"""
+Stand-in for the `micropython` module.
+"""
+
+from . import board as _board
+
+
+def const(value):
+    return value
+
+
+def schedule(func, arg):
+    """
+    Run func(arg) at the next point the virtual clock advances, like a soft IRQ.
+    """
+    return _board.current.clock.schedule(func, arg)
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def mem_info(verbose=False):
+    pass
+
+
+def opt_level(level=None):
+    return 0
+
+
+def native(func):
+    return func
+
+
+viper = native
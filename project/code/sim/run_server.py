@@ -0,0 +1,59 @@
+"""
+Boot server.py under the simulator for a fixed amount of virtual time.
+
+    cd project/code
+    python -m sim.run_server --seconds 20 --show
+
+The filesystem lives in a scratch directory (or --flash DIR to keep alarms and
+settings between runs).  When the time is up the main loop gets a
+KeyboardInterrupt, exactly like pressing Ctrl-C on the REPL.
+"""
+
+import argparse
+import os
+import runpy
+import tempfile
+
+import sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10, help="virtual run time")
+    parser.add_argument("--flash", help="directory used as the Pico filesystem")
+    parser.add_argument("--show", action="store_true", help="dump both panels at exit")
+    parser.add_argument("--profile", help="write cProfile stats to this file")
+    args = parser.parse_args(argv)
+
+    flash = args.flash or tempfile.mkdtemp(prefix="clockradio-flash-")
+    board = sim.install(flash_dir=flash)
+    board.clock.stop_at_ms = int(args.seconds * 1000)
+
+    server = os.path.join(sim.CODE_DIR, "server.py")
+    if args.profile:
+        import cProfile
+
+        cProfile.runctx(
+            "runpy.run_path(server, run_name='__main__')",
+            globals(),
+            {"runpy": runpy, "server": server},
+            args.profile,
+        )
+    else:
+        runpy.run_path(server, run_name="__main__")
+    board.clock.stop()
+
+    print("")
+    print("virtual time: {} ms".format(board.clock.ticks_ms()))
+    for key, value in board.stats.items():
+        print("{}: {}".format(key, value))
+    if args.show:
+        for name in ("nav_panel", "report_panel"):
+            print("")
+            print("--- {} ---".format(name))
+            print(board.devices[name].render())
+    return board
+
+
+if __name__ == "__main__":
+    main()
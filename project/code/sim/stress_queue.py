@@ -0,0 +1,129 @@
+"""
+Stress ContextQueue from several producers at once on the simulated board.
+
+    cd project/code
+    python -m sim.stress_queue [--unlocked]
+
+Producers are worker threads (like the navigation thread on the second core), a
+periodic Timer (like the 1 Hz report tick) and a pin IRQ (like a button).  One
+consumer thread drains the queue with a blocking dequeue.  Every item must arrive
+exactly once and in order per producer.  --unlocked swaps in the bare ring
+buffer for comparison; the CPython GIL hides most of the races two real cores
+would hit, so a pass there says little about the device.
+"""
+
+import argparse
+import sys
+import tempfile
+
+import sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ContextQueue stress test")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--items", type=int, default=2000, help="per producer")
+    parser.add_argument("--unlocked", action="store_true")
+    args = parser.parse_args(argv)
+
+    board = sim.install(flash_dir=tempfile.mkdtemp(prefix="clockradio-stress-"))
+    # Switch threads as often as possible to provoke interleavings
+    sys.setswitchinterval(1e-6)
+
+    import _thread
+    import utime
+    from machine import Pin, Timer
+    from context_queue import ContextQueue
+    from queue import Queue
+
+    queue = ContextQueue(capacity=32, overflow=Queue.REJECT)
+    if args.unlocked:
+        ring = queue.queue
+        queue.add_to_queue = ring.put
+        queue._get = ring.get
+
+    producers = args.threads + 2  # threads, timer, pin IRQ
+    done = [0]
+    next_item = [0] * producers
+    received = [[] for _ in range(producers)]
+    lock = _thread.allocate_lock()
+
+    def put(producer):
+        n = next_item[producer]
+        if n < args.items and queue.add_to_queue((producer, n)):
+            next_item[producer] = n + 1
+        return next_item[producer] == args.items
+
+    def producer_thread(producer):
+        while not put(producer):
+            if queue.size() == queue.queue.capacity:
+                utime.sleep_ms(1)
+        with lock:
+            done[0] += 1
+
+    def consumer_thread():
+        total = producers * args.items
+        count = 0
+        while count < total:
+            item = queue.dequeue(timeout_ms=50)
+            if item is None:
+                if done[0] == producers and queue.is_empty():
+                    break
+                continue
+            received[item[0]].append(item[1])
+            count += 1
+        with lock:
+            done[0] += 1
+
+    timer_id = args.threads
+    pin_id = args.threads + 1
+
+    def timer_callback(timer):
+        for _ in range(4):
+            if put(timer_id):
+                timer.deinit()
+                with lock:
+                    done[0] += 1
+                return
+
+    def pin_irq(pin):
+        if put(pin_id):
+            Pin(0).irq(handler=None)
+            with lock:
+                done[0] += 1
+
+    for producer in range(args.threads):
+        _thread.start_new_thread(producer_thread, (producer,))
+    _thread.start_new_thread(consumer_thread, ())
+    Timer(-1).init(mode=Timer.PERIODIC, period=1, callback=timer_callback)
+    button = Pin(0, Pin.IN, Pin.PULL_UP)
+    button.irq(trigger=Pin.IRQ_FALLING, handler=pin_irq)
+
+    level = 1
+    for _ in range(200000):
+        if done[0] == producers + 1:
+            break
+        level ^= 1
+        board.set_level(0, level)
+        utime.sleep_ms(1)
+
+    ok = done[0] == producers + 1
+    for producer in range(producers):
+        items = received[producer]
+        if items != list(range(args.items)):
+            ok = False
+            print(
+                "producer {}: received {} items, {} out of order or duplicated".format(
+                    producer,
+                    len(items),
+                    sum(1 for i, n in enumerate(items) if n != i),
+                )
+            )
+    print("queue size at end: {}, reported size: {}".format(queue.queue.count, queue.size()))
+    print("PASS" if ok else "FAIL")
+    board.clock.stop()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
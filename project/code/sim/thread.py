@@ -0,0 +1,51 @@
+"""
+Stand-in for MicroPython's `_thread` on top of host threads.
+"""
+
+import threading as _threading
+
+
+class LockType:
+    def __init__(self):
+        self._lock = _threading.Lock()
+
+    def acquire(self, waitflag=1, timeout=-1):
+        if not waitflag:
+            return self._lock.acquire(False)
+        return self._lock.acquire(True, timeout)
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+
+def allocate_lock():
+    return LockType()
+
+
+def start_new_thread(function, args, kwargs=None):
+    thread = _threading.Thread(target=function, args=args, kwargs=kwargs or {})
+    thread.daemon = True
+    thread.start()
+    return thread.ident
+
+
+def get_ident():
+    return _threading.get_ident()
+
+
+def stack_size(size=0):
+    return 0
+
+
+def exit():
+    raise SystemExit
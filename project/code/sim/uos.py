@@ -0,0 +1,37 @@
+"""
+Stand-in for `uos`.  The simulated flash is the current working directory,
+which sim.install() points at a scratch directory.
+"""
+
+import os as _os
+
+listdir = _os.listdir
+remove = _os.remove
+rename = _os.replace
+mkdir = _os.mkdir
+rmdir = _os.rmdir
+getcwd = _os.getcwd
+chdir = _os.chdir
+sep = "/"
+
+
+def stat(path):
+    return tuple(_os.stat(path))
+
+
+def statvfs(path):
+    return (4096, 4096, 212, 200, 200, 0, 0, 0, 0, 255)
+
+
+def ilistdir(path="."):
+    for entry in _os.scandir(path):
+        kind = 0x4000 if entry.is_dir() else 0x8000
+        yield (entry.name, kind, 0)
+
+
+def uname():
+    return ("rp2", "rp2", "sim", "sim", "Raspberry Pi Pico (simulated)")
+
+
+def urandom(n):
+    return _os.urandom(n)
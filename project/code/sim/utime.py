@@ -0,0 +1,69 @@
+"""
+Stand-in for `utime` (and the MicroPython extensions of `time`) running on the
+virtual clock.  Calendar functions work in UTC like the Pico's RTC.
+"""
+
+import calendar as _calendar
+import time as _host_time
+
+from . import board as _board
+
+
+def _clock():
+    return _board.current.clock
+
+
+def sleep(seconds):
+    _clock().sleep_ms(seconds * 1000)
+
+
+def sleep_ms(ms):
+    _clock().sleep_ms(ms)
+
+
+def sleep_us(us):
+    _clock().sleep_ms(us / 1000)
+
+
+def ticks_ms():
+    return _clock().ticks_ms()
+
+
+def ticks_us():
+    return _clock().ticks_us()
+
+
+def ticks_cpu():
+    return _clock().ticks_us()
+
+
+def ticks_diff(ticks1, ticks2):
+    return ticks1 - ticks2
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta
+
+
+def time():
+    return _clock().time()
+
+
+def time_ns():
+    clock = _clock()
+    return clock.epoch * 1000000000 + clock.now_us * 1000
+
+
+def gmtime(secs=None):
+    if secs is None:
+        secs = time()
+    tm = _host_time.gmtime(secs)
+    return (tm[0], tm[1], tm[2], tm[3], tm[4], tm[5], tm[6], tm[7])
+
+
+localtime = gmtime
+
+
+def mktime(tuple):
+    year, month, mday, hour, minute, second = tuple[:6]
+    return _calendar.timegm((year, month, mday, hour, minute, second, 0, 0, 0))
@@ -35,6 +35,10 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        # Per-page dirty column window [lo, hi]; lo > hi means the page is clean
+        self.dirty_lo = bytearray(self.pages)
+        self.dirty_hi = bytearray(self.pages)
+        self.buffer_mv = memoryview(self.buffer)
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -94,12 +98,116 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
-    def show(self):
-        for Page in range(0, 8):
-            self.write_cmd(0xB0 | (Page & 0x0F))
-            self.write_cmd(0x02)
-            self.write_cmd(0x10)
-            self.write_data(self.buffer[Page << 7 : (Page << 7) + 128])
+    def mark_dirty(self, x, y, w, h):
+        """
+        Description: Record that the pixel area (x, y, w, h) changed since the
+        last flush.  Only the touched pages, and within each page only the
+        touched column window, are sent by show().
+        """
+        if w <= 0 or h <= 0:
+            return
+        x1 = x + w - 1
+        y1 = y + h - 1
+        if x1 < 0 or y1 < 0 or x >= self.width or y >= self.height:
+            return
+        if x < 0:
+            x = 0
+        if y < 0:
+            y = 0
+        if x1 >= self.width:
+            x1 = self.width - 1
+        if y1 >= self.height:
+            y1 = self.height - 1
+        for page in range(y >> 3, (y1 >> 3) + 1):
+            if x < self.dirty_lo[page]:
+                self.dirty_lo[page] = x
+            if x1 > self.dirty_hi[page]:
+                self.dirty_hi[page] = x1
+
+    def invalidate(self):
+        """
+        Mark the whole framebuffer dirty so the next show() resends every page.
+        Use after the panel has been reset or lost its RAM contents.
+        """
+        for page in range(self.pages):
+            self.dirty_lo[page] = 0
+            self.dirty_hi[page] = self.width - 1
+
+    def is_dirty(self):
+        for page in range(self.pages):
+            if self.dirty_lo[page] <= self.dirty_hi[page]:
+                return True
+        return False
+
+    # Drawing primitives are wrapped so that every change is tracked.
+    def fill(self, c):
+        super().fill(c)
+        self.invalidate()
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.mark_dirty(x, y, w, h)
+
+    def rect(self, x, y, w, h, c):
+        super().rect(x, y, w, h, c)
+        self.mark_dirty(x, y, w, h)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.mark_dirty(x, y, len(s) * 8, 8)
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.mark_dirty(x, y, 1, 1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.mark_dirty(x, y, w, 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.mark_dirty(x, y, 1, h)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.mark_dirty(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.invalidate()
+
+    def blit(self, fbuf, x, y, *args):
+        # Source size is unknown here, so be conservative
+        super().blit(fbuf, x, y, *args)
+        self.invalidate()
+
+    def show(self, full=False):
+        """
+        Description: Flush the framebuffer to the panel.  Only pages touched since
+        the last flush are sent, starting at the first dirty column and ending at
+        the last one.  The panel RAM is 132 columns wide with the visible area
+        starting at column 2, hence the column offset below.
+        Args:
+            full (bool): resend the entire framebuffer regardless of dirty state.
+        """
+        if full:
+            self.invalidate()
+        width = self.width
+        for page in range(self.pages):
+            lo = self.dirty_lo[page]
+            hi = self.dirty_hi[page]
+            if lo > hi:
+                continue
+            col = lo + 2
+            self.write_cmd(0xB0 | (page & 0x0F))
+            self.write_cmd(col & 0x0F)  # lower column start address
+            self.write_cmd(0x10 | (col >> 4))  # higher column start address
+            start = page * width
+            self.write_data(self.buffer_mv[start + lo : start + hi + 1])
+            self.dirty_lo[page] = 0xFF
+            self.dirty_hi[page] = 0
 
 
 class SSD1306_I2C(SSD1306):
@@ -116,16 +224,9 @@ class SSD1306_I2C(SSD1306):
         self.i2c.writeto(self.addr, self.temp)
 
     def write_data(self, buf):
-        Page = 0
-
-        for Page in range(0, 8):
-            self.i2c.writeto_mem(0x3C, 0x80, (0xB0 | (Page & 0x0F)).to_bytes(1, 0))
-            self.i2c.writeto_mem(0x3C, 0x80, b"\x02")
-            self.i2c.writeto_mem(0x3C, 0x80, b"\x10")
-            buf1 = buf[Page << 7 : (Page << 7) + 128]
-            self.write_list[1] = buf1
-
-            self.i2c.writevto(0x3C, self.write_list)
+        # Page and column addressing is done by show(); just stream the bytes
+        self.write_list[1] = buf
+        self.i2c.writevto(self.addr, self.write_list)
 
 
 class SSD1306_SPI(SSD1306):
@@ -0,0 +1,207 @@
+from machine import Timer
+import utime
+
+
+class StationScanner:
+    """
+    Description: Band scan and single station seeks on the tuner's hardware
+    seek. A periodic Timer drives the steps: start a seek, then poll the 4-byte
+    status read until the chip reports the seek complete. The navigation
+    thread and the report tick never wait on the radio, and every I2C access
+    runs in Timer context on one core like the other radio writes.
+    Args:
+        radio (Radio): tuner driver
+    """
+
+    POLL_MS = 20
+
+    # Longest a single tune or seek may take before the scan gives up
+    SEEK_TIMEOUT_MS = 3000
+
+    BAND_BOTTOM = 88.0
+    BAND_TOP = 108.0
+
+    # States
+    IDLE = 0
+    SCANNING = 1
+    SEEKING = 2
+
+    # Steps within a state
+    START = 0
+    TUNING = 1
+    WAITING = 2
+
+    def __init__(self, radio):
+        self.radio = radio
+        self.timer = Timer(-1)
+        self.state = self.IDLE
+        self.step = self.START
+        self.up = True
+        self.started_ms = 0
+        self.on_done = None
+
+        # Result of the last scan: (frequency, rssi, stereo), strongest first
+        self.stations = []
+        self.found = []
+
+        # Where the previous seek of a scan stopped
+        self.last_stop = None
+
+        # Frequency being checked, for progress displays
+        self.progress = None
+        self.return_frequency = None
+
+    def is_busy(self):
+        return self.state != self.IDLE
+
+    def scan(self, on_done=None):
+        """
+        Description: Scan 88-108 MHz. Finishes with self.stations sorted by
+        signal strength and the radio back on the frequency it was on.
+        Args:
+            on_done (function): called with the station list, in Timer context
+        """
+        self._begin(self.SCANNING, True, on_done)
+
+    def seek(self, up=True, on_done=None):
+        """
+        Description: Seek to the next station up or down the band and stay
+        there.
+        Args:
+            on_done (function): called with the new frequency, or None if no
+            station was found, in Timer context
+        """
+        self._begin(self.SEEKING, up, on_done)
+
+    def cancel(self):
+        """
+        Description: Stop without retuning. The chip may be on any channel, so
+        the next radio write sends every register again.
+        """
+        if self.state == self.IDLE:
+            return
+        self.timer.deinit()
+        self.state = self.IDLE
+        self.radio.ShadowValid = False
+
+    def _begin(self, state, up, on_done):
+        self.cancel()
+        self.up = up
+        self.on_done = on_done
+        self.found = []
+        self.last_stop = None
+        self.progress = self.radio.Frequency
+        self.return_frequency = self.radio.Frequency
+        self.step = self.START
+        self.state = state
+        # The first step runs from the timer too, so the radio's I2C bus is
+        # only used from Timer context
+        self.timer.init(mode=Timer.PERIODIC, period=self.POLL_MS, callback=self.poll)
+
+    def _start_seek(self):
+        self.radio.Seek(Up=self.up, Wrap=True)
+        self.step = self.WAITING
+        self.started_ms = utime.ticks_ms()
+
+    def poll(self, timer=None):
+        try:
+            self._poll()
+
+        except Exception as e:
+            print(f"Error in station_scanner.poll: {e}")
+            self._finish(None)
+
+    def _poll(self):
+        if self.step == self.START:
+            if self.state == self.SCANNING:
+                # Start from the top so the first seek wraps to the bottom
+                # and the scan climbs the band from there
+                self.radio.SetFrequency(self.BAND_TOP)
+                self.radio.ProgramRadio()
+                self.step = self.TUNING
+                self.started_ms = utime.ticks_ms()
+            else:
+                self._start_seek()
+            return
+
+        status = self.radio.GetStatus()
+        if not status.valid or not status.tuned:
+            if status.valid:
+                self.progress = status.frequency
+            if utime.ticks_diff(utime.ticks_ms(), self.started_ms) > self.SEEK_TIMEOUT_MS:
+                print("Station seek timed out")
+                self._finish(None)
+            return
+
+        if self.step == self.TUNING:
+            self._start_seek()
+            return
+
+        # Seek complete
+        frequency = round(status.frequency, 1)
+        self.progress = frequency
+        if self.state == self.SEEKING:
+            if status.seek_failed or frequency < self.BAND_BOTTOM:
+                self._finish(None)
+            else:
+                self._finish(frequency)
+            return
+
+        # Scanning: stop at the band edge, on a failed seek, or once the
+        # seek wrapped around past the previous stop
+        if status.seek_failed or (
+            self.last_stop is not None and frequency <= self.last_stop
+        ):
+            self._finish(frequency)
+            return
+        self.last_stop = frequency
+        if frequency >= self.BAND_BOTTOM:
+            self.found.append((frequency, status.rssi, status.stereo))
+        if frequency >= self.BAND_TOP:
+            self._finish(frequency)
+        else:
+            self._start_seek()
+
+    def _finish(self, frequency):
+        self.timer.deinit()
+        state = self.state
+        self.state = self.IDLE
+        on_done = self.on_done
+        self.on_done = None
+
+        if frequency is None:
+            # Timed out or failed: the chip channel is unknown
+            self.radio.ShadowValid = False
+        else:
+            self.radio.AdoptFrequency(frequency)
+
+        if state == self.SCANNING:
+            self.stations = sorted(self.found, key=lambda station: -station[1])
+            # Back to where the scan started
+            self.radio.SetFrequency(self.return_frequency)
+            try:
+                self.radio.ProgramRadio()
+            except OSError as e:
+                print(f"Error in station_scanner retuning after the scan: {e}")
+            result = self.stations
+        else:
+            if frequency is None:
+                self.radio.SetFrequency(self.return_frequency)
+                try:
+                    self.radio.ProgramRadio()
+                except OSError as e:
+                    print(f"Error in station_scanner retuning after the seek: {e}")
+            result = frequency
+
+        if on_done:
+            on_done(result)
+
+
+if __name__ == "__main__":
+    from fm_radio import Radio
+
+    radio = Radio(98.5, 2, False, 26, 27)
+    scanner = StationScanner(radio)
+    scanner.scan(lambda stations: print(stations))
+    while scanner.is_busy():
+        utime.sleep_ms(100)
@@ -62,9 +62,10 @@ class TimeConfig(UI):
         """
         Update the display on encoder changes
         """
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        self.display.update_text(str(self.current_value), 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text(str(self.current_value), 0, 1)
 
     def poll_selection_change_and_update_display(self):
         """
@@ -129,52 +130,8 @@ class TimeConfig(UI):
         Description: Sets the time. Writes the time metric stored in current_value to
         the RTC module.
         """
-        try:
-            # TODO: USE get_formatted
-            print(f"header: {self.header}")
-            current_datetime = self.rtc.get_formatted_datetime_from_module()
-            current_datetime = self.rtc.rtc.datetime()
-            print(f"Before: current_datetime: {current_datetime}")
-            # current_datetime = self.rtc.rtc.datetime()
-
-            # new_hour = int(current_datetime["hour"])
-            # new_minute = int(current_datetime["minute"])
-            # new_second = int(current_datetime["second"])
-            # new_weekday = self.rtc.weekday_map[current_datetime["weekday"].lower()]
-            new_hour = current_datetime[4]
-            new_minute = current_datetime[5]
-            new_second = current_datetime[6]
-            new_weekday = current_datetime[3]
-            new_year = current_datetime[0]
-            new_month = current_datetime[1]
-            new_day = current_datetime[2]
-
-            # Determine which metric to update depending on the header
-            if self.header == "hour":
-                new_hour = int(self.current_value)
-            elif self.header == "minute":
-                new_minute = int(self.current_value)
-            elif self.header == "second":
-                new_second = int(self.current_value)
-
-            # Update the RTC module
-            self.rtc.set_datetime(
-                new_year,
-                new_month,
-                new_day,
-                new_weekday,
-                new_hour,
-                new_minute,
-                new_second,
-            )
-
-            current_datetime = self.rtc.get_formatted_datetime_from_module()
-            print(f"after formatted: {current_datetime}")
-
-        except Exception as e:
-            print(
-                f"TimeConfig.write_time_to_rtc Failed setting the date and time directly.\n{e}"
-            )
+        # Write only the register for the field being edited
+        self.rtc.set_time_field(self.header, int(self.current_value))
 
         # Reset the encoder counter after writing the time
         self.encoder.reset_counter()
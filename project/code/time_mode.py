@@ -1,15 +1,13 @@
-import uos
 from machine import Pin, Timer
 from display import CR_SPI_Display
 from encoder import RotaryEncoder
 from ui import UI
 from context_queue import context_queue
 from context import Context
+from settings import settings
 
 
 class TimeMode(UI):
-    CONFIG_FILE = "time_mode_config.txt"
-
     def __init__(self, display, rtc, encoder_pins, led_pin, header):
         self.display = display
         self.rtc = rtc
@@ -47,10 +45,11 @@ class TimeMode(UI):
         return context if context else {}
 
     def update_display(self):
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        mode_text = "12-hour" if self.current_mode == 0 else "24-hour"
-        self.display.update_text(mode_text, 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            mode_text = "12-hour" if self.current_mode == 0 else "24-hour"
+            self.display.update_text(mode_text, 0, 1)
 
     def poll_selection_change_and_update_display(self):
         new_mode, direction = self.encoder.get_counter()
@@ -98,30 +97,9 @@ class TimeMode(UI):
 
     def set_time_mode(self):
         print(f"Setting time mode to selected: {self.current_mode}")
-        # Sets the rtc instance directly here.  Maybe rethink this in std queue op
-        self.rtc.is_12_hour = self.current_mode == 0
-        self.save_time_mode()
+        # Persists the mode and updates the RTC formatting through its subscription
+        settings.set("time_mode", self.current_mode)
         print(f"Time mode set to: {'12-hour' if self.rtc.is_12_hour else '24-hour'}")
 
-    def save_time_mode(self):
-        with open(self.CONFIG_FILE, "w") as file:
-            file.write(str(self.current_mode))
-        print(f"Time mode {self.current_mode} saved to {self.CONFIG_FILE}")
-
     def load_time_mode(self):
-        try:
-            if self.file_exists(self.CONFIG_FILE):
-                with open(self.CONFIG_FILE, "r") as file:
-                    mode = int(file.read().strip())
-                    print(f"Time mode {mode} loaded from {self.CONFIG_FILE}")
-                    return mode
-        except Exception as e:
-            print(f"Failed to load time mode. Defaulting to 24-hour mode. Error: {e}")
-        return 1  # Default to 24-hour mode if loading fails
-
-    def file_exists(self, filepath):
-        try:
-            uos.stat(filepath)
-            return True
-        except OSError:
-            return False
+        return settings.get("time_mode")
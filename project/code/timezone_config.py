@@ -1,4 +1,3 @@
-import uos
 from machine import Pin
 from display import CR_SPI_Display
 from encoder import RotaryEncoder
@@ -9,11 +8,12 @@ import time
 import sys
 from context_queue import context_queue
 from context import Context
+from settings import settings
+from timezones import MENU_ZONES
 
 
 class TimeZoneConfig(UI):
-    CONFIG_FILE = "timezone_config.txt"
-    TIMEZONES = ["UTC", "CST", "CDT", "PST"]
+    TIMEZONES = MENU_ZONES
 
     def __init__(
         self,
@@ -57,12 +57,13 @@ class TimeZoneConfig(UI):
             print("ENCODER NOT CREATED FOR MENU")
             raise
 
-        # Display header on row 0
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
+        # Display header on row 0, drawn with the selectables as one frame
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
 
-        self.last_count = self._get_cursor_position_modulus()
-        self._update_count_and_display(self.last_count)
+            self.last_count = self._get_cursor_position_modulus()
+            self._update_count_and_display(self.last_count)
 
     def load_context(self):
         """
@@ -105,11 +106,12 @@ class TimeZoneConfig(UI):
                 "display_text"
             ] = f"{self.cursor_icon} {self.selectables[index]['display_text']}"
 
-        # Update the display
-        self.display.update_text(self.header, 0, 0)
-        col = 0
-        for i, selectable in enumerate(self.selectables):
-            self.display.update_text(selectable["display_text"], col, i + 1)
+        # Update the display, flushing the header and all rows once
+        with self.display:
+            self.display.update_text(self.header, 0, 0)
+            col = 0
+            for i, selectable in enumerate(self.selectables):
+                self.display.update_text(selectable["display_text"], col, i + 1)
 
         # Restore the original texts
         for i, selectable in enumerate(self.selectables):
@@ -165,31 +167,14 @@ class TimeZoneConfig(UI):
         print(f"CURRENT ZONE: {current_zone}\nSelected zone: {selected_zone}")
         if selected_zone == current_zone:
             return
-        try:
-            current_time = self.rtc.rtc.datetime()
-            new_time, _ = self.rtc.convert_timezone(current_time, selected_zone)
-            print(f"current time: {current_time}, new_time: {new_time}")
-            self.rtc.set_datetime(*new_time[:7])
-            self.save_timezone(selected_zone)
-            self.current_zone = selected_zone
-
-        except Exception as e:
-            print(f"Failed to set timezone. Error: {e}")
+        # The RTC keeps UTC, so only the zone changes; the clock is not rewritten
+        self.save_timezone(selected_zone)
+        self.current_zone = selected_zone
 
     def save_timezone(self, timezone):
-        try:
-            with open(self.CONFIG_FILE, "w") as file:
-                file.write(timezone)
-            print(f"Timezone {timezone} saved to {self.CONFIG_FILE}")
-        except Exception as e:
-            print(f"Failed to save timezone. Error: {e}")
-
-    def file_exists(self, filepath):
-        try:
-            uos.stat(filepath)
-            return True
-        except OSError:
-            return False
+        # Persists the zone and updates the RTC and report display subscribers
+        settings.set("timezone", timezone)
+        print(f"Timezone {timezone} saved")
 
     def stop(self):
         self.encoder.pin_a.irq(handler=None)
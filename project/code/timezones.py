@@ -1,15 +1,152 @@
 # timezones.py
+from calendar_math import civil_from_days, to_timestamp, weekday_of, SECONDS_PER_DAY
 
-TIMEZONE_OFFSETS = {
-    "UTC": 0,
-    "CST": -6,  # Mexico City
-    "CDT": -5,  # Mexico City Daylight Time
-    "PST": -8,
+# DST rules
+RULE_US = "US"  # second Sunday of March to first Sunday of November, 02:00 local
+RULE_EU = "EU"  # last Sunday of March to last Sunday of October, 01:00 UTC
+
+# id: (standard offset in minutes east of UTC, DST rule, standard name, DST name)
+# The id is what the settings store; the names are what the display shows.
+ZONES = {
+    "UTC": (0, None, "UTC", "UTC"),
+    "PST": (-480, RULE_US, "PST", "PDT"),  # US Pacific
+    "EST": (-300, RULE_US, "EST", "EDT"),  # US Eastern
+    "CST": (-360, None, "CST", "CST"),  # Mexico City, no DST since 2022
+    "CDT": (-300, None, "CDT", "CDT"),  # Fixed UTC-5, kept for saved settings
+    "GMT": (0, RULE_EU, "GMT", "BST"),  # London
+    "CET": (60, RULE_EU, "CET", "CEST"),  # Central Europe
+    "IST": (330, None, "IST", "IST"),  # India
 }
 
+# Zones offered in the timezone menu, in display order
+MENU_ZONES = ("UTC", "PST", "EST", "CST", "GMT", "CET", "IST")
+
+DEFAULT_ZONE = "PST"
+
+# Beyond any timestamp the clock will see, and still a small int on the Pico
+NEVER = 0x3FFFFFFF
+
+
+def _nth_sunday(year, month, n):
+    return 1 + (7 - weekday_of(year, month, 1)) % 7 + 7 * (n - 1)
+
+
+def _last_sunday(year, month, days_in_month):
+    return days_in_month - weekday_of(year, month, days_in_month)
+
+
+def _year_of(timestamp):
+    return civil_from_days(timestamp // SECONDS_PER_DAY)[0]
+
+
+def dst_period(rule, year, std_offset_s):
+    """
+    Description: UTC timestamps at which DST starts and ends in the given year.
+    """
+    if rule == RULE_US:
+        start = to_timestamp(year, 3, _nth_sunday(year, 3, 2), 2, 0, 0)
+        end = to_timestamp(year, 11, _nth_sunday(year, 11, 1), 2, 0, 0)
+        # Local standard time at the start, local daylight time at the end
+        return start - std_offset_s, end - std_offset_s - 3600
+    if rule == RULE_EU:
+        start = to_timestamp(year, 3, _last_sunday(year, 3, 31), 1, 0, 0)
+        end = to_timestamp(year, 10, _last_sunday(year, 10, 31), 1, 0, 0)
+        return start, end
+    raise ValueError(f"Unknown DST rule {rule}")
+
+
+class TimeZone:
+    """
+    Description: UTC to local conversion for one zone. The offset in force and
+    the instants it is valid between are worked out once, so converting a tick
+    is one range check and an add; the rules only run again when the clock
+    crosses a DST transition or is set outside the cached range.
+    Args:
+        zone_id (str): key of ZONES; unknown ids fall back to UTC
+    """
+
+    def __init__(self, zone_id):
+        if zone_id not in ZONES:
+            zone_id = "UTC"
+        self.zone_id = zone_id
+        std_minutes, self.rule, self.std_name, self.dst_name = ZONES[zone_id]
+        self.std_offset_s = std_minutes * 60
+
+        # Cached period: offset_s applies from valid_from (inclusive) to
+        # next_transition (exclusive)
+        self.offset_s = self.std_offset_s
+        self.name = self.std_name
+        self.valid_from = 0
+        self.next_transition = 0 if self.rule else NEVER
+
+    def to_local(self, utc):
+        """
+        Description: UTC timestamp -> local wall clock timestamp.
+        """
+        if self.rule is None:
+            return utc + self.std_offset_s
+        if not self.valid_from <= utc < self.next_transition:
+            self._update(utc)
+        return utc + self.offset_s
+
+    def to_utc(self, local):
+        """
+        Description: Local wall clock timestamp -> UTC. In the repeated hour
+        when DST ends the first (daylight) instant wins; times in the skipped
+        hour when it starts are taken as standard time.
+        """
+        utc = local - self.std_offset_s
+        if self.rule is None:
+            return utc
+        daylight = utc - 3600
+        if self.offset_at(daylight) != self.std_offset_s:
+            return daylight
+        return utc
+
+    def offset_at(self, utc):
+        """
+        Description: Offset in seconds in force at a UTC timestamp, without
+        touching the cache.
+        """
+        if self.rule is None:
+            return self.std_offset_s
+        start, end = dst_period(self.rule, _year_of(utc), self.std_offset_s)
+        if start <= utc < end:
+            return self.std_offset_s + 3600
+        return self.std_offset_s
+
+    def _update(self, utc):
+        year = _year_of(utc)
+        start, end = dst_period(self.rule, year, self.std_offset_s)
+        if utc < start:
+            self.valid_from = dst_period(self.rule, year - 1, self.std_offset_s)[1]
+            self.next_transition = start
+            daylight = False
+        elif utc < end:
+            self.valid_from = start
+            self.next_transition = end
+            daylight = True
+        else:
+            self.valid_from = end
+            self.next_transition = dst_period(self.rule, year + 1, self.std_offset_s)[0]
+            daylight = False
+        self.offset_s = self.std_offset_s + (3600 if daylight else 0)
+        self.name = self.dst_name if daylight else self.std_name
+
 
 def get_timezone_offset(timezone):
     """
-    Get the offset in hours for the given timezone.
+    Get the standard offset in hours for the given timezone.
     """
-    return TIMEZONE_OFFSETS.get(timezone.upper(), 0)
+    return ZONES.get(timezone.upper(), ZONES["UTC"])[0] / 60
+
+
+if __name__ == "__main__":
+
+    from calendar_math import to_datetime
+
+    for zone_id in MENU_ZONES:
+        zone = TimeZone(zone_id)
+        for utc in (757382400, 773107200):  # 2024-01-01, 2024-07-01
+            local = zone.to_local(utc)
+            print(zone_id, zone.name, to_datetime(local), zone.to_utc(local) == utc)
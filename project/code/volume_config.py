@@ -58,18 +58,22 @@ class VolumeConfig(UI):
         return context if context else {}
 
     def update_display(self):
-        self.display.clear()
-        self.display.update_text(self.header, 0, 0)
-        self.display.update_text(str(self.current_value), 0, 1)
+        with self.display:
+            self.display.clear()
+            self.display.update_text(self.header, 0, 0)
+            self.display.update_text(str(self.current_value), 0, 1)
 
     def poll_selection_change_and_update_display(self):
         new_value, direction = self.encoder.get_counter()
         if new_value != self.current_value:
             self.current_value = new_value
             self.update_display()
+            # Preview while turning; RadioControl coalesces the writes
+            self.radio_control.set_volume(new_value)
 
     def button_release(self):
         self.radio_control.set_volume(self.current_value)
+        self.radio_control.save_presets()
         self.build_context()
         return self.ui_context
 